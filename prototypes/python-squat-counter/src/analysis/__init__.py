@@ -0,0 +1,6 @@
+from .video_analyzer import (analyze_video, analyze_recording, analyze_frames, count_samples,
+                             iter_angles, iter_batched_angles, iter_frames, find_videos)
+from .parallel import analyze_video_parallel, plan_chunks
+
+__all__ = ['analyze_video', 'analyze_recording', 'analyze_frames', 'count_samples',
+           'iter_angles', 'iter_batched_angles', 'iter_frames', 'find_videos', 'analyze_video_parallel', 'plan_chunks']
\ No newline at end of file
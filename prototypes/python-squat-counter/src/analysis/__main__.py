@@ -0,0 +1,3 @@
+from .video_analyzer import main
+
+main()
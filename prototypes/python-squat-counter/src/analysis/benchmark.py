@@ -0,0 +1,203 @@
+"""Benchmark ``PoseDetector`` settings on labeled reference clips.
+
+Runs every combination of the given settings over local clips and reports
+FPS, per-stage latency percentiles, peak RSS and rep-count accuracy::
+
+    python -m src.analysis.benchmark clips/manifest.json \\
+        --complexity 0 1 2 --inference-size 0 320 --out bench/v2 --compare bench/v1.json
+
+The manifest lists the clips (paths relative to the manifest) with their
+ground truth, ``reps`` for counters and ``elapsed`` seconds for timers::
+
+    {"clips": [{"path": "squat_01.mp4", "exercise": "squat", "reps": 12},
+               {"path": "plank_01.mp4", "exercise": "plank", "elapsed": 30.0}]}
+
+Each run happens in a fresh process, one at a time, so peak RSS belongs to
+that run and timings are not shared with another run. Nothing here opens
+a camera or the network.
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from ..core.pose_detector import PoseDetector
+from ..exercises import EXERCISES
+from ..utils.profiler import profiler
+from .video_analyzer import iter_angles, iter_frames, report
+
+STAGES = ('read', 'convert', 'inference', 'position', 'angles', 'count', 'frame')
+PERCENTILES = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+def load_manifest(path):
+    """Return the manifest's clips with paths resolved against its directory."""
+    with open(path) as f:
+        clips = json.load(f)["clips"]
+    base = os.path.dirname(os.path.abspath(path))
+    for clip in clips:
+        if clip["exercise"] not in EXERCISES:
+            raise ValueError(f"Unknown exercise {clip['exercise']!r} in {path}")
+        if "reps" not in clip and "elapsed" not in clip:
+            raise ValueError(f"{clip['path']}: give 'reps' or 'elapsed' as ground truth")
+        clip["path"] = os.path.join(base, clip["path"])
+    return clips
+
+
+def settings_matrix(complexity, detection_con, track_con, inference_size):
+    """Every combination of the settings as ``PoseDetector`` keyword dicts."""
+    return [{'complexity': c, 'detectionCon': d, 'trackCon': t, 'inference_size': s or None}
+            for c, d, t, s in itertools.product(complexity, detection_con, track_con,
+                                                inference_size)]
+
+
+def settings_name(settings):
+    size = settings['inference_size'] or 'full'
+    return (f"c{settings['complexity']}_det{settings['detectionCon']:g}"
+            f"_trk{settings['trackCon']:g}_{size}")
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _profiled(frames):
+    profiler.start_frame()
+    for frame in frames:
+        profiler.mark('read')
+        yield frame
+        profiler.start_frame()
+
+
+def run_clip(clip, settings):
+    """Analyze one clip with one setting; returns a flat result row."""
+    profiler.reset()
+    profiler.enable()
+    detector = PoseDetector(**settings)
+    exercise = clip["exercise"]
+
+    start = time.perf_counter()
+    samples = iter_angles(_profiled(iter_frames(clip["path"])), detector, EXERCISES[exercise]())
+    summary = list(report(clip["path"], exercise, samples))[-1]
+    seconds = time.perf_counter() - start
+
+    metric = "elapsed" if "elapsed" in clip else "reps"
+    measured = summary["elapsed"] if metric == "elapsed" else summary["count"]
+    row = {"settings": settings_name(settings), **settings, "clip": os.path.basename(clip["path"]),
+           "exercise": exercise, "frames": summary["frames"], "seconds": round(seconds, 3),
+           "fps": round(summary["frames"] / seconds, 2) if seconds else 0.0,
+           "peak_rss_mb": _peak_rss_mb(), "metric": metric, "truth": clip[metric],
+           "measured": measured, "error": round(measured - clip[metric], 3)}
+
+    stages = profiler.report()["stages"]
+    for stage in STAGES:
+        for key in PERCENTILES:
+            row[f"{stage}_{key}"] = stages.get(stage, {}).get(key)
+    return row
+
+
+def _run_isolated(args):
+    return run_clip(*args)
+
+
+def run_benchmark(clips, matrix):
+    """Yield a result row per (setting, clip), each run in a fresh process."""
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        yield from pool.imap(_run_isolated, [(clip, settings) for settings in matrix
+                                             for clip in clips])
+
+
+def summarize(rows):
+    """Aggregate rows per setting: mean FPS, worst RSS and rep-count accuracy."""
+    summary = {}
+    for name, group in itertools.groupby(sorted(rows, key=lambda r: r["settings"]),
+                                         key=lambda r: r["settings"]):
+        group = list(group)
+        reps = [r for r in group if r["metric"] == "reps"]
+        rss = [r["peak_rss_mb"] for r in group if r["peak_rss_mb"] is not None]
+        summary[name] = {
+            "runs": len(group),
+            "mean_fps": round(sum(r["fps"] for r in group) / len(group), 2),
+            "peak_rss_mb": max(rss) if rss else None,
+            "rep_mae": round(sum(abs(r["error"]) for r in reps) / len(reps), 3) if reps else None,
+            "rep_exact": round(sum(r["error"] == 0 for r in reps) / len(reps), 3) if reps else None,
+        }
+    return summary
+
+
+def compare(summary, baseline):
+    """Print FPS and accuracy changes against a previous ``summary``."""
+    for name, current in summary.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name}: new")
+            continue
+        fps = current["mean_fps"] / old["mean_fps"] if old["mean_fps"] else float('nan')
+        line = f"{name}: fps x{fps:.2f}"
+        if current["rep_mae"] is not None and old.get("rep_mae") is not None:
+            line += f", rep MAE {old['rep_mae']} -> {current['rep_mae']}"
+        print(line)
+
+
+def write_results(out, rows, summary):
+    """Write ``<out>.csv`` (one row per run) and ``<out>.json`` (rows plus summary)."""
+    directory = os.path.dirname(out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(out + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(out + '.json', 'w') as f:
+        json.dump({"summary": summary, "runs": rows}, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pose settings on labeled clips.")
+    parser.add_argument('manifest', help="JSON list of clips with exercise and ground truth")
+    parser.add_argument('--complexity', type=int, nargs='+', default=[1], choices=(0, 1, 2))
+    parser.add_argument('--detection-con', type=float, nargs='+', default=[0.5])
+    parser.add_argument('--track-con', type=float, nargs='+', default=[0.5])
+    parser.add_argument('--inference-size', type=int, nargs='+', default=[0],
+                        help="longest side sent to MediaPipe; 0 keeps the clip size")
+    parser.add_argument('--exercise', nargs='+', choices=sorted(EXERCISES),
+                        help="only benchmark clips of these exercises")
+    parser.add_argument('--out', default='benchmark', help="output path without extension")
+    parser.add_argument('--compare', help="JSON written by an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    clips = load_manifest(args.manifest)
+    if args.exercise:
+        clips = [clip for clip in clips if clip["exercise"] in args.exercise]
+    if not clips:
+        parser.error("no clips to benchmark")
+    matrix = settings_matrix(args.complexity, args.detection_con, args.track_con,
+                             args.inference_size)
+
+    rows = []
+    for row in run_benchmark(clips, matrix):
+        rows.append(row)
+        print(f"{row['settings']:<28} {row['clip']:<24} {row['fps']:>8.1f} fps  "
+              f"{row['metric']} {row['measured']} / {row['truth']}", flush=True)
+
+    summary = summarize(rows)
+    write_results(args.out, rows, summary)
+    print(f"Wrote {args.out}.csv and {args.out}.json")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(summary, json.load(f)["summary"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Chunk-parallel analysis of long workout videos.
+
+MediaPipe inference dominates offline scoring, so a long video is split into
+time chunks that are processed by separate worker processes, each owning its
+own ``PoseDetector``. Every chunk starts ``overlap`` frames early so the
+tracker and landmark smoothing are warmed up before its first owned frame.
+
+Workers only return the per-frame angle series for the frames they own. The
+series are stitched back together in frame order and replayed through a
+single exercise counter, so the ``count``/``direction``/``form`` state machine
+(and any timers) carry across chunk boundaries exactly as in a sequential run.
+The landmarks themselves only match a sequential run exactly in static image
+mode (``mode=True``); see ``analyze_video_parallel``.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ..core.pose_detector import PoseDetector
+from ..exercises import EXERCISES
+from ..utils.lazy import lazy_import
+from .video_analyzer import iter_angles, iter_frames, report
+
+cv2 = lazy_import('cv2')
+
+
+def plan_chunks(frame_count, chunk_frames, overlap):
+    """Split ``frame_count`` frames into ``(warmup_start, start, end)`` ranges.
+
+    The last chunk has ``end=None`` so it runs to the end of the file even
+    when the container's frame count is only an estimate.
+    """
+    if chunk_frames < 1:
+        raise ValueError("chunk_frames must be at least 1")
+
+    chunks = []
+    start = 0
+    while True:
+        end = start + chunk_frames
+        if end >= frame_count:
+            chunks.append((max(0, start - overlap), start, None))
+            return chunks
+        chunks.append((max(0, start - overlap), start, end))
+        start = end
+
+
+def analyze_chunk(path, exercise_name, warmup_start, start, end, detector_kwargs):
+    """Run pose inference over one chunk and return its owned angle samples."""
+    detector = PoseDetector(**detector_kwargs)
+    angle_source = EXERCISES[exercise_name]()
+    samples = iter_angles(iter_frames(path, warmup_start, end), detector, angle_source)
+    return [sample for sample in samples if sample[0] >= start]
+
+
+def analyze_video_parallel(path, exercise_name, workers=None, chunk_seconds=60.0,
+                           overlap_seconds=2.0, **detector_kwargs):
+    """Analyze one video across a process pool.
+
+    Yields the same kind of rep events and summary as ``analyze_video``.
+    With ``mode=True`` (static image mode) every frame is inferred
+    independently and the output is identical to a sequential run.
+
+    In the default tracking mode the output is *not* guaranteed to be
+    identical: each chunk's tracker starts from a fresh detection at its
+    warmup frame, and while the overlap usually brings it in step with the
+    sequential tracker by the first owned frame, landmarks near a boundary
+    can differ slightly, and a rep whose angle only just crosses a threshold
+    there can be counted differently. Use ``mode=True`` when results must
+    match a sequential run, at the cost of a detection pass on every frame.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    chunk_frames = max(1, int(chunk_seconds * fps))
+    overlap = int(overlap_seconds * fps)
+    chunks = plan_chunks(frame_count, chunk_frames, overlap)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [pool.submit(analyze_chunk, path, exercise_name, warmup_start,
+                               start, end, detector_kwargs)
+                   for warmup_start, start, end in chunks]
+
+        def stitched():
+            for future in futures:
+                yield from future.result()
+
+        yield from report(path, exercise_name, stitched())
@@ -0,0 +1,268 @@
+"""Headless analysis of recorded workout videos.
+
+Runs ``PoseDetector`` and an exercise counter over video files as fast as the
+CPU allows and writes per-rep events and final results as JSON lines::
+
+    python -m src.analysis clips/ --exercise pushup
+"""
+import argparse
+import json
+import os
+import sys
+
+from ..core.backends import create_backend
+from ..core.landmark_archive import (ARCHIVE_EXTENSION, LandmarkArchive, LandmarkRecorder,
+                                     LandmarkReplay)
+from ..core.pose_detector import PoseDetector
+from ..exercises import EXERCISES, DeclarativeExercise
+from ..utils.lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.webm', '.m4v')
+
+
+def iter_frames(path, start=0, end=None):
+    """Yield ``(frame_id, timestamp, img)`` for the frames of a video file.
+
+    Timestamps come from the container (``CAP_PROP_POS_MSEC``) in seconds and
+    fall back to ``frame_id / fps`` when the backend does not report them.
+    The capture seeks to ``start`` and grabs only the frames the seek fell
+    short by, so a chunk late in a long file does not decode everything
+    before it; iteration stops before ``end`` when given.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video: {path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_id = 0
+    try:
+        if start > 0 and cap.set(cv2.CAP_PROP_POS_FRAMES, start):
+            frame_id = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if not 0 <= frame_id <= start:
+                # Overshot or unknown position; frame ids would be wrong, so start over
+                cap.release()
+                cap = cv2.VideoCapture(path)
+                frame_id = 0
+
+        while frame_id < start:
+            if not cap.grab():
+                return
+            frame_id += 1
+
+        while end is None or frame_id < end:
+            ret, img = cap.read()
+            if not ret:
+                break
+            msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+            timestamp = msec / 1000 if msec > 0 else frame_id / fps
+            yield frame_id, timestamp, img
+            frame_id += 1
+    finally:
+        cap.release()
+
+
+def iter_angles(frames, detector, exercise):
+    """Yield ``(frame_id, timestamp, angles)`` for each frame.
+
+    ``angles`` is whatever ``exercise.get_required_angles`` returns, or
+    ``None`` when no pose was found in the frame.
+    """
+    for frame_id, timestamp, img in frames:
+        detector.findPose(img, False, timestamp=timestamp)
+        if detector.findPosition(img, False, as_array=True) is None:
+            yield frame_id, timestamp, None
+        else:
+            yield frame_id, timestamp, exercise.get_required_angles(detector, img)
+
+
+def iter_batched_angles(frames, detector, exercise, batch_size):
+    """Like ``iter_angles``, but runs the detector's backend on ``batch_size``
+    frames per call with ``processBatch``.
+    """
+    batch = []
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) == batch_size:
+            yield from _batch_angles(batch, detector, exercise)
+            batch = []
+    if batch:
+        yield from _batch_angles(batch, detector, exercise)
+
+
+def _batch_angles(batch, detector, exercise):
+    results = detector.processBatch([img for _, _, img in batch])
+    for (frame_id, timestamp, img), landmarks in zip(batch, results):
+        detector.setLandmarks(img, landmarks, timestamp)
+        if detector.findPosition(img, False, as_array=True) is None:
+            yield frame_id, timestamp, None
+        else:
+            yield frame_id, timestamp, exercise.get_required_angles(detector, img)
+
+
+def count_samples(samples, exercise):
+    """Feed ``(frame_id, timestamp, angles)`` samples through ``exercise``.
+
+    Yields a ``rep`` event each time the whole-rep count increases. The
+    exercise is updated with the frame timestamp so timers stay correct when
+    processing runs faster than real time.
+    """
+    reps = int(exercise.count)
+    for frame_id, timestamp, angles in samples:
+        if angles is None:
+            continue
+
+        exercise.update_feedback_and_count(angles, timestamp=timestamp)
+
+        if int(exercise.count) > reps:
+            reps = int(exercise.count)
+            yield {"event": "rep", "frame": frame_id,
+                   "timestamp": round(timestamp, 3), "count": reps}
+
+
+def analyze_frames(frames, detector, exercise):
+    """Drive ``detector`` and ``exercise`` over ``frames`` without any display."""
+    return count_samples(iter_angles(frames, detector, exercise), exercise)
+
+
+def report(path, exercise_name, samples):
+    """Count ``samples`` of one video, yielding rep events and a summary."""
+    exercise = EXERCISES[exercise_name]()
+    frames = 0
+    duration = 0.0
+
+    def counted(source):
+        nonlocal frames, duration
+        for sample in source:
+            frames += 1
+            duration = sample[1]
+            yield sample
+
+    for event in count_samples(counted(samples), exercise):
+        yield dict(event, video=path, exercise=exercise_name)
+
+    yield {"event": "summary", "video": path, "exercise": exercise_name,
+           "frames": frames, "duration": round(duration, 3), **exercise.summary()}
+
+
+def analyze_video(path, exercise_name, record=None, backend=None, batch_size=1,
+                  **detector_kwargs):
+    """Analyze one video file, yielding rep events followed by a summary.
+
+    When ``record`` is a path, the landmarks of every frame are saved there
+    so the session can later be re-counted with ``analyze_recording``.
+    ``backend`` is a ``PoseBackend`` to use instead of MediaPipe; it gets
+    ``batch_size`` frames per inference call.
+    """
+    detector = PoseDetector(backend=backend, **detector_kwargs)
+    if record is not None:
+        detector.startRecording(LandmarkRecorder(record, source=path))
+
+    angle_source = EXERCISES[exercise_name]()
+    if backend is not None and batch_size > 1:
+        samples = iter_batched_angles(iter_frames(path), detector, angle_source, batch_size)
+    else:
+        samples = iter_angles(iter_frames(path), detector, angle_source)
+    try:
+        yield from report(path, exercise_name, samples)
+    finally:
+        detector.stopRecording()
+
+
+def analyze_recording(path, exercise_name):
+    """Re-count a recorded landmark archive without running MediaPipe.
+
+    Declarative exercises are counted over the whole session at once with
+    ``count_series``; others replay frame by frame.
+    """
+    exercise = EXERCISES[exercise_name]()
+    if isinstance(exercise, DeclarativeExercise):
+        return count_recording(path, exercise_name, exercise.compiled)
+
+    replay = LandmarkReplay(path)
+    return report(path, exercise_name, iter_angles(replay.frames(), replay, exercise))
+
+
+def count_recording(path, exercise_name, compiled):
+    """Yield the same events as ``report`` from a vectorized whole-session count."""
+    archive = LandmarkArchive(path)
+    timestamps = archive.timestamps
+    result = compiled.count_series(compiled.features(archive.pixel_points()), timestamps)
+
+    for count, frame_id in enumerate(result.reps[:, 1].tolist(), 1):
+        yield {"event": "rep", "frame": frame_id, "timestamp": round(float(timestamps[frame_id]), 3),
+               "count": count, "video": path, "exercise": exercise_name}
+
+    duration = float(timestamps[-1]) if len(archive) else 0.0
+    yield {"event": "summary", "video": path, "exercise": exercise_name,
+           "frames": len(archive), "duration": round(duration, 3), **result.summary()}
+
+
+def find_videos(paths):
+    """Expand files and directories into a sorted list of video files."""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(VIDEO_EXTENSIONS + (ARCHIVE_EXTENSION,)):
+                    videos.append(os.path.join(path, name))
+        else:
+            videos.append(path)
+    return videos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score recorded workout videos without a display.")
+    parser.add_argument('paths', nargs='+',
+                        help="video files, landmark archives or directories of them")
+    parser.add_argument('--exercise', required=True, choices=sorted(EXERCISES))
+    parser.add_argument('--complexity', type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument('--inference-size', type=int,
+                        help="downscale frames so the longest side is at most this many pixels")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="split each video into chunks processed by this many processes")
+    parser.add_argument('--chunk-seconds', type=float, default=60.0)
+    parser.add_argument('--record-dir',
+                        help="save a landmark archive per video here for fast re-counting")
+    parser.add_argument('--backend', default='mediapipe', choices=('mediapipe', 'onnx'))
+    parser.add_argument('--model', help="ONNX pose landmark model for --backend onnx")
+    parser.add_argument('--batch-size', type=int, default=8,
+                        help="frames per inference call for --backend onnx")
+    args = parser.parse_args(argv)
+
+    backend = None
+    if args.backend == 'onnx':
+        if not args.model:
+            parser.error("--backend onnx needs --model")
+        if args.workers > 1:
+            parser.error("--backend onnx batches frames in one process; drop --workers")
+        backend = create_backend('onnx', model_path=args.model, batch_size=args.batch_size)
+
+    detector_kwargs = {'complexity': args.complexity, 'inference_size': args.inference_size}
+    if backend is not None:
+        # The landmark model has no person detector; feed it the tracked crop
+        detector_kwargs['roi_tracking'] = True
+    for path in find_videos(args.paths):
+        if path.endswith(ARCHIVE_EXTENSION):
+            events = analyze_recording(path, args.exercise)
+        elif args.workers > 1:
+            from .parallel import analyze_video_parallel
+            events = analyze_video_parallel(path, args.exercise, workers=args.workers,
+                                            chunk_seconds=args.chunk_seconds,
+                                            **detector_kwargs)
+        else:
+            record = None
+            if args.record_dir:
+                name = os.path.splitext(os.path.basename(path))[0] + ARCHIVE_EXTENSION
+                record = os.path.join(args.record_dir, name)
+            events = analyze_video(path, args.exercise, record=record, backend=backend,
+                                   batch_size=args.batch_size, **detector_kwargs)
+
+        for event in events:
+            sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Pose detection that skips inference while the body is barely moving.
+
+``AdaptivePoseDetector`` runs the pose backend only on keyframes. Between them the
+landmarks are extrapolated linearly from the last two keyframes. The stride
+is picked from the measured landmark speed, so predicted points stay within
+``tolerance`` of where inference would put them. It never exceeds
+``max_gap`` frames while the exercise reports a hold, or ``active_gap``
+otherwise.
+"""
+import time
+
+import numpy as np
+
+from ..utils.profiler import profiler
+from .pose_detector import PoseDetector
+
+
+class AdaptivePoseDetector(PoseDetector):
+    """``PoseDetector`` with a motion-adaptive inference rate."""
+
+    def __init__(self, *args, max_gap=8, active_gap=2, tolerance=0.01,
+                 min_visibility=0.5, **kwargs):
+        if max_gap < 1 or active_gap < 1:
+            raise ValueError("gaps must be at least 1 frame")
+        super().__init__(*args, **kwargs)
+        self.max_gap = max_gap
+        self.active_gap = active_gap
+        self.tolerance = tolerance
+        self.min_visibility = min_visibility
+        self.holding = False
+
+        self.keyframe = True
+        self.frames = 0
+        self.inferences = 0
+        self.interval = 1
+        self._sinceKey = 0
+        self._keys = np.zeros((2, 33, 4), dtype=np.float32)
+        self._keyTimes = [None, None]
+        self._velocity = np.zeros((33, 2), dtype=np.float32)
+        self._frameDt = None
+        self._lastTimestamp = None
+
+    def setHold(self, holding):
+        """Tell the scheduler whether the exercise is in a static hold phase."""
+        self.holding = bool(holding)
+
+    @property
+    def inferenceRatio(self):
+        """Fraction of frames that ran full inference."""
+        return self.inferences / self.frames if self.frames else 1.0
+
+    def findPose(self, img, draw=True, timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self._lastTimestamp is not None and timestamp > self._lastTimestamp:
+            dt = timestamp - self._lastTimestamp
+            self._frameDt = dt if self._frameDt is None else 0.9 * self._frameDt + 0.1 * dt
+        self._lastTimestamp = timestamp
+        self.frames += 1
+
+        if self._hasPose and self._sinceKey < self.interval - 1:
+            self._sinceKey += 1
+            self.keyframe = False
+            self._extrapolate(timestamp)
+            profiler.mark('extrapolate')
+            if self.recorder is not None:
+                self.recorder.append(timestamp, self.lmArray, self._frameSize(img))
+            return img
+
+        self.keyframe = True
+        self._sinceKey = 0
+        self.inferences += 1
+        super().findPose(img, draw, timestamp=timestamp)
+        self._updateKeyframe(timestamp)
+        return img
+
+    def _updateKeyframe(self, timestamp):
+        if not self._hasPose:
+            self._keyTimes = [None, None]
+            self.interval = 1
+            return
+
+        self._keys[0] = self._keys[1]
+        self._keys[1] = self.lmArray
+        self._keyTimes = [self._keyTimes[1], timestamp]
+        self.interval = self._nextInterval()
+
+    def _nextInterval(self):
+        t0, t1 = self._keyTimes
+        if t0 is None or t1 <= t0 or self._frameDt is None:
+            self._velocity[:] = 0
+            return 1
+
+        np.subtract(self._keys[1, :, :2], self._keys[0, :, :2], out=self._velocity)
+        self._velocity /= t1 - t0
+        visible = self._keys[1, :, 3] >= self.min_visibility
+        if not visible.any():
+            return 1
+
+        # Largest stride whose extrapolation error stays within tolerance
+        speed = float(np.abs(self._velocity[visible]).max())
+        limit = self.max_gap if self.holding else self.active_gap
+        if speed == 0:
+            return limit
+        return int(min(max(self.tolerance / (speed * self._frameDt), 1), limit))
+
+    def _extrapolate(self, timestamp):
+        lmArray = self.lmArray
+        lmArray[:] = self._keys[1]
+        elapsed = timestamp - self._keyTimes[1]
+        if elapsed > 0:
+            lmArray[:, :2] += self._velocity * elapsed
@@ -0,0 +1,249 @@
+"""Pluggable pose estimation backends.
+
+A ``PoseBackend`` turns an RGB frame into the normalized ``(33, 4)``
+landmark array (x, y, z, visibility) that the rest of the code consumes.
+``PoseDetector`` holds one and does everything around it (resizing, color
+conversion, ROI tracking, pixel positions and angles), so exercise counters
+and the analysis pipeline work the same on any backend:
+
+* ``MediaPipeBackend`` runs the legacy MediaPipe Pose solution; it is the
+  ``PoseDetector`` default.
+* ``OnnxPoseBackend`` runs a BlazePose-style landmark model on ONNX Runtime's
+  CPU provider. ``batch_process`` stacks several frames into one call, which
+  keeps every core busy during offline video analysis::
+
+    python -m src.analysis workout.mp4 --exercise squat \\
+        --backend onnx --model models/pose_landmark_full.onnx --batch-size 16
+"""
+import os
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from ..utils.lazy import lazy_import
+from ..utils.profiler import profiler
+
+# Disable GPU acceleration to avoid OpenGL context issues on macOS
+os.environ['MEDIAPIPE_DISABLE_GPU'] = '1'
+os.environ['GLOG_minloglevel'] = '2'  # Reduce logging
+
+cv2 = lazy_import('cv2')
+
+NUM_LANDMARKS = 33
+
+# Loaded on first MediaPipeBackend() so landmark replay never pulls in MediaPipe
+mp = None
+
+
+def _load_mediapipe():
+    global mp
+    if mp is None:
+        import mediapipe
+        mp = mediapipe
+    return mp
+
+
+class PoseBackend(ABC):
+    """Pose model mapping an RGB frame to ``(33, 4)`` normalized landmarks."""
+
+    @abstractmethod
+    def process(self, frame):
+        """Return the landmarks of ``frame``, or ``None`` when no pose is found.
+
+        The array may be reused by the next call; copy it to keep it.
+        """
+
+    def batch_process(self, frames):
+        """Return one landmark array (or ``None``) per frame; backends may batch the inference."""
+        results = []
+        for frame in frames:
+            landmarks = self.process(frame)
+            results.append(None if landmarks is None else landmarks.copy())
+        return results
+
+    def warmup(self, size=(640, 480), frames=2):
+        """Run the model on blank frames so the first real frame is not slow."""
+        start = time.perf_counter()
+        blank = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        self.batch_process([blank] * frames)
+        return time.perf_counter() - start
+
+    def reset(self):
+        """Drop any state carried from frame to frame."""
+
+    def close(self):
+        pass
+
+
+class MediaPipeBackend(PoseBackend):
+    """Legacy ``mp.solutions.pose`` solution.
+
+    The solution tracks and smooths the pose from frame to frame, so frames
+    must be passed in order; ``batch_process`` processes them one by one.
+    """
+
+    def __init__(self, mode=False, complexity=1, smooth_landmarks=True,
+                 enable_segmentation=False, smooth_segmentation=True,
+                 detectionCon=0.5, trackCon=0.5):
+        _load_mediapipe()
+        self.settings = (mode, complexity, smooth_landmarks, enable_segmentation,
+                         smooth_segmentation, detectionCon, trackCon)
+        self.pose = mp.solutions.pose.Pose(*self.settings)
+        self.results = None
+        self._landmarks = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+
+    def process(self, frame):
+        self.results = self.pose.process(frame)
+        if not self.results.pose_landmarks:
+            return None
+
+        landmarks = self._landmarks
+        for id, lm in enumerate(self.results.pose_landmarks.landmark):
+            row = landmarks[id]
+            row[0] = lm.x
+            row[1] = lm.y
+            row[2] = lm.z
+            row[3] = lm.visibility
+        return landmarks
+
+    def reset(self):
+        """Start over with a fresh graph, dropping tracking and smoothing state."""
+        self.pose.close()
+        self.pose = mp.solutions.pose.Pose(*self.settings)
+
+    def close(self):
+        self.pose.close()
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class OnnxPoseBackend(PoseBackend):
+    """BlazePose landmark model on ONNX Runtime (CPU).
+
+    The model takes ``(N, H, W, 3)`` or ``(N, 3, H, W)`` RGB float input in
+    ``[0, 1]`` and returns ``N x (39 * 5)`` landmark values in input pixels
+    plus an ``N x 1`` pose score, as in MediaPipe's ``pose_landmark_*``
+    models converted to ONNX. Frames are letterboxed into the input.
+
+    The landmark model expects a crop centered on the person and there is
+    no person detector stage, so use it through
+    ``PoseDetector(backend=..., roi_tracking=True)``: only the first frame,
+    and frames where the crop loses the pose, see the whole frame. A model
+    exported with a dynamic batch axis runs up to ``batch_size`` frames per
+    call; a fixed batch of 1 falls back to one frame per call.
+    """
+
+    def __init__(self, model_path, batch_size=8, min_score=0.5, threads=None,
+                 providers=('CPUExecutionProvider',)):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("OnnxPoseBackend needs onnxruntime: pip install onnxruntime") from e
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=list(providers))
+        self.min_score = min_score
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        shape = model_input.shape
+        self.channels_last = shape[-1] == 3
+        self.input_size = (shape[2], shape[1]) if self.channels_last else (shape[3], shape[2])
+        self.fixed_batch = isinstance(shape[0], int)
+        self.batch_size = shape[0] if self.fixed_batch else max(1, batch_size)
+
+        self.landmarks_output = self.score_output = None
+        for output in self.session.get_outputs():
+            size = output.shape[-1]
+            if size in (39 * 5, NUM_LANDMARKS * 5) and self.landmarks_output is None:
+                self.landmarks_output = output.name
+            elif size == 1 and len(output.shape) == 2 and self.score_output is None:
+                self.score_output = output.name
+        if self.landmarks_output is None:
+            raise ValueError(f"{model_path} has no (N, 195) landmark output")
+
+        w, h = self.input_size
+        self._batch = np.zeros((self.batch_size, h, w, 3), dtype=np.uint8)
+        self._input = np.zeros((self.batch_size, h, w, 3), dtype=np.float32)
+        self._letterbox = {}
+
+    def _layout(self, shape):
+        """Scale, padding and resize buffer that fit a frame of ``shape`` into the input."""
+        layout = self._letterbox.get(shape)
+        if layout is None:
+            h, w = shape[:2]
+            iw, ih = self.input_size
+            scale = min(iw / w, ih / h)
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            pad = ((iw - size[0]) // 2, (ih - size[1]) // 2)
+            resized = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            layout = self._letterbox[shape] = (scale, pad, resized)
+        return layout
+
+    def process(self, frame):
+        return self.batch_process([frame])[0]
+
+    def batch_process(self, frames):
+        results = []
+        for start in range(0, len(frames), self.batch_size):
+            results.extend(self._run(frames[start:start + self.batch_size]))
+        return results
+
+    def _run(self, frames):
+        n = len(frames)
+        # A fixed batch axis always takes the full batch; extra rows are ignored
+        rows = self.batch_size if self.fixed_batch else n
+        batch = self._batch[:rows]
+        batch[:] = 0
+        layouts = []
+        for i, frame in enumerate(frames):
+            scale, (px, py), resized = layout = self._layout(frame.shape)
+            if resized.shape == frame.shape:
+                resized = frame
+            else:
+                cv2.resize(frame, (resized.shape[1], resized.shape[0]), dst=resized,
+                           interpolation=cv2.INTER_AREA)
+            batch[i, py:py + resized.shape[0], px:px + resized.shape[1]] = resized
+            layouts.append(layout)
+        model_input = np.multiply(batch, np.float32(1 / 255), out=self._input[:rows])
+        if not self.channels_last:
+            model_input = np.ascontiguousarray(model_input.transpose(0, 3, 1, 2))
+        profiler.mark('convert')
+
+        names = [self.landmarks_output] + ([self.score_output] if self.score_output else [])
+        outputs = self.session.run(names, {self.input_name: model_input})
+        profiler.mark('inference')
+
+        raw = outputs[0].reshape(rows, -1, 5)[:n, :NUM_LANDMARKS]
+        scores = outputs[1].reshape(rows)[:n] if self.score_output else np.ones(n)
+        results = []
+        for i, (scale, (px, py), _) in enumerate(layouts):
+            if scores[i] < self.min_score:
+                results.append(None)
+                continue
+            h, w = frames[i].shape[:2]
+            landmarks = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+            landmarks[:, 0] = (raw[i, :, 0] - px) / (scale * w)
+            landmarks[:, 1] = (raw[i, :, 1] - py) / (scale * h)
+            landmarks[:, 2] = raw[i, :, 2] / (scale * w)
+            landmarks[:, 3] = _sigmoid(raw[i, :, 3])
+            results.append(landmarks)
+        return results
+
+
+BACKENDS = {
+    'mediapipe': MediaPipeBackend,
+    'onnx': OnnxPoseBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """Build the backend registered as ``name`` in ``BACKENDS``."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown pose backend {name!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
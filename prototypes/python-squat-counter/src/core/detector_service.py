@@ -0,0 +1,342 @@
+"""Long-lived pose detection service for fast session startup.
+
+Building the MediaPipe graph and running the first inference take seconds,
+and every exercise script used to pay that again. A ``DetectorServer`` pays
+it once and keeps a pool of warmed-up ``PoseDetector`` instances. Sessions
+attach over ``multiprocessing.connection`` with ``RemotePoseDetector``, a
+drop-in ``PoseDetector`` that sends frames and receives the ``(33, 4)``
+landmark array back. On the same machine frames go through a shared memory
+``FrameRing`` and only the slot index is sent::
+
+    python -m src.core.detector_service --port 6150
+
+``connect_detector()`` attaches to a running service and falls back to a
+local, warmed-up ``PoseDetector`` when none is listening.
+
+Messages are raw bytes (a fixed ``REQUEST`` header plus frame or landmark
+bytes, JSON for settings), never pickles, and connections authenticate
+with a shared key: ``$POSE_DETECTOR_KEY``, or a random key generated once
+in ``~/.pose_detector_key`` (mode 0600). Binding beyond loopback requires
+an explicit key.
+"""
+import argparse
+import ipaddress
+import json
+import math
+import os
+import secrets
+import struct
+import threading
+
+import numpy as np
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from ..utils.profiler import profiler
+from .frame_ring import FrameRing
+from .pose_detector import NUM_LANDMARKS, PoseDetector
+
+DEFAULT_ADDRESS = ('127.0.0.1', 6150)
+AUTHKEY_ENV = 'POSE_DETECTOR_KEY'
+AUTHKEY_FILE = os.path.join(os.path.expanduser('~'), '.pose_detector_key')
+
+# kind, timestamp (NaN for none), then frame height, width, channels or the ring slot
+REQUEST = struct.Struct('<cdIII')
+MAX_MESSAGE = 64 << 20
+
+
+def load_authkey(path=None):
+    """The service key from ``$POSE_DETECTOR_KEY`` or a key file.
+
+    The file (``AUTHKEY_FILE`` by default) is created with a random key
+    on first use and must not be readable by other users.
+    """
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode()
+    path = path or AUTHKEY_FILE
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        if os.name == 'posix' and os.stat(path).st_mode & 0o077:
+            raise PermissionError(f"{path} is readable by other users; run chmod 600 {path}")
+        with open(path, 'rb') as f:
+            return f.read().strip()
+    key = secrets.token_hex(32).encode()
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _request(kind, timestamp=None, a=0, b=0, c=0):
+    return REQUEST.pack(kind, math.nan if timestamp is None else timestamp, a, b, c)
+
+
+class DetectorServer:
+    """Serve pose detection to attached sessions from a pool of warm detectors.
+
+    Each connection gets a detector of its own for as long as it stays
+    attached, so MediaPipe's tracking state never mixes two sessions. On
+    disconnect the detector is reset to a fresh graph and goes back to the
+    pool for the next session.
+
+    ``authkey`` defaults to ``load_authkey()`` on loopback addresses and
+    is required for any other host.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, pool_size=1,
+                 warmup_size=(640, 480), **detector_kwargs):
+        if authkey is None:
+            if not is_loopback(address[0]):
+                raise ValueError(f"Serving on {address[0]} needs an explicit authkey")
+            authkey = load_authkey()
+        self.address = address
+        self.authkey = authkey
+        self.pool_size = pool_size
+        self.warmup_size = warmup_size
+        self.detector_kwargs = detector_kwargs
+        self.sessions = 0
+
+        self._pool = []
+        self._lock = threading.Lock()
+        self._listener = None
+        self._thread = None
+        self._running = False
+
+    def _newDetector(self):
+        detector = PoseDetector(**self.detector_kwargs)
+        detector.warmup(self.warmup_size)
+        return detector
+
+    def start(self):
+        """Warm up the pool and start accepting sessions in the background."""
+        self._pool = [self._newDetector() for _ in range(self.pool_size)]
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._running = True
+        self._thread = threading.Thread(target=self._acceptLoop, name='DetectorServer',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Block until ``close`` is called or the process is interrupted."""
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self._running = False
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _acceptLoop(self):
+        while self._running:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AttributeError, AuthenticationError):
+                # Listener closed, or a client failed authentication
+                if not self._running:
+                    break
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _acquire(self):
+        with self._lock:
+            self.sessions += 1
+            if self._pool:
+                return self._pool.pop()
+        return self._newDetector()
+
+    def _release(self, detector):
+        # Drop the last session's tracking and smoothing before anyone reuses it
+        detector.reset()
+        detector.warmup(self.warmup_size)
+        with self._lock:
+            self._pool.append(detector)
+
+    def _serve(self, conn):
+        detector = self._acquire()
+        ring = None
+        try:
+            conn.send_bytes(json.dumps(self.detector_kwargs).encode())
+            while True:
+                message = conn.recv_bytes(MAX_MESSAGE)
+                kind, timestamp, a, b, c = REQUEST.unpack_from(message)
+                timestamp = None if math.isnan(timestamp) else timestamp
+                if kind == b'c':
+                    break
+                if kind == b'r':
+                    if ring is not None:
+                        ring.close()
+                    ring = self._attach(json.loads(message[REQUEST.size:]))
+                    conn.send_bytes(b'\x01' if ring is not None else b'\x00')
+                    continue
+
+                if kind == b's' and ring is not None:
+                    img = ring.view(a)
+                elif kind == b'f' and len(message) == REQUEST.size + a * b * c:
+                    img = np.frombuffer(message, np.uint8, offset=REQUEST.size).reshape(a, b, c)
+                else:
+                    raise ValueError(f"Bad request {kind!r}")
+                detector.findPose(img, False, timestamp=timestamp)
+                landmarks = detector.findPosition(img, False, as_array=True)
+                conn.send_bytes(b'' if landmarks is None else landmarks.tobytes())
+                img = None
+        except (EOFError, OSError, ValueError, IndexError, struct.error):
+            # Disconnected, or a malformed request ends the session
+            pass
+        finally:
+            conn.close()
+            if ring is not None:
+                ring.close()
+            self._release(detector)
+
+    @staticmethod
+    def _attach(spec):
+        """Open a client's frame ring, or ``None`` if it is on another machine."""
+        name, slots, shape, dtype = spec
+        if np.dtype(dtype) != np.uint8:
+            return None
+        try:
+            return FrameRing.attach((name, slots, tuple(shape), dtype), track=False)
+        except OSError:
+            return None
+
+
+class RemotePoseDetector(PoseDetector):
+    """``PoseDetector`` whose inference runs in a ``DetectorServer``.
+
+    Landmarks come back as the normalized ``(33, 4)`` array, so positions
+    and angles work as with a local detector. ``findPose`` does not draw the
+    MediaPipe skeleton.
+
+    With ``shared_memory`` frames are written into a two-slot ``FrameRing``
+    the service reads in place; it falls back to sending frame bytes when
+    the service cannot open the ring. Capturing with
+    ``cap.read(detector.frameBuffer())`` decodes straight into the ring.
+    ``authkey`` defaults to ``load_authkey()``.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, shared_memory=True):
+        self.conn = Client(address, authkey=load_authkey() if authkey is None else authkey)
+        self.settings = json.loads(self.conn.recv_bytes())
+        self.shared_memory = shared_memory
+        self.ring = None
+        self._slot = 0
+        self._initBuffers()
+
+    def warmup(self, size=(640, 480), frames=2):
+        """The service is already warm; nothing to do."""
+        return 0.0
+
+    def frameBuffer(self):
+        """Ring slot to capture the next frame into, or ``None`` before the first frame."""
+        if self.ring is None:
+            return None
+        return self.ring.view(1 - self._slot)
+
+    def _openRing(self, img):
+        if self.ring is not None:
+            self.ring.close()
+        self.ring = FrameRing(2, img.shape, img.dtype)
+        self.conn.send_bytes(_request(b'r') + json.dumps(self.ring.spec()).encode())
+        if self.conn.recv_bytes() != b'\x01':
+            self.ring.close()
+            self.ring = None
+            self.shared_memory = False
+
+    def findPose(self, img, draw=True, timestamp=None):
+        if self.shared_memory and (self.ring is None or not self.ring.fits(img)):
+            self._openRing(img)
+
+        if self.ring is not None:
+            slot = self.ring.slot_of(img)
+            if slot is None:
+                slot = 1 - self._slot
+                self.ring.write(slot, img)
+            self._slot = slot
+            self.conn.send_bytes(_request(b's', timestamp, slot))
+        else:
+            height, width, channels = img.shape
+            self.conn.send_bytes(_request(b'f', timestamp, height, width, channels)
+                                 + np.ascontiguousarray(img, np.uint8).tobytes())
+        landmarks = self.conn.recv_bytes()
+        profiler.mark('inference')
+
+        self._hasPose = bool(landmarks)
+        if self._hasPose:
+            self.lmArray[:] = np.frombuffer(landmarks, np.float32).reshape(NUM_LANDMARKS, 4)
+        if self.recorder is not None:
+            self.recorder.append(timestamp, self.lmArray if self._hasPose else None,
+                                 self._frameSize(img))
+        return img
+
+    def close(self):
+        """Detach from the service, returning its detector to the pool."""
+        if self.conn is not None:
+            try:
+                self.conn.send_bytes(_request(b'c'))
+            except OSError:
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def connect_detector(address=DEFAULT_ADDRESS, authkey=None, **detector_kwargs):
+    """Attach to a running service, or build and warm up a local detector."""
+    try:
+        return RemotePoseDetector(address, authkey)
+    except (OSError, AuthenticationError):
+        detector = PoseDetector(**detector_kwargs)
+        detector.warmup()
+        return detector
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep warmed-up pose detectors ready for exercise sessions.")
+    parser.add_argument('--host', default=DEFAULT_ADDRESS[0])
+    parser.add_argument('--port', type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument('--pool-size', type=int, default=1)
+    parser.add_argument('--complexity', type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument('--inference-size', type=int)
+    parser.add_argument('--key-file', help=f"shared key file (default: ${AUTHKEY_ENV} or {AUTHKEY_FILE}); "
+                                           "required with a non-loopback --host")
+    args = parser.parse_args(argv)
+
+    authkey = None
+    if args.key_file or os.environ.get(AUTHKEY_ENV):
+        authkey = load_authkey(args.key_file)
+    elif not is_loopback(args.host):
+        parser.error(f"--host {args.host} needs --key-file or ${AUTHKEY_ENV}")
+    server = DetectorServer((args.host, args.port), authkey=authkey, pool_size=args.pool_size,
+                            complexity=args.complexity, inference_size=args.inference_size)
+    server.start()
+    print(f"Pose detector service listening on {args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Fixed ring of frame slots in shared memory.
+
+Sending a frame to another process through a pipe pickles it, writes it,
+reads it and unpickles it again: several copies of about 1 MB per 640x480
+frame, which costs more than the inference a worker process saves.
+``FrameRing`` instead keeps ``slots`` frames in one
+``multiprocessing.shared_memory`` block. The producer writes each frame into
+a slot once (``cap.read(ring.view(slot))`` even decodes straight into it);
+the other process attaches to the block by name, wraps the slot in a NumPy
+view and passes it to ``PoseDetector.findPose`` without copying. Only the
+slot index travels over the pipe, and only the ``(33, 4)`` landmark array
+comes back.
+
+Slot ownership is up to the caller: ``acquire``/``release`` hand out free
+slots within the owning process, and a slot must not be rewritten until the
+reader is done with it.
+"""
+import sys
+import threading
+import weakref
+from collections import deque
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+def _free_block(shm, owner):
+    try:
+        shm.close()
+    except BufferError:
+        # A caller still holds a view; the mapping goes away with it
+        pass
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class FrameRing:
+    """``slots`` frames of ``shape`` and ``dtype`` in one shared memory block."""
+
+    def __init__(self, slots, shape, dtype=np.uint8, name=None, create=True, track=True):
+        if slots < 1:
+            raise ValueError("A frame ring needs at least one slot")
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner = create
+
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=self.frame_bytes * slots)
+        elif sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=track)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if not track:
+                # Otherwise this process's tracker unlinks the block at exit
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.name = self.shm.name
+        # Also runs at interpreter exit, so a ring that is never closed is not leaked
+        self._finalizer = weakref.finalize(self, _free_block, self.shm, create)
+
+        self._views = [np.ndarray(self.shape, self.dtype, buffer=self.shm.buf,
+                                  offset=slot * self.frame_bytes)
+                       for slot in range(slots)]
+        self._free = deque(range(slots))
+        self._cond = threading.Condition()
+
+    @classmethod
+    def attach(cls, spec, track=True):
+        """Open the ring described by another process's ``spec()``.
+
+        Pass ``track=False`` when the creating process owns the block's
+        lifetime, so this process's resource tracker never unlinks it.
+        """
+        name, slots, shape, dtype = spec
+        return cls(slots, shape, dtype, name=name, create=False, track=track)
+
+    def spec(self):
+        """Picklable ``(name, slots, shape, dtype)`` for ``attach``."""
+        return self.name, self.slots, self.shape, self.dtype.str
+
+    @property
+    def free(self):
+        """Number of slots not currently acquired."""
+        return len(self._free)
+
+    def fits(self, img):
+        return img.shape == self.shape and img.dtype == self.dtype
+
+    def view(self, slot):
+        """NumPy array over ``slot``; writes go straight to shared memory."""
+        return self._views[slot]
+
+    def slot_of(self, img):
+        """Return the slot ``img`` is a view of, or ``None``."""
+        for slot, view in enumerate(self._views):
+            if img is view or (img.ctypes.data == view.ctypes.data and self.fits(img)):
+                return slot
+        return None
+
+    def write(self, slot, img):
+        """Copy ``img`` into ``slot`` and return the slot's view."""
+        view = self._views[slot]
+        np.copyto(view, img)
+        return view
+
+    def acquire(self, timeout=None):
+        """Take a free slot, waiting up to ``timeout``; ``None`` on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._free, timeout):
+                return None
+            return self._free.popleft()
+
+    def release(self, slot):
+        """Return ``slot`` to the free list once its reader is done."""
+        with self._cond:
+            self._free.append(slot)
+            self._cond.notify()
+
+    def close(self):
+        """Unmap the block, and free it if this process created it."""
+        self._views = []
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
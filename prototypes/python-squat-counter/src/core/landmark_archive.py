@@ -0,0 +1,217 @@
+"""Compact on-disk recording of pose landmarks.
+
+An archive is a fixed-size JSON header followed by one packed record per
+frame: a float64 timestamp and the ``(33, 4)`` float32 landmark array
+(``x, y, z, visibility``). Frames without a detected pose are stored as NaN.
+Records are written in chunks and read back through ``np.memmap``, so a
+session can be re-counted without running MediaPipe at all.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from .pose_detector import NUM_LANDMARKS, PoseDetector
+
+MAGIC = b'YTLM'
+VERSION = 1
+HEADER_SIZE = 256
+ARCHIVE_EXTENSION = '.ytlm'
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('landmarks', '<f4', (NUM_LANDMARKS, 4)),
+])
+
+_PREFIX = struct.Struct('<4sHI')
+# Largest values ``close`` may add, reserved when the recorder is created
+_RESERVED = {'width': 99999, 'height': 99999, 'frames': 2 ** 40}
+
+
+def _header_fits(metadata):
+    return _PREFIX.size + len(json.dumps(metadata).encode('utf-8')) <= HEADER_SIZE
+
+
+def _write_header(f, metadata):
+    body = json.dumps(metadata).encode('utf-8')
+    if _PREFIX.size + len(body) > HEADER_SIZE:
+        raise ValueError("Archive metadata too large")
+    f.seek(0)
+    f.write(_PREFIX.pack(MAGIC, VERSION, len(body)) + body.ljust(HEADER_SIZE - _PREFIX.size))
+
+
+def _read_header(f):
+    magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+    if magic != MAGIC:
+        raise ValueError("Not a landmark archive")
+    if version != VERSION:
+        raise ValueError(f"Unsupported landmark archive version: {version}")
+    return json.loads(f.read(length).decode('utf-8'))
+
+
+class LandmarkRecorder:
+    """Write per-frame landmarks to an archive in fixed-size chunks.
+
+    A ``source`` path too long for the header is shortened to its file name
+    (and then to its end); other metadata that does not fit raises here,
+    before anything is recorded.
+    """
+
+    def __init__(self, path, chunk_size=256, **metadata):
+        self.path = path
+        self.metadata = dict(metadata, frames=0)
+        source = self.metadata.get('source')
+        if not _header_fits(dict(self.metadata, **_RESERVED)) and isinstance(source, str):
+            source = self.metadata['source'] = os.path.basename(source)
+            while source and not _header_fits(dict(self.metadata, **_RESERVED)):
+                source = self.metadata['source'] = source[1:]
+        if not _header_fits(dict(self.metadata, **_RESERVED)):
+            raise ValueError("Archive metadata too large")
+        self.frames = 0
+        self._chunk = np.empty(chunk_size, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self._file = open(path, 'wb')
+        _write_header(self._file, self.metadata)
+
+    def append(self, timestamp, landmarks, frame_size=None):
+        """Record one frame; ``landmarks`` is ``None`` when no pose was found."""
+        if frame_size is not None and 'width' not in self.metadata:
+            self.metadata['width'], self.metadata['height'] = map(int, frame_size)
+
+        record = self._chunk[self._pending]
+        record['timestamp'] = timestamp
+        if landmarks is None:
+            record['landmarks'] = np.nan
+        else:
+            record['landmarks'] = landmarks
+        self._pending += 1
+        self.frames += 1
+
+        if self._pending == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to disk."""
+        if self._pending:
+            self._file.write(self._chunk[:self._pending].tobytes())
+            self._pending = 0
+
+    def close(self):
+        """Flush remaining records and finalize the header."""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+            self.metadata['frames'] = self.frames
+            _write_header(self._file, self.metadata)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LandmarkArchive:
+    """Memory-mapped, random-access view of a recorded session."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.metadata = _read_header(f)
+
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+        self.timestamps = self.records['timestamp']
+        self.landmarks = self.records['landmarks']
+
+    @property
+    def frame_size(self):
+        return self.metadata.get('width'), self.metadata.get('height')
+
+    def __len__(self):
+        return len(self.records)
+
+    def index_at(self, timestamp):
+        """Return the index of the last frame at or before ``timestamp``."""
+        index = int(np.searchsorted(self.timestamps, timestamp, side='right')) - 1
+        return max(index, 0)
+
+    def detected(self):
+        """Boolean mask of frames in which a pose was found."""
+        return ~np.isnan(self.landmarks[:, 0, 0])
+
+    def pixel_points(self, frame_size=None):
+        """Return ``(frames, 33, 2)`` pixel coordinates for the whole session.
+
+        Coordinates are truncated like ``PoseDetector.findPosition`` so angles
+        computed from them match a live run exactly.
+        """
+        w, h = frame_size or self.frame_size
+        if w is None:
+            return np.full(self.landmarks.shape[:2] + (2,), np.nan)
+        return np.trunc(self.landmarks[:, :, :2] * np.array([w, h], dtype=np.float64))
+
+
+class LandmarkReplay(PoseDetector):
+    """Drop-in ``PoseDetector`` that replays an archive instead of running MediaPipe.
+
+    ``findPose`` advances to the next recorded frame; ``findPosition``,
+    ``findAngle`` and ``findAngles`` then behave as they did during recording.
+    """
+
+    def __init__(self, archive):
+        if not isinstance(archive, LandmarkArchive):
+            archive = LandmarkArchive(archive)
+        self.archive = archive
+        self.index = -1
+        self.timestamp = None
+        self._initBuffers()
+
+    def seek(self, timestamp):
+        """Position the replay so the next ``findPose`` returns ``timestamp``."""
+        self.index = self.archive.index_at(timestamp) - 1
+
+    def frames(self, start_time=None, end_time=None):
+        """Yield ``(frame_id, timestamp, None)`` for the recorded frames."""
+        start = 0 if start_time is None else self.archive.index_at(start_time)
+        timestamps = self.archive.timestamps
+        for frame_id in range(start, len(self.archive)):
+            timestamp = float(timestamps[frame_id])
+            if end_time is not None and timestamp > end_time:
+                break
+            self.index = frame_id - 1
+            yield frame_id, timestamp, None
+
+    def findPose(self, img=None, draw=False, timestamp=None):
+        self.index += 1
+        if self.index >= len(self.archive):
+            raise IndexError("End of landmark archive")
+        self.timestamp = float(self.archive.timestamps[self.index])
+        return img
+
+    def _readLandmarks(self):
+        landmarks = self.archive.landmarks[self.index]
+        if np.isnan(landmarks[0, 0]):
+            return False
+        self.lmArray[:] = landmarks
+        return True
+
+    def _frameSize(self, img):
+        if img is None:
+            return self.archive.frame_size
+        return super()._frameSize(img)
+
+    def findPosition(self, img=None, draw=False, as_array=False):
+        if as_array:
+            return self._fillArray(img, draw)
+        return self._positionFromArray(img, draw)
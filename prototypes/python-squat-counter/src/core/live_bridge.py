@@ -0,0 +1,285 @@
+"""Stream live exercise state to local web clients over WebSocket.
+
+``LiveBridge`` runs the pose pipeline (capture, detector, exercise counter)
+on a background thread and pushes one compact JSON state per frame to any
+number of WebSocket subscribers on an ``asyncio`` server::
+
+    python -m src.core.live_bridge squat --port 8765
+
+    // in the web app
+    const ws = new WebSocket('ws://localhost:8765/');
+    ws.onmessage = (e) => { setState(JSON.parse(e.data)); ws.send('ok'); };
+
+A state looks like ``{"exercise": "squat", "frame": 412, "timestamp":
+13.73, "count": 5, "phase": 1, "form": 1, "feedback": "Up", "pose": true,
+"angles": {"knee": 92.4}}`` (hold exercises add ``elapsed``).
+``GET /state`` returns the latest one and ``GET /stats`` the fan-out
+counters, both with CORS headers for the dev server.
+
+Fan-out is latest-value only: publishing overwrites a single slot and wakes
+the subscribers, and the inference thread never waits for any client. A
+client acknowledges each state by sending any text message once it has
+handled it; the next state it gets is the newest one at that moment, so a
+slow client skips states instead of falling behind. Kernel socket buffers
+on both ends can hold hundreds of small states, so draining the send side
+alone cannot tell whether a client keeps up; that is why delivery waits for
+the acknowledgement. ``/?ack=0`` streams without acknowledgements for
+clients that cannot send them; such a client can lag by as much as the
+socket buffers hold.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+
+from ..exercises import EXERCISES
+from ..exercises.events import camera_frames
+from ..utils.camera_utils import DROP_NEWEST, DROP_NONE, ThreadedCapture
+from ..utils.websocket import (OP_CLOSE, OP_PING, OP_PONG, OP_TEXT, WebSocketError, encode_frame,
+                               handshake_response, http_response, is_upgrade, read_frame,
+                               read_request)
+from .detector_service import connect_detector
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+SEND_BUFFER = 4096  # bytes; the kernel rounds it up to its minimum (for ?ack=0)
+
+
+def key_angles(exercise, angles):
+    """The angles an exercise displays (all of them when it declares none), rounded."""
+    display = getattr(getattr(exercise, 'definition', None), 'display', None)
+    names = [feature for _, feature in display] if display else angles
+    return {name: round(float(angles[name]), 1) for name in names}
+
+
+def iter_states(frames, detector, exercise, name):
+    """Yield the state dict of ``exercise`` after each ``(frame_id, timestamp, img)`` frame."""
+    for frame_id, timestamp, img in frames:
+        if hasattr(detector, 'setHold'):
+            detector.setHold(exercise.holding)
+        detector.findPose(img, False, timestamp=timestamp)
+        angles = None
+        if detector.findPosition(img, False, as_array=True) is not None:
+            angles = exercise.get_required_angles(detector, img)
+            exercise.update_feedback_and_count(angles, timestamp=timestamp)
+
+        state = {"exercise": name, "frame": frame_id, "timestamp": round(timestamp, 3),
+                 "count": int(exercise.count), "phase": int(exercise.direction),
+                 "form": int(exercise.form), "feedback": exercise.feedback,
+                 "pose": angles is not None,
+                 "angles": None if angles is None else key_angles(exercise, angles)}
+        elapsed = exercise.summary().get('elapsed')
+        if elapsed is not None:
+            state["elapsed"] = elapsed
+        yield state
+
+
+class _Subscriber:
+    __slots__ = ('wake', 'credit', 'open', 'version', 'sent', 'skipped')
+
+    def __init__(self):
+        self.wake = asyncio.Event()
+        self.credit = asyncio.Event()
+        self.open = True
+        self.version = 0
+        self.sent = 0
+        self.skipped = 0
+
+
+class StateHub:
+    """Latest-value fan-out; only touched from the event loop thread."""
+
+    def __init__(self):
+        self.latest = None  # JSON bytes of the newest state
+        self.frame = None   # the same state as a WebSocket text frame
+        self.version = 0
+        self.subscribers = set()
+
+    def publish(self, message):
+        self.latest = message
+        self.frame = encode_frame(message)
+        self.version += 1
+        for subscriber in self.subscribers:
+            subscriber.wake.set()
+
+    def subscribe(self):
+        subscriber = _Subscriber()
+        if self.latest is not None:
+            subscriber.wake.set()
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.open = False
+        subscriber.wake.set()
+        subscriber.credit.set()
+        self.subscribers.discard(subscriber)
+
+    def close(self):
+        for subscriber in list(self.subscribers):
+            self.unsubscribe(subscriber)
+
+
+class LiveBridge:
+    """WebSocket/HTTP server fed by a pose pipeline thread.
+
+    ``source`` is a camera index, or a video file or stream URL read in
+    full. ``port=0`` picks a free port; ``address`` holds the bound one
+    after ``start``.
+    """
+
+    def __init__(self, exercise, source=0, detector=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if exercise not in EXERCISES:
+            raise ValueError(f"Unknown exercise {exercise!r}")
+        self.exercise = exercise
+        self.source = source
+        self.detector = detector
+        self.address = (host, port)
+        self.hub = StateHub()
+        self.pipeline = None
+        self._server = None
+        self._stop = threading.Event()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, *self.address)
+        self.address = self._server.sockets[0].getsockname()[:2]
+        self.pipeline = loop.run_in_executor(None, self._run_pipeline, loop)
+        return self
+
+    def _run_pipeline(self, loop):
+        exercise = EXERCISES[self.exercise]()
+        detector = self.detector or connect_detector()
+        capture = ThreadedCapture(self.source, drop_policy=DROP_NONE if isinstance(self.source, str)
+                                  else DROP_NEWEST)
+        if not capture.cap.isOpened():
+            raise RuntimeError(f"Could not open video source {self.source!r}")
+        with capture:
+            for state in iter_states(camera_frames(capture), detector, exercise, self.exercise):
+                if self._stop.is_set():
+                    break
+                # Encoded here so the event loop only swaps a reference
+                message = json.dumps(state, separators=(',', ':')).encode()
+                loop.call_soon_threadsafe(self.hub.publish, message)
+
+    async def _handle(self, reader, writer):
+        try:
+            method, path, headers = await read_request(reader)
+            path, _, query = path.partition('?')
+            if is_upgrade(headers):
+                await self._subscribe(reader, writer, headers, ack='ack=0' not in query.split('&'))
+                return
+            if path == '/state':
+                writer.write(http_response('200 OK', self.hub.latest or b'null'))
+            elif path == '/stats':
+                writer.write(http_response('200 OK', json.dumps(self.stats()).encode()))
+            else:
+                writer.write(http_response('404 Not Found', b'{"error":"not found"}'))
+            await writer.drain()
+        except (EOFError, ConnectionError, WebSocketError):
+            pass
+        finally:
+            writer.close()
+
+    async def _subscribe(self, reader, writer, headers, ack=True):
+        writer.write(handshake_response(headers))
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            # Little room in flight, so a slow link skips states instead of lagging behind
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER)
+        writer.transport.set_write_buffer_limits(high=0)
+
+        subscriber = self.hub.subscribe()
+        if ack:
+            subscriber.credit.set()
+        receiver = asyncio.ensure_future(self._receive(reader, writer, subscriber))
+        try:
+            while True:
+                if ack:
+                    await subscriber.credit.wait()
+                    subscriber.credit.clear()
+                await subscriber.wake.wait()
+                subscriber.wake.clear()
+                if not subscriber.open:
+                    break
+                hub = self.hub
+                if subscriber.version:
+                    subscriber.skipped += hub.version - subscriber.version - 1
+                subscriber.version = hub.version
+                writer.write(hub.frame)
+                subscriber.sent += 1
+                # Only this client waits; states published meanwhile collapse into one
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.hub.unsubscribe(subscriber)
+            receiver.cancel()
+
+    async def _receive(self, reader, writer, subscriber):
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+                elif opcode == OP_TEXT:
+                    # Any text message acknowledges the last state and asks for the next
+                    subscriber.credit.set()
+        except (EOFError, ConnectionError, WebSocketError):
+            pass
+        finally:
+            self.hub.unsubscribe(subscriber)
+            writer.close()
+
+    def stats(self):
+        return {"published": self.hub.version,
+                "subscribers": [{"sent": s.sent, "skipped": s.skipped}
+                                for s in self.hub.subscribers]}
+
+    async def close(self):
+        self._stop.set()
+        self.hub.close()
+        if self._server is not None:
+            self._server.close()
+        if self.pipeline is not None:
+            try:
+                await self.pipeline
+            except Exception:
+                pass
+
+    async def run(self):
+        """Serve until cancelled; keeps serving the last state when the source ends."""
+        await self.start()
+        print(f"Live bridge on ws://{self.address[0]}:{self.address[1]}/ ({self.exercise})")
+        try:
+            await self.pipeline
+            print("Video source ended; serving the last state")
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream live exercise state over WebSocket.")
+    parser.add_argument('exercise', choices=sorted(EXERCISES))
+    parser.add_argument('--source', default='0', help="camera index, video file or stream URL")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    bridge = LiveBridge(args.exercise, source, host=args.host, port=args.port)
+    try:
+        asyncio.run(bridge.run())
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Asynchronous pose detection on the MediaPipe Tasks ``PoseLandmarker``.
+
+The legacy ``mp.solutions.pose.Pose.process`` blocks the frame loop for the
+whole inference. ``LivePoseDetector`` runs the Tasks ``PoseLandmarker`` in
+``LIVE_STREAM`` mode instead: ``findPose`` hands the frame to
+``detect_async`` and returns right away, and MediaPipe delivers landmarks on
+its own thread through a result callback. Capture, inference and rendering
+of consecutive frames overlap, and frames that arrive while the model is
+busy are dropped by MediaPipe rather than queued.
+
+The Tasks API needs a model bundle (``mediapipe>=0.10``)::
+
+    mkdir -p models
+    curl -L -o models/pose_landmarker_full.task \\
+        https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from ..utils.profiler import profiler
+from .backends import NUM_LANDMARKS, _load_mediapipe
+from .pose_detector import PoseDetector
+
+MODEL_NAMES = ('lite', 'full', 'heavy')  # by legacy model_complexity 0, 1, 2
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'models'))
+MODEL_URL = ('https://storage.googleapis.com/mediapipe-models/pose_landmarker/'
+             'pose_landmarker_{0}/float16/latest/pose_landmarker_{0}.task')
+
+
+def default_model(complexity=1):
+    """Default model path for ``complexity`` under ``models/``."""
+    return os.path.join(MODEL_DIR, f'pose_landmarker_{MODEL_NAMES[complexity]}.task')
+
+
+class LivePoseDetector(PoseDetector):
+    """``PoseDetector`` backed by ``PoseLandmarker.detect_async``.
+
+    ``findPosition``, ``findAngle`` and ``findAngles`` read the newest
+    finished result, which is usually one or two frames behind the frame
+    just passed to ``findPose``; ``resultTimestamp`` is the time of the
+    frame it came from. With ``wait=True`` ``findPose`` blocks until the
+    current frame is done, like the legacy detector. ``findPose`` does not
+    draw the MediaPipe skeleton.
+    """
+
+    def __init__(self, complexity=1, model_path=None, detectionCon=0.5, presenceCon=0.5,
+                 trackCon=0.5, inference_size=None, wait=False):
+        mp = _load_mediapipe()
+        model_path = model_path or default_model(complexity)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Pose landmarker model not found: {model_path}. Download it "
+                                    f"from {MODEL_URL.format(MODEL_NAMES[complexity])}")
+
+        self.complexity = complexity
+        self.model_path = model_path
+        self.wait = wait
+        self._mp = mp
+        self._cond = threading.Condition()
+        self._latest = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self._latestValid = False
+        self._latestMs = None
+        self._lastSentMs = -1
+        self.resultTimestamp = None
+        self.submitted = 0
+        self.completed = 0
+
+        vision = mp.tasks.vision
+        options = vision.PoseLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=1,
+            min_pose_detection_confidence=detectionCon,
+            min_pose_presence_confidence=presenceCon,
+            min_tracking_confidence=trackCon,
+            result_callback=self._onResult)
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+
+        self._initBuffers()
+        self.roi_tracking = False
+        self.roi = None
+        self.inference_size = inference_size
+        self._inferenceShape = None
+        self._smallBgr = None
+        self._rgb = None
+
+    def _onResult(self, result, image, timestamp_ms):
+        # Runs on MediaPipe's thread
+        with self._cond:
+            self._latestValid = bool(result.pose_landmarks)
+            if self._latestValid:
+                for row, lm in zip(self._latest, result.pose_landmarks[0]):
+                    row[0] = lm.x
+                    row[1] = lm.y
+                    row[2] = lm.z
+                    row[3] = lm.visibility or 0.0
+            self._latestMs = timestamp_ms
+            self.completed += 1
+            self._cond.notify_all()
+
+    def _submit(self, img, timestamp):
+        rgb = self._inferenceFrame(img)
+        profiler.mark('convert')
+        # Timestamps must strictly increase; mp.Image copies the pixels, so the
+        # RGB buffer can be reused while inference runs
+        ms = max(int(timestamp * 1000), self._lastSentMs + 1)
+        self._lastSentMs = ms
+        self.landmarker.detect_async(self._mp.Image(image_format=self._mp.ImageFormat.SRGB,
+                                                    data=rgb), ms)
+        self.submitted += 1
+        return ms
+
+    def _waitFor(self, ms, timeout=1.0):
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._latestMs is not None and self._latestMs >= ms, timeout)
+
+    def findPose(self, img, draw=True, timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        ms = self._submit(img, timestamp)
+        if self.wait:
+            self._waitFor(ms)
+        profiler.mark('inference')
+
+        with self._cond:
+            self._hasPose = self._latestValid
+            self.lmArray[:] = self._latest
+            self.resultTimestamp = None if self._latestMs is None else self._latestMs / 1000
+        if self.recorder is not None:
+            self.recorder.append(timestamp, self.lmArray if self._hasPose else None,
+                                 self._frameSize(img))
+        return img
+
+    def warmup(self, size=(640, 480), frames=2):
+        start = time.perf_counter()
+        blank = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        for _ in range(frames):
+            self._waitFor(self._submit(blank, time.monotonic()), timeout=10.0)
+        with self._cond:
+            self._latestValid = False
+            self.submitted = self.completed = 0
+        return time.perf_counter() - start
+
+    @property
+    def dropRatio(self):
+        """Fraction of submitted frames MediaPipe skipped because it was busy."""
+        return 1 - self.completed / self.submitted if self.submitted else 0.0
+
+    def close(self):
+        self.landmarker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,17 +1,61 @@
-import cv2
-import os
+import math
+import time
+import numpy as np
 
-# Disable GPU acceleration to avoid OpenGL context issues on macOS
-os.environ['MEDIAPIPE_DISABLE_GPU'] = '1'
-os.environ['GLOG_minloglevel'] = '2'  # Reduce logging
+from ..utils.lazy import lazy_import
+from ..utils.profiler import profiler
+from .backends import NUM_LANDMARKS, MediaPipeBackend
 
-import mediapipe as mp
-import math
+# Imported on first use so replay, analysis and service clients start fast
+cv2 = lazy_import('cv2')
+
+# Skeleton edges drawn by ``drawPose`` (MediaPipe's POSE_CONNECTIONS)
+POSE_CONNECTIONS = ((0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+                    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+                    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20), (11, 23),
+                    (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+                    (28, 30), (29, 31), (30, 32), (27, 31), (28, 32))
+
+
+def _triplet_indices(triplets):
+    idx = np.asarray(triplets, dtype=np.intp)
+    if idx.ndim != 2 or idx.shape[1] != 3:
+        raise ValueError("triplets must be a sequence of (p1, p2, p3)")
+    return idx
+
+
+def compute_angles(points, triplets):
+    """Compute joint angles for every (p1, p2, p3) triplet in one pass.
+
+    ``points`` is an array of shape ``(..., 33, 2)`` so a single frame or a
+    whole recorded session can be processed at once. Angles are folded into
+    0-180 degrees exactly like ``PoseDetector.findAngle``; the result has
+    shape ``(..., len(triplets))``.
+    """
+    idx = _triplet_indices(triplets)
+    points = np.asarray(points, dtype=np.float64)
+    a = points[..., idx[:, 0], :]
+    b = points[..., idx[:, 1], :]
+    c = points[..., idx[:, 2], :]
+
+    angle = np.degrees(np.arctan2(c[..., 1] - b[..., 1], c[..., 0] - b[..., 0]) -
+                       np.arctan2(a[..., 1] - b[..., 1], a[..., 0] - b[..., 0]))
+    angle = np.mod(angle, 360)
+    return np.where(angle > 180, 360 - angle, angle)
 
 class PoseDetector:
+    """Landmarks, pixel positions and joint angles of the pose in a frame.
+
+    Inference runs on ``backend`` (a ``PoseBackend``); by default that is
+    MediaPipe Pose built from the MediaPipe arguments. The detector prepares
+    the RGB frames the backend sees, tracks the person's ROI and maps the
+    landmarks back onto the full frame, so every backend gets the same crop.
+    """
+
     def __init__(self, mode=False, complexity=1, smooth_landmarks=True,
                  enable_segmentation=False, smooth_segmentation=True,
-                 detectionCon=0.5, trackCon=0.5):
+                 detectionCon=0.5, trackCon=0.5, roi_tracking=False, roi_margin=0.25,
+                 roi_size=256, inference_size=None, backend=None):
         
         self.mode = mode 
         self.complexity = complexity
@@ -21,38 +65,310 @@ class PoseDetector:
         self.detectionCon = detectionCon
         self.trackCon = trackCon
         
-        self.mpDraw = mp.solutions.drawing_utils
-        self.mpPose = mp.solutions.pose
-        self.pose = self.mpPose.Pose(self.mode, self.complexity, self.smooth_landmarks,
-                                     self.enable_segmentation, self.smooth_segmentation,
-                                     self.detectionCon, self.trackCon)
-        
-    def findPose(self, img, draw=True):
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.pose.process(imgRGB)
+        if backend is None:
+            backend = MediaPipeBackend(mode, complexity, smooth_landmarks, enable_segmentation,
+                                       smooth_segmentation, detectionCon, trackCon)
+        self.backend = backend
+
+        self._initBuffers()
+
+        # Longest side of the full frame sent to the backend; None keeps camera size
+        self.inference_size = inference_size
+        self._inferenceShape = None
+        self._smallBgr = None
+        self._rgb = None
+
+        # Track the person with a crop around the previous frame's landmarks
+        self.roi_tracking = roi_tracking
+        self.roi_margin = roi_margin
+        self.roi_size = roi_size
+        self.roi = None  # (x0, y0, side) in pixels of the full frame
+        if roi_tracking:
+            self._roiBgr = np.empty((roi_size, roi_size, 3), dtype=np.uint8)
+            self._roiRgb = np.empty((roi_size, roi_size, 3), dtype=np.uint8)
+
+    def reset(self):
+        """Start over, dropping the backend's tracking and smoothing state."""
+        self.backend.reset()
+        self.roi = None
+
+    def close(self):
+        """Release the backend."""
+        self.backend.close()
+
+    def _initBuffers(self):
+        # Reused across frames by findPosition(as_array=True)
+        self.lmArray = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self.lmPixels = np.zeros((NUM_LANDMARKS, 2), dtype=np.float64)
+        self._scale = np.zeros(2, dtype=np.float64)
+        self._usePixels = False
+        self._hasPose = False
+        self.recorder = None
         
-        if self.results.pose_landmarks:
-            if draw:
-                self.mpDraw.draw_landmarks(img, self.results.pose_landmarks,
-                                           self.mpPose.POSE_CONNECTIONS)
-                
+    def findPose(self, img, draw=True, timestamp=None):
+        landmarks = None
+        if self.roi is not None:
+            landmarks = self._processRoi(img)
+
+        if landmarks is None:
+            imgRGB = self._inferenceFrame(img)
+            profiler.mark('convert')
+            landmarks = self.backend.process(imgRGB)
+            profiler.mark('inference')
+
+        self.setLandmarks(img, landmarks, timestamp)
+        if draw and self._hasPose:
+            self.drawPose(img)
         return img
+
+    def setLandmarks(self, img, landmarks, timestamp=None):
+        """Use full-frame ``landmarks`` (e.g. from ``processBatch``) as the result for ``img``."""
+        self._hasPose = landmarks is not None
+        if self._hasPose:
+            self.lmArray[:] = landmarks
+
+        if self.roi_tracking:
+            self._updateRoi(img)
+
+        if self.recorder is not None:
+            self.recorder.append(time.monotonic() if timestamp is None else timestamp,
+                                 self.lmArray if self._hasPose else None, self._frameSize(img))
+        return img
+
+    def processBatch(self, imgs):
+        """Run the backend on several frames in one call.
+
+        Returns full-frame landmarks (or ``None``) per frame; pass them to
+        ``setLandmarks`` in order. With ROI tracking every frame is cropped
+        to the ROI left by the previous batch, and frames whose crop loses
+        the pose are retried on the whole frame in a second call. Only for
+        backends without frame-to-frame state, i.e. not MediaPipe.
+        """
+        results = [None] * len(imgs)
+        roi = self.roi
+        if roi is not None:
+            crops = [self._roiFrame(img, roi) for img in imgs]
+            profiler.mark('convert')
+            for i, landmarks in enumerate(self.backend.batch_process(crops)):
+                if landmarks is not None:
+                    results[i] = self._mapRoi(imgs[i], roi, landmarks, landmarks)
+
+        missed = [i for i, landmarks in enumerate(results) if landmarks is None]
+        if missed:
+            frames = [self._inferenceFrame(imgs[i]).copy() for i in missed]
+            profiler.mark('convert')
+            for i, landmarks in zip(missed, self.backend.batch_process(frames)):
+                results[i] = landmarks
+        profiler.mark('inference')
+        return results
+
+    def drawPose(self, img):
+        """Draw the skeleton of the last processed frame like MediaPipe's ``draw_landmarks``."""
+        h, w = img.shape[:2]
+        points = {}
+        for id, (x, y, _, visibility) in enumerate(self.lmArray):
+            if visibility >= 0.5 and 0 <= x <= 1 and 0 <= y <= 1:
+                points[id] = (min(int(x * w), w - 1), min(int(y * h), h - 1))
+
+        for start, end in POSE_CONNECTIONS:
+            if start in points and end in points:
+                cv2.line(img, points[start], points[end], (224, 224, 224), 2)
+        for point in points.values():
+            cv2.circle(img, point, 3, (255, 255, 255), 2)
+            cv2.circle(img, point, 2, (0, 0, 255), 2)
+        return img
+
+    def frameBuffer(self):
+        """Array for ``cap.read`` to decode the next frame into, if the detector has one."""
+        return None
+
+    def warmup(self, size=(640, 480), frames=2):
+        """Run inference on blank frames so the first real frame is not slow.
+
+        Loads the model, initializes the graph and allocates the inference
+        buffers for ``size``; returns the seconds spent.
+        """
+        start = time.perf_counter()
+        blank = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        for _ in range(frames):
+            self.backend.process(self._inferenceFrame(blank))
+        return time.perf_counter() - start
+
+    def _inferenceFrame(self, img):
+        """Return ``img`` as RGB at inference resolution in reused buffers.
+
+        Buffers are only reallocated when the camera frame size changes.
+        Landmarks are normalized, so they still map onto the original frame.
+        """
+        shape = img.shape
+        if shape != self._inferenceShape:
+            h, w = shape[:2]
+            scale = 1.0
+            if self.inference_size:
+                scale = min(1.0, self.inference_size / max(w, h))
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            self._smallBgr = np.empty((size[1], size[0], 3), dtype=np.uint8) if scale < 1 else None
+            self._rgb = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._inferenceShape = shape
+
+        if self._smallBgr is not None:
+            cv2.resize(img, (self._smallBgr.shape[1], self._smallBgr.shape[0]),
+                       dst=self._smallBgr, interpolation=cv2.INTER_AREA)
+            img = self._smallBgr
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+    def _roiFrame(self, img, roi, bgr=None, rgb=None):
+        """Return the ``roi`` crop of ``img`` as RGB at ``roi_size``, in new arrays unless given."""
+        x0, y0, side = roi
+        bgr = cv2.resize(img[y0:y0 + side, x0:x0 + side], (self.roi_size, self.roi_size),
+                         dst=bgr, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+
+    def _mapRoi(self, img, roi, landmarks, out):
+        """Write crop-normalized ``landmarks`` into ``out`` normalized to the full frame."""
+        x0, y0, side = roi
+        h, w = img.shape[:2]
+        xyz = landmarks[:, :3].astype(np.float64)
+        out[:, 0] = (x0 + xyz[:, 0] * side) / w
+        out[:, 1] = (y0 + xyz[:, 1] * side) / h
+        out[:, 2] = xyz[:, 2] * side / w
+        out[:, 3] = landmarks[:, 3]
+        return out
+
+    def _processRoi(self, img):
+        """Run inference on the tracked crop, or return ``None`` when the pose is lost."""
+        crop = self._roiFrame(img, self.roi, self._roiBgr, self._roiRgb)
+        profiler.mark('convert')
+        landmarks = self.backend.process(crop)
+        profiler.mark('inference')
+
+        if landmarks is None:
+            # Fall back to a full-frame detection pass on the same frame
+            self.roi = None
+            return None
+        return self._mapRoi(img, self.roi, landmarks, self.lmArray)
+
+    def _updateRoi(self, img):
+        """Pick the crop for the next frame from this frame's landmarks.
+
+        The crop only moves when the body leaves its inner area or changes
+        size noticeably, so the backend's smoothing sees a stable frame. A pose
+        that needs a square wider than the frame's short side (e.g. a plank
+        across a landscape frame) is tracked on the full frame instead, so
+        no crop ever cuts off hands or feet.
+        """
+        if not self._hasPose:
+            self.roi = None
+            return
+
+        h, w = img.shape[:2]
+        visible = self.lmArray[:, 3] >= 0.5
+        if not visible.any():
+            self.roi = None
+            return
+
+        xs = self.lmArray[visible, 0] * w
+        ys = self.lmArray[visible, 1] * h
+        left, right = float(xs.min()), float(xs.max())
+        top, bottom = float(ys.min()), float(ys.max())
+        side = max(right - left, bottom - top) * (1 + 2 * self.roi_margin)
+        if side > min(w, h):
+            self.roi = None
+            return
+
+        if self.roi is not None:
+            x0, y0, current = self.roi
+            inset = current * self.roi_margin / 2
+            if (0.7 * current <= side <= current and
+                    left >= x0 + inset and right <= x0 + current - inset and
+                    top >= y0 + inset and bottom <= y0 + current - inset):
+                return
+
+        side = int(min(max(side, self.roi_size / 4), w, h))
+        x0 = int(min(max((left + right - side) / 2, 0), w - side))
+        y0 = int(min(max((top + bottom - side) / 2, 0), h - side))
+        self.roi = (x0, y0, side)
+
+    def startRecording(self, recorder):
+        """Append every processed frame to ``recorder`` (a ``LandmarkRecorder``)."""
+        self.recorder = recorder
+
+    def stopRecording(self):
+        """Stop recording and close the recorder."""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
     
-    def findPosition(self, img, draw=True):
+    def findPosition(self, img, draw=True, as_array=False):
+        """Return landmark positions for the last processed frame.
+
+        By default this is the legacy list of ``[id, cx, cy]`` pixel entries.
+        With ``as_array=True`` the preallocated ``(33, 4)`` float32 array of
+        normalized ``(x, y, z, visibility)`` is filled in place and returned
+        (or ``None`` when no pose was found); ``self.lmPixels`` then holds the
+        matching ``(33, 2)`` pixel coordinates.
+        """
+        if as_array:
+            lmArray = self._fillArray(img, draw)
+        else:
+            lmArray = self._positionFromArray(img, draw)
+        profiler.mark('position')
+        return lmArray
+
+    def _positionFromArray(self, img, draw):
+        """Build the legacy ``lmList`` from ``lmArray``."""
         self.lmList = []
-        if self.results.pose_landmarks:
-            for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                h, w, c = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lmList.append([id, cx, cy])
-                if draw:
-                    cv2.circle(img, (cx, cy), 5, (255, 0, 0), cv2.FILLED)
+        if self._fillArray(img, draw) is not None:
+            self.lmList = [[id, int(cx), int(cy)] for id, (cx, cy) in enumerate(self.lmPixels)]
+        self._usePixels = False
         return self.lmList
+
+    def _readLandmarks(self):
+        """Whether ``lmArray`` holds a pose for the last processed frame."""
+        return self._hasPose
+
+    def _fillArray(self, img, draw):
+        self._usePixels = True
+        if not self._readLandmarks():
+            return None
+
+        self.pixelPositions(img)
+        if draw:
+            for cx, cy in self.lmPixels.astype(int):
+                cv2.circle(img, (int(cx), int(cy)), 5, (255, 0, 0), cv2.FILLED)
+        return self.lmArray
+
+    def _frameSize(self, img):
+        h, w = img.shape[:2]
+        return w, h
+
+    def pixelPositions(self, img):
+        """Scale ``self.lmArray`` to pixel coordinates of ``img`` in place.
+
+        Values are truncated the same way as the legacy ``lmList`` so angles
+        match exactly.
+        """
+        self._scale[0], self._scale[1] = self._frameSize(img)
+        np.multiply(self.lmArray[:, :2], self._scale, out=self.lmPixels)
+        np.trunc(self.lmPixels, out=self.lmPixels)
+        return self.lmPixels
+
+    def pixelPoints(self):
+        """Return the current frame's ``(33, 2)`` pixel coordinates as an array."""
+        if self._usePixels:
+            return self.lmPixels
+        return np.array([lm[1:] for lm in self.lmList], dtype=np.float64)
+
+    def _point(self, p):
+        if self._usePixels:
+            return int(self.lmPixels[p, 0]), int(self.lmPixels[p, 1])
+        return self.lmList[p][1:]
         
     def findAngle(self, img, p1, p2, p3, draw=True):   
-        x1, y1 = self.lmList[p1][1:]
-        x2, y2 = self.lmList[p2][1:]
-        x3, y3 = self.lmList[p3][1:]
+        x1, y1 = self._point(p1)
+        x2, y2 = self._point(p2)
+        x3, y3 = self._point(p3)
         
         angle = math.degrees(math.atan2(y3-y2, x3-x2) - 
                              math.atan2(y1-y2, x1-x2))
@@ -76,4 +392,38 @@ class PoseDetector:
             
             cv2.putText(img, str(int(angle)), (x2-50, y2+50), 
                         cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 255), 2)
-        return angle
\ No newline at end of file
+        return angle
+
+    def findAngles(self, triplets):
+        """Compute several joint angles at once without touching the image.
+
+        ``triplets`` is either a sequence of ``(p1, p2, p3)`` tuples, giving
+        back an array of angles in the same order, or a mapping of name to
+        triplet, giving back a dict of name to angle.
+        """
+        points = self.pixelPoints()
+        if isinstance(triplets, dict):
+            angles = compute_angles(points, list(triplets.values()))
+            return {name: float(angle) for name, angle in zip(triplets, angles)}
+        return compute_angles(points, triplets)
+
+    def drawAngles(self, img, triplets, angles):
+        """Draw angle annotations previously returned by ``findAngles``."""
+        if isinstance(triplets, dict):
+            angles = [angles[name] for name in triplets]
+            triplets = list(triplets.values())
+
+        for (p1, p2, p3), angle in zip(triplets, angles):
+            x1, y1 = self._point(p1)
+            x2, y2 = self._point(p2)
+            x3, y3 = self._point(p3)
+
+            cv2.line(img, (x1, y1), (x2, y2), (255, 255, 255), 3)
+            cv2.line(img, (x3, y3), (x2, y2), (255, 255, 255), 3)
+            for x, y in ((x1, y1), (x2, y2), (x3, y3)):
+                cv2.circle(img, (x, y), 5, (0, 0, 255), cv2.FILLED)
+                cv2.circle(img, (x, y), 15, (0, 0, 255), 2)
+
+            cv2.putText(img, str(int(angle)), (x2-50, y2+50),
+                        cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 255), 2)
+        return img
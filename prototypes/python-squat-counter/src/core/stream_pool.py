@@ -0,0 +1,225 @@
+"""Pose inference for several camera streams on a pool of worker processes.
+
+``StreamPool`` opens N sources, each read on its own ``ThreadedCapture``
+thread, and runs a fixed number of worker processes that own the
+``PoseDetector`` instances. Each stream is pinned to one worker, whose task
+queue it shares with the other streams assigned there, so every detector
+sees its camera's frames complete and in order, as MediaPipe's tracking and
+smoothing expect. Throughput scales with the number of workers as long as
+there are at least as many streams.
+
+Each stream has at most ``max_pending`` frames queued or in inference. A
+stream that produces faster than the pool can serve keeps only its newest
+frame (the rest count as ``dropped``), so it can never fill the queue and
+starve the others, and a slow stream simply contributes fewer frames.
+A slot is released when the caller takes the result, so a slow consumer
+throttles capture instead of piling up results.
+
+Frames travel through a per-stream ``FrameRing`` of ``max_pending`` shared
+memory slots: the capture side writes each frame into a slot once and the
+worker runs inference on a view of it, so only slot indices and landmark
+arrays are pickled.
+
+Results are ``StreamResult`` tuples tagged with the stream id, the
+capture frame id and timestamp. A worker keeps one detector per stream
+assigned to it, so MediaPipe's tracking state never mixes two cameras.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from ..utils.camera_utils import DROP_NEWEST, ThreadedCapture
+from .frame_ring import FrameRing
+from .pose_detector import PoseDetector
+
+# ``landmarks`` is the normalized (33, 4) array, or None when no pose was found
+StreamResult = namedtuple('StreamResult', 'stream frame_id timestamp landmarks size')
+
+
+def _worker(tasks, results, detector_kwargs):
+    # Results still queued at shutdown are not needed; don't block exit on them
+    results.cancel_join_thread()
+    detectors = {}
+    rings = {}
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        stream, frame_id, timestamp, frame, slot = task
+        if slot is None:
+            img = frame
+        else:
+            # ``frame`` is the stream's ring spec; reattach when it was replaced
+            ring = rings.get(stream)
+            if ring is None or ring.name != frame[0]:
+                if ring is not None:
+                    ring.close()
+                ring = rings[stream] = FrameRing.attach(frame, track=False)
+            img = ring.view(slot)
+
+        detector = detectors.get(stream)
+        if detector is None:
+            detector = detectors[stream] = PoseDetector(**detector_kwargs)
+
+        detector.findPose(img, False, timestamp=timestamp)
+        landmarks = detector.findPosition(img, False, as_array=True)
+        if landmarks is not None:
+            landmarks = landmarks.copy()
+        results.put((slot, StreamResult(stream, frame_id, timestamp, landmarks,
+                                        (img.shape[1], img.shape[0]))))
+        img = None  # drop the view before a ring may be closed
+    for ring in rings.values():
+        ring.close()
+
+
+class StreamPool:
+    """Fair multi-stream pose inference on a fixed pool of processes.
+
+    ``sources`` is a list (stream ids are the indices) or a dict of stream
+    id to source. A source is anything ``cv2.VideoCapture`` accepts, or an
+    already opened capture object. Streams are spread round-robin over
+    ``workers`` processes (at most one per stream).
+    """
+
+    def __init__(self, sources, workers=None, max_pending=1, drop_policy=DROP_NEWEST,
+                 **detector_kwargs):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if not isinstance(sources, dict):
+            sources = dict(enumerate(sources))
+        if not sources:
+            raise ValueError("StreamPool needs at least one source")
+
+        self.sources = sources
+        self.workers = min(workers or os.cpu_count() or 1, len(sources))
+        self.assignment = {stream: i % self.workers for i, stream in enumerate(sources)}
+        self.max_pending = max_pending
+        self.drop_policy = drop_policy
+        self.detector_kwargs = detector_kwargs
+        self.processed = dict.fromkeys(sources, 0)
+
+        self._captures = {}
+        self._rings = {}
+        self._slots = {}
+        self._feeders = []
+        self._processes = []
+        self._lock = threading.Lock()
+        self._live = 0
+        self._in_flight = 0
+        self._running = False
+
+    def start(self):
+        """Start the worker processes and one capture thread per stream."""
+        ctx = multiprocessing.get_context()
+        self._tasks = [ctx.Queue() for _ in range(self.workers)]
+        self._results = ctx.Queue()
+        self._processes = [ctx.Process(target=_worker, daemon=True,
+                                       args=(tasks, self._results, self.detector_kwargs))
+                           for tasks in self._tasks]
+        for process in self._processes:
+            process.start()
+
+        self._running = True
+        self._live = len(self.sources)
+        for stream, source in self.sources.items():
+            if hasattr(source, 'read'):
+                capture = ThreadedCapture(drop_policy=self.drop_policy, cap=source)
+            else:
+                capture = ThreadedCapture(source, drop_policy=self.drop_policy)
+            self._captures[stream] = capture.start()
+            self._slots[stream] = threading.Semaphore(self.max_pending)
+            feeder = threading.Thread(target=self._feed, args=(stream,),
+                                      name=f'StreamPool-{stream}', daemon=True)
+            feeder.start()
+            self._feeders.append(feeder)
+        return self
+
+    def _feed(self, stream):
+        capture, slots = self._captures[stream], self._slots[stream]
+        tasks = self._tasks[self.assignment[stream]]
+        try:
+            while self._running:
+                slots.acquire()
+                ret, img, timestamp, frame_id = capture.read_frame()
+                if not ret or not self._running:
+                    break
+                with self._lock:
+                    self._in_flight += 1
+                tasks.put((stream, frame_id, timestamp) + self._share(stream, img))
+        finally:
+            with self._lock:
+                self._live -= 1
+
+    def _share(self, stream, img):
+        """Write ``img`` into the stream's ring; returns the ``(frame, slot)`` task fields."""
+        ring = self._rings.get(stream)
+        if ring is None or not ring.fits(img):
+            if ring is not None and ring.free < ring.slots:
+                # Frame size changed with frames still in flight; send this one pickled
+                return img, None
+            if ring is not None:
+                ring.close()
+            ring = self._rings[stream] = FrameRing(self.max_pending, img.shape, img.dtype)
+
+        slot = ring.acquire()
+        ring.write(slot, img)
+        return ring.spec(), slot
+
+    def results(self, poll=0.1):
+        """Yield ``StreamResult`` as workers finish, until every stream has ended."""
+        while True:
+            with self._lock:
+                if self._live == 0 and self._in_flight == 0:
+                    return
+            try:
+                slot, result = self._results.get(timeout=poll)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self._processes):
+                    # Its streams are pinned to it, so they would wait forever
+                    raise RuntimeError("A pose worker has exited")
+                continue
+
+            if slot is not None:
+                self._rings[result.stream].release(slot)
+            with self._lock:
+                self._in_flight -= 1
+            self.processed[result.stream] += 1
+            self._slots[result.stream].release()
+            yield result
+
+    def stats(self):
+        """Return processed and dropped frame counts per stream."""
+        return {stream: {"processed": self.processed[stream],
+                         "dropped": self._captures[stream].dropped if stream in self._captures else 0}
+                for stream in self.sources}
+
+    def close(self):
+        """Stop capture, shut down the workers and release the cameras."""
+        self._running = False
+        for slots in self._slots.values():
+            slots.release()
+        for capture in self._captures.values():
+            capture.release()
+        for feeder in self._feeders:
+            feeder.join()
+        for tasks in self._tasks[:len(self._processes)]:
+            tasks.put(None)
+        deadline = time.monotonic() + 5
+        for process in self._processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                process.terminate()
+        for ring in self._rings.values():
+            ring.close()
+        self._rings = {}
+        self._processes = []
+        self._feeders = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,4 +1,22 @@
-from .pushup_counter import PushupCounter
 from .base_exercise import BaseExercise
+from .engine import CompiledExercise, DeclarativeExercise, ExerciseDefinition, SessionCount
+from .definitions import DEFINITIONS
+from .pushup_counter import PushupCounter
+from .plank_timer import PlankTimer
+from .arm_circles_counter import ArmCirclesCounter
+from .stretch_timers import ChestStretchTimer, StretchTimer, TricepStretchTimer
+from .registry import EXERCISES, restore_exercise
+from .workout_log import (HttpSink, JsonLinesSink, WorkoutLogger, WorkoutStore, open_sink,
+                          rep_metrics)
+from .routine import Routine, RoutineRunner, RoutineStep
+from .events import (EventTracker, FormBreakEvent, PhaseEvent, RepEvent, TimerEvent, async_events,
+                     awatch, event_dict, iter_events, watch)
+from .sessions import SessionManager, decode_batch, encode_batch
 
-__all__ = ['PushupCounter', 'BaseExercise']
\ No newline at end of file
+__all__ = ['PushupCounter', 'PlankTimer', 'StretchTimer', 'ChestStretchTimer', 'TricepStretchTimer',
+           'ArmCirclesCounter', 'BaseExercise', 'DeclarativeExercise',
+           'ExerciseDefinition', 'CompiledExercise', 'SessionCount', 'DEFINITIONS', 'EXERCISES',
+           'Routine', 'RoutineRunner', 'RoutineStep', 'RepEvent', 'PhaseEvent', 'FormBreakEvent',
+           'TimerEvent', 'EventTracker', 'event_dict', 'iter_events', 'watch', 'async_events', 'awatch',
+           'SessionManager', 'encode_batch', 'decode_batch', 'restore_exercise',
+           'WorkoutLogger', 'WorkoutStore', 'JsonLinesSink', 'HttpSink', 'open_sink', 'rep_metrics']
\ No newline at end of file
@@ -0,0 +1,98 @@
+import time
+import numpy as np
+from ..utils.profiler import profiler
+from .base_exercise import BaseExercise
+
+# (shoulder, wrist) landmarks of each arm
+ARMS = {"right": (12, 16), "left": (11, 15)}
+
+
+class ArmCirclesCounter(BaseExercise):
+    """Arm circles counter with a separate count per arm.
+
+    Each arm's angle is the wrist's direction around the shoulder in
+    0-360 degrees. Every reversal of the circling direction of an extended
+    arm is half a circle, as in the original script; ``count`` follows the
+    arm with more circles so one-arm and two-arm circles both score.
+    ``elapsed_time`` runs on frame timestamps from the first update.
+    """
+
+    name = 'armcircles'
+    STATE = BaseExercise.STATE + ('right_count', 'right_direction', 'right_prev_angle',
+                                  'left_count', 'left_direction', 'left_prev_angle',
+                                  'start_time', 'elapsed_time', 'last_timestamp')
+    TIMESTAMPS = ('start_time', 'last_timestamp')
+    min_extension = 100  # Wrist to shoulder distance in pixels for an extended arm
+    min_movement = 5  # Degrees per frame before the direction is trusted
+
+    def __init__(self):
+        super().__init__()
+        self.reset_counter()
+
+    def get_required_angles(self, detector, img):
+        """Get each wrist's angle around the shoulder and the arm's extension."""
+        points = detector.pixelPoints()
+        angles = {}
+        for side, (shoulder, wrist) in ARMS.items():
+            dx, dy = points[wrist] - points[shoulder]
+            angles[f"{side}_circle"] = float(np.degrees(np.arctan2(dy, dx)) % 360)
+            angles[f"{side}_extension"] = float(np.hypot(dx, dy))
+        profiler.mark('angles')
+        return angles
+
+    def _track_arm(self, side, angle, extended):
+        """Count a half circle when the arm reverses its circling direction."""
+        if extended:
+            diff = (angle - getattr(self, side + '_prev_angle') + 180) % 360 - 180
+            if abs(diff) > self.min_movement:
+                direction = "forward" if diff > 0 else "backward"
+                previous = getattr(self, side + '_direction')
+                if previous is not None and previous != direction:
+                    setattr(self, side + '_count', getattr(self, side + '_count') + 0.5)
+                setattr(self, side + '_direction', direction)
+        setattr(self, side + '_prev_angle', angle)
+
+    def update_feedback_and_count(self, angles, timestamp=None, **kwargs):
+        """Update both arm counts, the feedback and the warmup time."""
+        if timestamp is None:
+            timestamp = time.time()
+        if self.start_time is None:
+            self.start_time = timestamp
+        self.elapsed_time = timestamp - self.start_time
+        self.last_timestamp = timestamp
+
+        right_extended = angles["right_extension"] > self.min_extension
+        left_extended = angles["left_extension"] > self.min_extension
+        self._track_arm('right', angles["right_circle"], right_extended)
+        self._track_arm('left', angles["left_circle"], left_extended)
+        self.count = max(self.right_count, self.left_count)
+
+        self.form = int(right_extended and left_extended)
+        if right_extended and left_extended:
+            self.feedback = "Good! Keep Circling"
+        elif not right_extended and not left_extended:
+            self.feedback = "Extend Both Arms"
+        elif not right_extended:
+            self.feedback = "Extend Right Arm"
+        else:
+            self.feedback = "Extend Left Arm"
+
+        profiler.mark('count')
+        return self.feedback, self.count, self.direction, self.form
+
+    def summary(self):
+        """Return the final result, per arm and for the busier arm."""
+        return {"count": int(self.count), "right_count": int(self.right_count),
+                "left_count": int(self.left_count), "elapsed": round(self.elapsed_time, 3)}
+
+    def reset_counter(self):
+        """Reset both arm counters."""
+        super().reset_counter()
+        self.feedback = "Extend Arms to Sides"
+        for side in ARMS:
+            setattr(self, side + '_count', 0)
+            setattr(self, side + '_direction', None)
+            setattr(self, side + '_prev_angle', 0)
+        self.start_time = None
+        self.elapsed_time = 0
+        self.last_timestamp = None
@@ -1,15 +1,23 @@
-import cv2
 import numpy as np
 from abc import ABC, abstractmethod
+from ..utils.overlay import HudOverlay
+from ..utils.profiler import profiler
 
 class BaseExercise(ABC):
     """Base class for all exercise counters."""
     
+    name = None
+    # Attributes saved by ``snapshot``; subclasses extend it with their own
+    STATE = ('count', 'direction', 'form', 'feedback')
+    # Entries of ``STATE`` holding frame timestamps, shifted by ``restore``
+    TIMESTAMPS = ()
+    
     def __init__(self):
         self.count = 0
         self.direction = 0
         self.form = 0
         self.feedback = "Fix Form"
+        self.hud = HudOverlay()
     
     @abstractmethod
     def update_feedback_and_count(self, angles, **kwargs):
@@ -21,21 +29,57 @@ class BaseExercise(ABC):
         """Get the angles required for this specific exercise."""
         pass
     
+    def get_progress_bar_values(self, angles):
+        """Return the progress percentage and bar position, or ``None`` for no bar."""
+        return None, None
+    
     def draw_ui(self, img, per=None, bar=None):
         """Draw common UI elements on the image."""
-        # Progress bar (if percentage provided)
-        if per is not None and bar is not None and self.form == 1:
-            cv2.rectangle(img, (580, 50), (600, 380), (0, 255, 0), 3)
-            cv2.rectangle(img, (580, int(bar)), (600, 380), (0, 255, 0), cv2.FILLED)
-            cv2.putText(img, f'{int(per)}%', (565, 430), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
-
-        # Counter
-        cv2.rectangle(img, (0, 380), (100, 480), (0, 255, 0), cv2.FILLED)
-        cv2.putText(img, str(int(self.count)), (25, 455), cv2.FONT_HERSHEY_PLAIN, 5, (255, 0, 0), 5)
+        # Progress bar only once the start position has been reached
+        if self.form != 1:
+            per = bar = None
+        self.hud.render(img, self.count, self.feedback, per, bar)
+        profiler.mark('ui')
+    
+    @property
+    def good_form(self):
+        """Whether the last frame was in good form; ``FormBreakEvent`` fires when this turns False."""
+        return self.form == 1
+    
+    @property
+    def holding(self):
+        """Whether the exercise is in a static hold (see ``AdaptivePoseDetector.setHold``)."""
+        return False
+    
+    def summary(self):
+        """Return the final result of the set."""
+        return {"count": int(self.count)}
+    
+    def snapshot(self):
+        """Return the full counter state as a small JSON-serializable dict."""
+        state = {key: getattr(self, key) for key in self.STATE}
+        state["exercise"] = self.name
+        return state
+    
+    def restore(self, state, timestamp=None):
+        """Continue from a ``snapshot``, e.g. on another worker.
         
-        # Feedback
-        cv2.rectangle(img, (500, 0), (640, 40), (255, 255, 255), cv2.FILLED)
-        cv2.putText(img, self.feedback, (500, 40), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+        ``timestamp`` is this process's clock reading for the snapshot's
+        last frame; timers are shifted by the difference so hold time carries
+        over. Leave it out when both sides share a clock, like
+        ``time.monotonic`` on one machine.
+        """
+        if state.get("exercise") != self.name:
+            raise ValueError(f"Snapshot of {state.get('exercise')!r} cannot restore {self.name!r}")
+        shift = 0.0
+        last = state.get("last_timestamp")
+        if timestamp is not None and last is not None:
+            shift = timestamp - last
+        for key in self.STATE:
+            value = state[key]
+            if key in self.TIMESTAMPS and value is not None:
+                value += shift
+            setattr(self, key, value)
     
     def reset_counter(self):
         """Reset all counter variables."""
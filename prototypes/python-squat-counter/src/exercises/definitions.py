@@ -0,0 +1,191 @@
+"""Rep exercise definitions for the declarative engine.
+
+Thresholds and feedback strings are the ones used by the original
+``tests/test_*.py`` counters. ``display`` lists the ``(label, feature)``
+pairs the demo scripts print for debugging.
+"""
+from .engine import ExerciseDefinition, FORM_PHASE
+
+MID_RANGE = [('progress', '>=', 10), ('progress', '<=', 90)]
+
+SQUAT = ExerciseDefinition(
+    name='squat',
+    features={
+        'hip': ('mean', ('angle', 24, 26, 28), ('angle', 23, 25, 27)),
+        'knee': ('mean', ('angle', 12, 24, 26), ('angle', 11, 23, 25)),
+    },
+    progress=('hip', (90, 170), (100, 0)),
+    form=[('hip', '>', 160)],
+    phases=[
+        (1, [('progress', '>', 90), ('hip', '<', 100)], "Stand Up"),
+        (0, [('progress', '<', 10), ('hip', '>', 160)], "Squat Down"),
+    ],
+    hints=[(MID_RANGE, "Good Form")],
+    not_ready_feedback="Stand Straight",
+    display=[('Hip', 'hip'), ('Knee', 'knee')],
+)
+
+LUNGE = ExerciseDefinition(
+    name='lunge',
+    features={
+        'right_knee': ('angle', 24, 26, 28),
+        'left_knee': ('angle', 23, 25, 27),
+        'right_hip': ('angle', 12, 24, 26),
+        'left_hip': ('angle', 11, 23, 25),
+        # The leg whose knee is lower in the image is the front leg
+        'right_forward': ('dy', 26, 25),
+        'front_knee': ('pick', 'right_forward', 'right_knee', 'left_knee'),
+        'back_knee': ('pick', 'right_forward', 'left_knee', 'right_knee'),
+        'stance_hip': ('pick', 'right_forward', 'right_hip', 'left_hip'),
+    },
+    progress=('front_knee', (80, 170), (100, 0)),
+    form=[('front_knee', '>', 160), ('stance_hip', '>', 160)],
+    phases=[
+        (1, [('progress', '>', 90), ('front_knee', '<', 100)], "Push Up"),
+        (0, [('progress', '<', 10), ('front_knee', '>', 160)], "Lunge Down"),
+    ],
+    hints=[
+        (MID_RANGE + [('back_knee', '<', 100)], "Lower Back Knee"),
+        (MID_RANGE, "Good Form"),
+    ],
+    faults=["Lower Back Knee"],
+    not_ready_feedback="Stand Straight",
+    start_feedback="Stand Upright",
+    display=[('Front Knee', 'front_knee'), ('Back Knee', 'back_knee')],
+)
+
+PUSHUP = ExerciseDefinition(
+    name='pushup',
+    features={
+        'elbow': ('angle', 11, 13, 15),
+        'shoulder': ('angle', 13, 11, 23),
+        'hip': ('angle', 11, 23, 25),
+    },
+    progress=('elbow', (90, 160), (0, 100)),
+    form=[('elbow', '>', 160), ('shoulder', '>', 40), ('hip', '>', 160)],
+    phases=[
+        (1, [('elbow', '<=', 90), ('hip', '>', 160)], None),
+        (0, [('elbow', '>', 160), ('shoulder', '>', 40), ('hip', '>', 160)], None),
+    ],
+    hints=[
+        ([('elbow', '<=', 90), ('hip', '>', 160)], "Up"),
+        ([('elbow', '>', 160), ('shoulder', '>', 40), ('hip', '>', 160)], "Down"),
+    ],
+    ready_feedback="Fix Form",
+    not_ready_feedback="Fix Form",
+    display=[('Elbow', 'elbow'), ('Hip', 'hip')],
+)
+
+BICEP_CURL = ExerciseDefinition(
+    name='bicepcurl',
+    features={
+        # Use the arm that is curling (smaller elbow angle)
+        'elbow': ('min', ('angle', 12, 14, 16), ('angle', 11, 13, 15)),
+    },
+    progress=('elbow', (50, 170), (100, 0)),
+    form=[('elbow', '<', 120)],
+    phases=[
+        (1, [('progress', '>', 90), ('elbow', '<', 60)], "Lower Weight"),
+        (0, [('progress', '<', 10), ('elbow', '>', 160)], "Curl Up"),
+    ],
+    hints=[(MID_RANGE, "Good Form")],
+    not_ready_feedback="Start with Arms Extended",
+    start_feedback="Extend Arms",
+    display=[('Angle', 'elbow')],
+)
+
+TRICEP_DIP = ExerciseDefinition(
+    name='tricepdip',
+    features={
+        'right_elbow': ('angle', 12, 14, 16),
+        'left_elbow': ('angle', 11, 13, 15),
+        'elbow': ('mean', 'right_elbow', 'left_elbow'),
+        'elbow_gap': ('abs', ('diff', 'right_elbow', 'left_elbow')),
+        # Wrists behind the shoulders
+        'right_wrist_x': ('dx', 16, 12),
+        'left_wrist_x': ('dx', 15, 11),
+    },
+    progress=('elbow', (70, 170), (100, 0)),
+    form=[('right_wrist_x', '<', 0), ('left_wrist_x', '>', 0), ('elbow_gap', '<', 20)],
+    phases=[
+        (1, [('progress', '>', 90), ('elbow', '<', 90)], "Push Up"),
+        (0, [('progress', '<', 10), ('elbow', '>', 160)], "Lower Down"),
+    ],
+    hints=[(MID_RANGE, "Good Form")],
+    not_ready=[([('right_wrist_x', '<', 0), ('left_wrist_x', '>', 0)], "Keep Arms Even")],
+    not_ready_feedback="Hands Behind Body",
+    start_feedback="Position Arms Behind",
+    display=[('Elbow', 'elbow')],
+)
+
+SHOULDER_PRESS = ExerciseDefinition(
+    name='shoulderpress',
+    features={
+        'arm': ('mean', ('angle', 12, 14, 16), ('angle', 11, 13, 15)),
+        # Negative when the wrists are above the head / shoulders
+        'wrist_to_head': ('dy', (16, 15), 0),
+        'wrist_to_shoulder': ('dy', (16, 15), (12, 11)),
+    },
+    progress=('arm', (90, 170), (0, 100)),
+    form=[('wrist_to_shoulder', '>', 0), ('arm', '<', 120)],
+    phases=[
+        (1, [('progress', '>', 90), ('wrist_to_head', '<', 0), ('arm', '>', 160)], "Lower Arms"),
+        (0, [('progress', '<', 10), ('wrist_to_shoulder', '>', 0), ('arm', '<', 110)], "Press Up"),
+    ],
+    hints=[(MID_RANGE, "Good Form")],
+    not_ready_feedback="Start with Arms at Shoulders",
+    start_feedback="Lower Arms to Shoulders",
+    display=[('Angle', 'arm')],
+)
+
+LATERAL_RAISES = ExerciseDefinition(
+    name='lateralraises',
+    features={
+        'right_arm': ('angle', 12, 14, 16),
+        'left_arm': ('angle', 11, 13, 15),
+        'arm': ('min', 'right_arm', 'left_arm'),
+        'shoulder': ('mean', ('angle', 24, 12, 14), ('angle', 23, 11, 13)),
+    },
+    progress=('shoulder', (45, 90), (0, 100)),
+    form=[('arm', '>', 160)],
+    phases=[
+        (1, [('progress', '>', 90), ('shoulder', '>', 85)], "Lower Arms"),
+        (0, [('progress', '<', 10), ('shoulder', '<', 50)], "Raise to Sides"),
+    ],
+    hints=[
+        (MID_RANGE + [('progress', '>', 50)], "Control the Movement"),
+        (MID_RANGE, "Good Form"),
+    ],
+    not_ready_feedback="Keep Arms Straight",
+    start_feedback="Arms at Sides",
+    display=[('Angle', 'shoulder')],
+)
+
+JUMPING_JACKS = ExerciseDefinition(
+    name='jumpingjacks',
+    features={
+        'arm': ('min', ('angle', 12, 14, 16), ('angle', 11, 13, 15)),
+        # Negative only when both wrists are above the shoulder line
+        'wrist_height': ('max', ('dy', 16, (12, 11)), ('dy', 15, (12, 11))),
+        # Positive when the ankles are wider than 1.5x hip width
+        'feet_spread': ('diff', ('abs', ('dx', 28, 27)), ('scale', ('abs', ('dx', 24, 23)), 1.5)),
+        'arm_raise': ('dy', (12, 11), (16, 15)),
+    },
+    progress=('arm_raise', (-50, 150), (0, 100)),
+    form_mode=FORM_PHASE,
+    phases=[
+        (1, [('wrist_height', '<', 0), ('feet_spread', '>', 0), ('arm', '>', 160)], "Good! Arms Down"),
+        (0, [('wrist_height', '>=', 0), ('feet_spread', '<=', 0)], "Jump! Arms Up"),
+    ],
+    hints=[
+        ([('wrist_height', '<', 0), ('feet_spread', '<=', 0)], "Spread Feet"),
+        ([('feet_spread', '>', 0), ('wrist_height', '>=', 0)], "Raise Arms"),
+        ([('arm', '<=', 160), ('wrist_height', '<', 0), ('feet_spread', '>', 0)], "Straighten Arms"),
+    ],
+    faults=["Straighten Arms"],
+    start_feedback="Stand with Arms Down",
+)
+
+DEFINITIONS = {definition.name: definition for definition in (
+    SQUAT, LUNGE, PUSHUP, BICEP_CURL, TRICEP_DIP, SHOULDER_PRESS, LATERAL_RAISES, JUMPING_JACKS,
+)}
@@ -0,0 +1,476 @@
+"""Declarative rep-counting engine.
+
+Every rep exercise follows the same pattern: compute a few joint features,
+latch ``form`` once a start position is seen, then count half reps whenever
+the movement reaches the phase opposite to ``direction``. An
+``ExerciseDefinition`` describes one exercise as data and ``compile`` turns it
+into a ``CompiledExercise`` with two evaluators sharing the same rules:
+
+* ``step`` updates a single counter per frame with plain Python comparisons.
+* ``step_batch``/``run_batch`` update many sessions at once on NumPy arrays,
+  so server-side re-scoring is one vectorized pass per frame index.
+* ``count_series`` counts one whole recorded session with no per-frame loop.
+
+Feature specs are tuples evaluated on ``(..., 33, 2)`` pixel points:
+
+* ``('angle', p1, p2, p3)`` - joint angle, folded like ``findAngle``
+* ``('dx', a, b)`` / ``('dy', a, b)`` - coordinate difference ``a - b``; a
+  point may be a tuple of landmark ids, meaning their midpoint
+* ``('mean' | 'min' | 'max', spec, ...)`` - reduction over several specs
+* ``('abs', spec)``, ``('diff', spec, spec)``, ``('scale', spec, k)``
+* ``('pick', selector, spec, spec)`` - first spec where ``selector > 0``
+* a string names a feature defined earlier in the same definition
+
+Conditions are ``(feature, op, value)`` with ``op`` one of ``< <= > >=``;
+the special feature ``'progress'`` is the 0-100 value from ``progress``.
+"""
+import operator
+
+import numpy as np
+
+from ..core.pose_detector import compute_angles
+from ..utils.profiler import profiler
+from .base_exercise import BaseExercise
+
+OPERATORS = {
+    '<': (operator.lt, np.less),
+    '<=': (operator.le, np.less_equal),
+    '>': (operator.gt, np.greater),
+    '>=': (operator.ge, np.greater_equal),
+}
+
+FORM_LATCH = 'latch'
+FORM_PHASE = 'phase'
+
+
+class ExerciseDefinition:
+    """Data description of a rep exercise.
+
+    ``phases`` is a list of ``(direction, conditions, feedback)``; when a
+    phase's conditions hold and ``direction`` differs, half a rep is counted.
+    ``hints`` is a list of ``(conditions, feedback)`` checked in order every
+    counted frame, falling back to ``ready_feedback`` when set.
+    ``not_ready`` works the same way before ``form`` has been reached.
+    With ``form_mode='phase'`` there is no start gate and reaching any phase
+    sets ``form``. ``faults`` names the ``hints`` feedback strings that mean
+    form broke, rather than coaching cues; ``form`` itself stays latched.
+    """
+
+    def __init__(self, name, features, phases, form=(), progress=None, hints=(),
+                 ready_feedback=None, not_ready=(), not_ready_feedback="Fix Form",
+                 start_feedback=None, form_mode=FORM_LATCH, display=(), faults=()):
+        if form_mode not in (FORM_LATCH, FORM_PHASE):
+            raise ValueError(f"Unknown form mode: {form_mode!r}")
+        self.name = name
+        self.features = dict(features)
+        self.phases = list(phases)
+        self.form = list(form)
+        self.progress = progress
+        self.hints = list(hints)
+        self.ready_feedback = ready_feedback
+        self.not_ready = list(not_ready)
+        self.not_ready_feedback = not_ready_feedback
+        self.start_feedback = start_feedback or not_ready_feedback
+        self.form_mode = form_mode
+        self.display = list(display)
+        self.faults = tuple(faults)
+        unknown = set(self.faults) - {feedback for _, feedback in self.hints}
+        if unknown:
+            raise ValueError(f"Faults must be hint feedback: {sorted(unknown)}")
+
+    def compile(self):
+        return CompiledExercise(self)
+
+
+class _FeatureCompiler:
+    def __init__(self):
+        self.triplets = []
+        self.nodes = []  # (op, args) evaluated in order into slot i
+        self.names = {}
+
+    def slot(self, spec):
+        if isinstance(spec, str):
+            if spec not in self.names:
+                raise ValueError(f"Unknown feature reference: {spec!r}")
+            return self.names[spec]
+
+        kind, *args = spec
+        if kind == 'angle':
+            triplet = tuple(args)
+            if triplet not in self.triplets:
+                self.triplets.append(triplet)
+            return self._add('angle', self.triplets.index(triplet))
+        if kind in ('dx', 'dy'):
+            axis = 0 if kind == 'dx' else 1
+            a, b = (p if isinstance(p, tuple) else (p,) for p in args)
+            return self._add('delta', (axis, a, b))
+        if kind in ('mean', 'min', 'max'):
+            return self._add(kind, [self.slot(arg) for arg in args])
+        if kind == 'abs':
+            return self._add('abs', self.slot(args[0]))
+        if kind == 'diff':
+            return self._add('diff', (self.slot(args[0]), self.slot(args[1])))
+        if kind == 'scale':
+            return self._add('scale', (self.slot(args[0]), float(args[1])))
+        if kind == 'pick':
+            return self._add('pick', tuple(self.slot(arg) for arg in args))
+        raise ValueError(f"Unknown feature kind: {kind!r}")
+
+    def _add(self, op, args):
+        self.nodes.append((op, args))
+        return len(self.nodes) - 1
+
+
+class CompiledExercise:
+    """Precompiled evaluators for one ``ExerciseDefinition``."""
+
+    def __init__(self, definition):
+        self.definition = definition
+        self.name = definition.name
+        self.form_mode = definition.form_mode
+
+        compiler = _FeatureCompiler()
+        for name, spec in definition.features.items():
+            compiler.names[name] = compiler.slot(spec)
+        self.feature_names = list(definition.features)
+        outputs = [compiler.names[name] for name in self.feature_names]
+
+        self.progress = None
+        if definition.progress is not None:
+            source, xp, fp = definition.progress
+            if xp[0] > xp[1]:
+                xp, fp = xp[::-1], fp[::-1]
+            self.progress = (compiler.slot(source), tuple(xp), tuple(fp))
+            self.feature_names.append('progress')
+
+        self.triplets = np.array(compiler.triplets, dtype=np.intp).reshape(-1, 3)
+        self.nodes = compiler.nodes
+        self.outputs = outputs
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+
+        self.messages = []
+        self.start_code = self._message(definition.start_feedback)
+        self.form = self._conditions(definition.form)
+        self.phases = [(direction, self._conditions(conds), self._message(feedback))
+                       for direction, conds, feedback in definition.phases]
+        self.hints = [(self._conditions(conds), self._message(feedback))
+                      for conds, feedback in definition.hints]
+        self.ready_code = self._message(definition.ready_feedback)
+        self.not_ready = [(self._conditions(conds), self._message(feedback))
+                          for conds, feedback in definition.not_ready]
+        self.not_ready_code = self._message(definition.not_ready_feedback)
+        self.fault_codes = frozenset(self._message(text) for text in definition.faults)
+
+    def _message(self, text):
+        if text is None:
+            return -1
+        if text not in self.messages:
+            self.messages.append(text)
+        return self.messages.index(text)
+
+    def _conditions(self, conditions):
+        compiled = []
+        for name, op, value in conditions:
+            if name not in self.index:
+                raise ValueError(f"Unknown feature in condition: {name!r}")
+            scalar_op, array_op = OPERATORS[op]
+            compiled.append((self.index[name], scalar_op, array_op, float(value)))
+        return compiled
+
+    # Feature extraction -------------------------------------------------
+
+    def features(self, points):
+        """Evaluate all features on ``(..., 33, 2)`` points into ``(..., F)``.
+
+        Frames with missing landmarks (NaN points) produce NaN features.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        angles = compute_angles(points, self.triplets) if len(self.triplets) else None
+        slots = []
+        for op, args in self.nodes:
+            if op == 'angle':
+                value = angles[..., args]
+            elif op == 'delta':
+                axis, a, b = args
+                value = (points[..., list(a), axis].mean(axis=-1) -
+                         points[..., list(b), axis].mean(axis=-1))
+            elif op == 'mean':
+                value = sum(slots[i] for i in args) / len(args)
+            elif op == 'min':
+                value = slots[args[0]]
+                for i in args[1:]:
+                    value = np.minimum(value, slots[i])
+            elif op == 'max':
+                value = slots[args[0]]
+                for i in args[1:]:
+                    value = np.maximum(value, slots[i])
+            elif op == 'abs':
+                value = np.abs(slots[args])
+            elif op == 'diff':
+                value = slots[args[0]] - slots[args[1]]
+            elif op == 'scale':
+                value = slots[args[0]] * args[1]
+            else:  # pick
+                selector, positive, negative = args
+                value = np.where(slots[selector] > 0, slots[positive], slots[negative])
+            slots.append(value)
+
+        columns = [slots[i] for i in self.outputs]
+        if self.progress is not None:
+            source, xp, fp = self.progress
+            columns.append(np.interp(slots[source], xp, fp))
+        return np.stack(np.broadcast_arrays(*columns), axis=-1)
+
+    # Streaming evaluator --------------------------------------------------
+
+    def step(self, state, values):
+        """Advance one counter by one frame.
+
+        ``state`` is any object with ``count``, ``direction``, ``form`` and
+        ``feedback`` attributes (a ``BaseExercise``); ``values`` is the
+        sequence of feature values in ``feature_names`` order. Returns the
+        message code of the hint that matched this frame, or -1.
+        """
+        def holds(conditions):
+            for i, op, _, value in conditions:
+                if not op(values[i], value):
+                    return False
+            return True
+
+        if self.form_mode == FORM_LATCH:
+            if state.form != 1 and holds(self.form):
+                state.form = 1
+            ready = state.form == 1
+        else:
+            ready = True
+
+        messages = self.messages
+        hint = -1
+        if ready:
+            for direction, conditions, code in self.phases:
+                if holds(conditions):
+                    state.form = 1
+                    if state.direction != direction:
+                        state.count += 0.5
+                        state.direction = direction
+                        if code >= 0:
+                            state.feedback = messages[code]
+                    break
+
+            for conditions, code in self.hints:
+                if holds(conditions):
+                    state.feedback = messages[code]
+                    hint = code
+                    break
+            else:
+                if self.ready_code >= 0:
+                    state.feedback = messages[self.ready_code]
+        else:
+            for conditions, code in self.not_ready:
+                if holds(conditions):
+                    state.feedback = messages[code]
+                    break
+            else:
+                state.feedback = messages[self.not_ready_code]
+        return hint
+
+    # Batch evaluator ----------------------------------------------------
+
+    def new_batch_state(self, sessions):
+        """Return zeroed array-backed state for ``sessions`` counters."""
+        return {
+            'count': np.zeros(sessions, dtype=np.float32),
+            'direction': np.zeros(sessions, dtype=np.int8),
+            'form': np.zeros(sessions, dtype=np.int8),
+            'feedback': np.full(sessions, self.start_code, dtype=np.int16),
+        }
+
+    def step_batch(self, state, values, valid=None):
+        """Advance every session in ``state`` by one frame.
+
+        ``values`` has shape ``(sessions, F)``; sessions where ``valid`` is
+        False (or any feature is NaN) are left untouched, like frames where
+        no pose was detected.
+        """
+        count, direction = state['count'], state['direction']
+        form, feedback = state['form'], state['feedback']
+
+        active = ~np.isnan(values).any(axis=-1)
+        if valid is not None:
+            active &= valid
+
+        def holds(conditions):
+            mask = active.copy()
+            for i, _, op, value in conditions:
+                mask &= op(values[:, i], value)
+            return mask
+
+        if self.form_mode == FORM_LATCH:
+            form[holds(self.form)] = 1
+            ready = active & (form == 1)
+        else:
+            ready = active
+
+        matched = np.zeros_like(active)
+        for phase_direction, conditions, code in self.phases:
+            hit = ready & ~matched & holds(conditions)
+            form[hit] = 1
+            change = hit & (direction != phase_direction)
+            count[change] += 0.5
+            direction[change] = phase_direction
+            if code >= 0:
+                feedback[change] = code
+            matched |= hit
+
+        self._apply_feedback(feedback, ready, self.hints, self.ready_code, holds)
+        self._apply_feedback(feedback, active & ~ready, self.not_ready,
+                             self.not_ready_code, holds)
+        return state
+
+    @staticmethod
+    def _apply_feedback(feedback, mask, rules, default, holds):
+        remaining = mask.copy()
+        for conditions, code in rules:
+            hit = remaining & holds(conditions)
+            feedback[hit] = code
+            remaining &= ~hit
+        if default >= 0:
+            feedback[remaining] = default
+
+    def run_batch(self, values, valid=None):
+        """Count reps for many sessions from ``(sessions, frames, F)`` features.
+
+        Loops over frames only; all sessions advance together. Returns the
+        final batch state.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        state = self.new_batch_state(values.shape[0])
+        for t in range(values.shape[1]):
+            self.step_batch(state, values[:, t], None if valid is None else valid[:, t])
+        return state
+
+    # Whole-session evaluator --------------------------------------------
+
+    def count_series(self, values, timestamps=None, valid=None):
+        """Count one whole session from ``(frames, F)`` features at once.
+
+        Hysteresis is resolved without a per-frame loop: the first phase
+        holding on each ready frame is found with masks, and a half rep is
+        every hit whose direction differs from the previous hit. Count,
+        direction and form match feeding the same frames through ``step``.
+        ``timestamps`` default to frame indices.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        frames = values.shape[0]
+        active = ~np.isnan(values).any(axis=-1)
+        if valid is not None:
+            active &= valid
+
+        def holds(conditions):
+            mask = active.copy()
+            for i, _, op, value in conditions:
+                mask &= op(values[:, i], value)
+            return mask
+
+        if self.form_mode == FORM_LATCH:
+            start = np.flatnonzero(holds(self.form))[:1]
+            ready = active.copy()
+            ready[:start[0] if len(start) else frames] = False
+        else:
+            start = np.flatnonzero(active)[:1]
+            ready = active
+
+        # Reversed so the first matching phase wins, as in ``step``
+        phase = np.full(frames, -1, dtype=np.intp)
+        for k in reversed(range(len(self.phases))):
+            phase[ready & holds(self.phases[k][1])] = k
+
+        hits = np.flatnonzero(phase >= 0)
+        phase_directions = np.array([direction for direction, _, _ in self.phases], dtype=np.int64)
+        hit_directions = phase_directions[phase[hits]]
+        changed = hit_directions != np.concatenate(([0], hit_directions[:-1]))
+
+        if timestamps is None:
+            timestamps = np.arange(frames, dtype=np.float64)
+        form = int(len(start) > 0 and (self.form_mode == FORM_LATCH or len(hits) > 0))
+        return SessionCount(hits[changed], hit_directions[changed], np.asarray(timestamps),
+                            int(start[0]) if len(start) else 0, form)
+
+
+class SessionCount:
+    """Reps, boundaries and phase durations of one session from ``count_series``.
+
+    ``changes`` holds the frame index of every half-rep transition and
+    ``directions`` the direction entered there. ``reps`` is ``(reps, 2)``
+    start/end frame indices: a rep ends on the transition completing it and
+    starts where the previous one ended (or where counting became ready).
+    ``phase_durations`` maps each direction to the time spent in it between
+    consecutive transitions.
+    """
+
+    def __init__(self, changes, directions, timestamps, start, form):
+        self.changes = changes
+        self.directions = directions
+        self.count = len(changes) * 0.5
+        self.direction = int(directions[-1]) if len(directions) else 0
+        self.form = form
+
+        ends = changes[1::2]
+        starts = np.concatenate(([start], ends))[:len(ends)].astype(np.intp)
+        self.reps = np.stack([starts, ends], axis=-1)
+        self.rep_times = timestamps[ends]
+        self.rep_durations = timestamps[ends] - timestamps[starts]
+
+        segments = np.diff(timestamps[changes])
+        self.phase_durations = {int(direction): segments[directions[:-1] == direction]
+                                for direction in np.unique(directions)}
+
+    def summary(self):
+        """Return the final result, like ``BaseExercise.summary``."""
+        return {"count": int(self.count)}
+
+
+class DeclarativeExercise(BaseExercise):
+    """``BaseExercise`` driven by an ``ExerciseDefinition``.
+
+    ``fault`` is True while the last frame matched one of the definition's
+    ``faults`` hints.
+    """
+
+    def __init__(self, definition):
+        super().__init__()
+        self.definition = definition
+        self.compiled = definition.compile()
+        self.name = definition.name
+        self.feedback = definition.start_feedback
+        self.fault = False
+
+    def get_required_angles(self, detector, img):
+        """Evaluate the definition's features on the current frame."""
+        values = self.compiled.features(detector.pixelPoints())
+        angles = dict(zip(self.compiled.feature_names, values.tolist()))
+        profiler.mark('angles')
+        return angles
+
+    def update_feedback_and_count(self, angles, **kwargs):
+        """Update feedback and count from the precompiled definition."""
+        hint = self.compiled.step(self, [angles[name] for name in self.compiled.feature_names])
+        self.fault = hint in self.compiled.fault_codes
+        profiler.mark('count')
+        return self.feedback, self.count, self.direction, self.form
+
+    @property
+    def good_form(self):
+        return self.form == 1 and not self.fault
+
+    def get_progress_bar_values(self, angles):
+        """Return the progress percentage and bar position."""
+        per = angles.get('progress', 0)
+        bar = np.interp(per, (0, 100), (380, 50))
+        return per, bar
+
+    def reset_counter(self):
+        """Reset all counter variables."""
+        super().reset_counter()
+        self.feedback = self.definition.start_feedback
+        self.fault = False
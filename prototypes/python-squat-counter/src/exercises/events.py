@@ -0,0 +1,196 @@
+"""Typed events from an exercise session, without any display.
+
+``watch`` wraps camera capture, the pose detector and an exercise counter
+and yields events as they happen; ``awatch`` is the same as an ``asyncio``
+async iterator::
+
+    for event in watch('squat'):
+        if isinstance(event, RepEvent):
+            print(f"rep {event.count}")
+
+    async for event in awatch('plank', tick=5):
+        await websocket.send(json.dumps(event_dict(event)))
+
+Events are namedtuples sharing ``exercise``, ``frame`` and ``timestamp``
+(the frame time in seconds) plus a ``kind`` string:
+
+* ``RepEvent`` (``'rep'``) - a whole rep was completed; ``count`` is the total.
+* ``PhaseEvent`` (``'phase'``) - ``direction`` changed, i.e. a half rep.
+* ``FormBreakEvent`` (``'form_break'``) - the counter left good form
+  (``good_form`` turned False), e.g. the plank's hips sagging; ``feedback``
+  says why. Rep exercises latch ``form``, so for them this fires only on
+  the ``faults`` hints of their definition (lunge, jumping jacks); the
+  others never emit it.
+* ``TimerEvent`` (``'timer'``) - a hold timer passed another ``tick``
+  seconds; ``elapsed`` is the hold time so far.
+
+``iter_events`` runs on any ``(frame_id, timestamp, img)`` iterable, such as
+``src.analysis.iter_frames`` for a video file.
+"""
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.detector_service import connect_detector
+from ..utils.camera_utils import DROP_NEWEST, DROP_NONE, ThreadedCapture
+from .registry import EXERCISES
+
+
+class RepEvent(namedtuple('RepEvent', 'exercise frame timestamp count')):
+    """A whole rep was completed."""
+    __slots__ = ()
+    kind = 'rep'
+
+
+class PhaseEvent(namedtuple('PhaseEvent', 'exercise frame timestamp direction previous')):
+    """The movement reached the phase opposite to ``previous``."""
+    __slots__ = ()
+    kind = 'phase'
+
+
+class FormBreakEvent(namedtuple('FormBreakEvent', 'exercise frame timestamp feedback')):
+    """Good form was lost."""
+    __slots__ = ()
+    kind = 'form_break'
+
+
+class TimerEvent(namedtuple('TimerEvent', 'exercise frame timestamp elapsed')):
+    """A hold timer passed another tick."""
+    __slots__ = ()
+    kind = 'timer'
+
+
+def event_dict(event):
+    """JSON-serializable dict of ``event``, like the analysis ``rep`` events."""
+    return dict(event._asdict(), event=event.kind)
+
+
+class EventTracker:
+    """Turn the state changes of one exercise counter into events.
+
+    ``update`` feeds one frame's angles to the counter and returns the
+    events it caused. ``tick`` is the timer event interval in seconds
+    (``None`` disables timer events).
+    """
+
+    def __init__(self, exercise, name=None, tick=1.0):
+        self.exercise = exercise
+        self.name = name or getattr(exercise, 'name', type(exercise).__name__)
+        self.tick = tick
+        self._reps = int(exercise.count)
+        self._direction = exercise.direction
+        self._good_form = exercise.good_form
+        self._ticks = 0
+
+    def update(self, frame_id, timestamp, angles):
+        self.exercise.update_feedback_and_count(angles, timestamp=timestamp)
+        return self.poll(frame_id, timestamp)
+
+    def poll(self, frame_id, timestamp):
+        """Events for any change since the last call."""
+        exercise = self.exercise
+        events = []
+
+        if exercise.direction != self._direction:
+            events.append(PhaseEvent(self.name, frame_id, timestamp,
+                                     int(exercise.direction), int(self._direction)))
+            self._direction = exercise.direction
+
+        reps = int(exercise.count)
+        if reps > self._reps:
+            events.append(RepEvent(self.name, frame_id, timestamp, reps))
+        self._reps = reps
+
+        good_form = exercise.good_form
+        if self._good_form and not good_form:
+            events.append(FormBreakEvent(self.name, frame_id, timestamp, exercise.feedback))
+        self._good_form = good_form
+
+        if self.tick:
+            elapsed = exercise.summary().get('elapsed')
+            if elapsed is not None:
+                # Drops back when a stopped timer restarts
+                ticks = int(elapsed // self.tick)
+                if ticks > self._ticks:
+                    events.append(TimerEvent(self.name, frame_id, timestamp, elapsed))
+                self._ticks = ticks
+        return events
+
+
+def iter_events(frames, detector, exercise, tick=1.0, name=None):
+    """Yield events for ``(frame_id, timestamp, img)`` frames.
+
+    Frames without a pose are skipped, as in the demo scripts.
+    """
+    tracker = EventTracker(exercise, name, tick)
+    for frame_id, timestamp, img in frames:
+        if hasattr(detector, 'setHold'):
+            detector.setHold(exercise.holding)
+        detector.findPose(img, False, timestamp=timestamp)
+        if detector.findPosition(img, False, as_array=True) is None:
+            continue
+        angles = exercise.get_required_angles(detector, img)
+        yield from tracker.update(frame_id, timestamp, angles)
+
+
+def camera_frames(capture):
+    """Yield ``(frame_id, timestamp, img)`` from a started ``ThreadedCapture``."""
+    while True:
+        ret, img, timestamp, frame_id = capture.read_frame()
+        if not ret:
+            return
+        yield frame_id, timestamp, img
+
+
+def watch(exercise, source=0, detector=None, tick=1.0):
+    """Yield events of a live session on camera ``source``.
+
+    ``exercise`` is a name from ``EXERCISES`` or a counter instance;
+    ``detector`` defaults to ``connect_detector()``. The camera, and a
+    detector created here, are released when the generator is closed. A camera keeps only its newest frame; a
+    stream URL or file given as a string is read in full, but timestamps are
+    capture times, so use ``iter_events`` with ``iter_frames`` for recordings.
+    """
+    name = None
+    if isinstance(exercise, str):
+        name = exercise
+        exercise = EXERCISES[exercise]()
+    owned = detector is None
+    if owned:
+        detector = connect_detector()
+
+    try:
+        capture = ThreadedCapture(source, drop_policy=DROP_NONE if isinstance(source, str)
+                                  else DROP_NEWEST)
+        if not capture.cap.isOpened():
+            raise RuntimeError("Could not open camera. Please check your camera connection.")
+        with capture:
+            yield from iter_events(camera_frames(capture), detector, exercise, tick, name)
+    finally:
+        if owned:
+            detector.close()
+
+
+async def async_events(events):
+    """Iterate a blocking event generator from ``asyncio``.
+
+    The generator runs on one worker thread, so capture and inference never
+    block the event loop; it is closed when iteration stops.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(1, thread_name_prefix='events')
+    try:
+        while True:
+            event = await loop.run_in_executor(executor, next, events, None)
+            if event is None:
+                return
+            yield event
+    finally:
+        # Queued behind any next() still running, so the generator is idle
+        await loop.run_in_executor(executor, events.close)
+        executor.shutdown(wait=False)
+
+
+def awatch(exercise, source=0, detector=None, tick=1.0):
+    """``watch`` as an async iterator."""
+    return async_events(watch(exercise, source, detector, tick))
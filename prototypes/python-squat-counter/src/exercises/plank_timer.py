@@ -0,0 +1,105 @@
+import time
+from ..utils.profiler import profiler
+from .base_exercise import BaseExercise
+
+class PlankTimer(BaseExercise):
+    """Plank hold timer driven by frame timestamps."""
+
+    name = 'plank'
+    STATE = BaseExercise.STATE + ('plank_type', 'start_time', 'elapsed_time', 'is_in_plank',
+                                  'form_break_count', 'last_timestamp')
+    TIMESTAMPS = ('start_time', 'last_timestamp')
+    ANGLES = {"body": (11, 23, 27), "right_elbow": (12, 14, 16),
+              "left_elbow": (11, 13, 15), "hip": (11, 23, 25)}
+    max_form_breaks = 3  # Number of form breaks before stopping timer
+
+    def __init__(self):
+        super().__init__()
+        self.feedback = "Get Ready"
+        self.plank_type = ""
+        self.start_time = None
+        self.elapsed_time = 0
+        self.is_in_plank = False
+        self.form_break_count = 0
+        self.last_timestamp = None
+
+    def get_required_angles(self, detector, img):
+        """Get angles required for plank analysis."""
+        angles = detector.findAngles(self.ANGLES)
+        profiler.mark('angles')
+        return angles
+
+    def update_feedback_and_count(self, angles, timestamp=None, **kwargs):
+        """Update form, feedback and hold time.
+
+        ``timestamp`` is the frame time in seconds; when omitted the wall
+        clock is used, which is only correct for live camera input.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        self.last_timestamp = timestamp
+
+        body_alignment = angles["body"]
+        hip_angle = angles["hip"]
+        avg_elbow = (angles["right_elbow"] + angles["left_elbow"]) / 2
+
+        if avg_elbow < 120:  # Forearm plank
+            self.plank_type = "Forearm Plank"
+            if 160 <= body_alignment <= 180 and 160 <= hip_angle <= 180:
+                self.form = 1
+                self.feedback = "Good Form - Hold!"
+            else:
+                self.form = 0
+                if body_alignment < 160:
+                    self.feedback = "Hips Too Low"
+                elif hip_angle < 160:
+                    self.feedback = "Hips Too High"
+        else:  # High plank (push-up position)
+            self.plank_type = "High Plank"
+            if 160 <= body_alignment <= 180 and 160 <= hip_angle <= 180 and avg_elbow > 160:
+                self.form = 1
+                self.feedback = "Good Form - Hold!"
+            else:
+                self.form = 0
+                if body_alignment < 160:
+                    self.feedback = "Hips Too Low"
+                elif hip_angle < 160:
+                    self.feedback = "Hips Too High"
+                elif avg_elbow < 160:
+                    self.feedback = "Straighten Arms"
+
+        # Timer logic
+        if self.form == 1:
+            if not self.is_in_plank:
+                self.start_time = timestamp
+                self.is_in_plank = True
+                self.form_break_count = 0
+            else:
+                self.elapsed_time = timestamp - self.start_time
+        elif self.is_in_plank:
+            self.form_break_count += 1
+            if self.form_break_count >= self.max_form_breaks:
+                self.is_in_plank = False
+                self.feedback = "Form Break - Timer Stopped"
+
+        profiler.mark('count')
+        return self.feedback, self.count, self.direction, self.form
+
+    @property
+    def holding(self):
+        return self.is_in_plank
+
+    def summary(self):
+        """Return the final result of the hold."""
+        return {"count": int(self.count), "elapsed": round(self.elapsed_time, 3)}
+
+    def reset_counter(self):
+        """Reset counter and timer variables."""
+        super().reset_counter()
+        self.feedback = "Get Ready"
+        self.plank_type = ""
+        self.start_time = None
+        self.elapsed_time = 0
+        self.is_in_plank = False
+        self.form_break_count = 0
+        self.last_timestamp = None
@@ -0,0 +1,30 @@
+"""Exercise names to counter factories.
+
+Kept apart from the package ``__init__`` so modules inside the package, like
+``routine`` and ``events``, can look exercises up without a circular import.
+"""
+from functools import partial
+
+from .arm_circles_counter import ArmCirclesCounter
+from .definitions import DEFINITIONS
+from .engine import DeclarativeExercise
+from .plank_timer import PlankTimer
+from .pushup_counter import PushupCounter
+from .stretch_timers import ChestStretchTimer, TricepStretchTimer
+
+EXERCISES = {name: partial(DeclarativeExercise, definition)
+             for name, definition in DEFINITIONS.items()}
+EXERCISES.update({
+    'pushup': PushupCounter,
+    'plank': PlankTimer,
+    'cheststretch': ChestStretchTimer,
+    'tricepstretch': TricepStretchTimer,
+    'armcircles': ArmCirclesCounter,
+})
+
+
+def restore_exercise(state, timestamp=None):
+    """Build the counter a ``BaseExercise.snapshot`` came from and restore it."""
+    exercise = EXERCISES[state["exercise"]]()
+    exercise.restore(state, timestamp)
+    return exercise
@@ -0,0 +1,200 @@
+"""Run a routine of exercise sets on one camera and one detector.
+
+A ``Routine`` is an ordered list of ``RoutineStep`` (exercise name plus a
+rep or duration target), like the web app's Routine of exercise segments.
+``RoutineRunner`` builds every exercise counter up front and feeds frames
+from a single ``PoseDetector`` to the current one; when its target is met
+the next counter takes over on the following frame, so switching sets costs
+nothing instead of a camera and MediaPipe re-initialization.
+"""
+import time
+
+from ..utils.profiler import profiler
+from .registry import EXERCISES
+from .workout_log import rep_metrics
+
+
+class RoutineStep:
+    """One set: ``exercise`` until ``reps`` repetitions or ``duration`` seconds."""
+
+    def __init__(self, exercise, reps=None, duration=None):
+        if exercise not in EXERCISES:
+            raise ValueError(f"Unknown exercise {exercise!r}")
+        if (reps is None) == (duration is None):
+            raise ValueError("Give exactly one of reps or duration")
+        self.exercise = exercise
+        self.reps = reps
+        self.duration = duration
+
+    @classmethod
+    def parse(cls, spec):
+        """Parse ``'squat:10'`` (reps) or ``'plank:30s'`` (seconds)."""
+        name, _, target = spec.partition(':')
+        if not target:
+            raise ValueError(f"Missing target in {spec!r}, e.g. 'squat:10' or 'plank:30s'")
+        if target.endswith('s'):
+            return cls(name, duration=float(target[:-1]))
+        return cls(name, reps=int(target))
+
+    @property
+    def spec(self):
+        """The ``parse`` form of this step, e.g. ``'plank:30s'``."""
+        if self.reps is not None:
+            return f"{self.exercise}:{self.reps}"
+        return f"{self.exercise}:{self.duration:g}s"
+
+    @property
+    def target(self):
+        return f"{self.reps} reps" if self.reps is not None else f"{self.duration:g}s"
+
+    def __repr__(self):
+        return f"RoutineStep({self.exercise!r}, {self.target})"
+
+
+class Routine:
+    """Named, ordered list of ``RoutineStep``."""
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = [RoutineStep.parse(step) if isinstance(step, str) else step
+                      for step in steps]
+        if not self.steps:
+            raise ValueError("A routine needs at least one step")
+
+
+class RoutineRunner:
+    """Drive a ``Routine`` frame by frame, hot-swapping exercise counters.
+
+    Duration targets count hold time for exercises that report it (the plank
+    timer's ``elapsed``) and time since the set started otherwise. Finished
+    sets are queued on ``logger`` (a ``WorkoutLogger``) when one is given.
+    """
+
+    def __init__(self, routine, detector, logger=None):
+        self.routine = routine
+        self.detector = detector
+        self.logger = logger
+        # Built once so a set change is only an index increment
+        self.exercises = [EXERCISES[step.exercise]() for step in routine.steps]
+        self.results = []
+        self.index = 0
+        self._set_start = None
+        self._last_timestamp = None
+        self._rep_times = []
+
+    @property
+    def finished(self):
+        return self.index >= len(self.exercises)
+
+    @property
+    def step(self):
+        return None if self.finished else self.routine.steps[self.index]
+
+    @property
+    def exercise(self):
+        return None if self.finished else self.exercises[self.index]
+
+    def process(self, img, timestamp=None, draw=True):
+        """Run detection and the current counter on one frame.
+
+        Returns the angles of the current exercise, or ``None`` when no
+        pose was found or the routine is finished.
+        """
+        if self.finished:
+            return None
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self._set_start is None:
+            self._set_start = timestamp
+        self._last_timestamp = timestamp
+
+        exercise = self.exercise
+        if hasattr(self.detector, 'setHold'):
+            self.detector.setHold(exercise.holding)
+        self.detector.findPose(img, False, timestamp=timestamp)
+        lmList = self.detector.findPosition(img, False)
+
+        angles = None
+        if len(lmList) != 0:
+            angles = exercise.get_required_angles(self.detector, img)
+            exercise.update_feedback_and_count(angles, timestamp=timestamp)
+            if int(exercise.count) > len(self._rep_times):
+                self._rep_times.append(timestamp - self._set_start)
+            if draw:
+                exercise.draw_ui(img, *exercise.get_progress_bar_values(angles))
+
+        if self._target_reached(timestamp):
+            self.next_set(timestamp)
+        return angles
+
+    def elapsed(self, timestamp=None):
+        """Seconds counted toward the current set's target."""
+        if self.finished or self._set_start is None:
+            return 0.0
+        if timestamp is None:
+            timestamp = time.monotonic()
+        return self.exercise.summary().get('elapsed', timestamp - self._set_start)
+
+    def _target_reached(self, timestamp):
+        step = self.step
+        if step.reps is not None:
+            return self.exercise.count >= step.reps
+        return self.elapsed(timestamp) >= step.duration
+
+    def next_set(self, timestamp=None):
+        """Record the current set and move on, e.g. when the user skips it."""
+        if self.finished:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+        step = self.step
+        start = timestamp if self._set_start is None else self._set_start
+        result = {"exercise": step.exercise, "target": step.target,
+                  "duration": round(timestamp - start, 3)}
+        result.update(self.exercise.summary())
+        result["metrics"] = rep_metrics(self._rep_times)
+        self.results.append(result)
+        if self.logger is not None:
+            self.logger.log_result(result, self.routine.name)
+        self.index += 1
+        self._set_start = None
+        self._rep_times = []
+        profiler.mark('switch')
+
+    def reset(self):
+        """Start the routine over, keeping the detector and counters."""
+        for exercise in self.exercises:
+            exercise.reset_counter()
+        self.results = []
+        self.index = 0
+        self._set_start = None
+        self._last_timestamp = None
+        self._rep_times = []
+
+    def snapshot(self):
+        """Progress through the routine plus the current counter's ``snapshot``."""
+        return {"routine": [step.spec for step in self.routine.steps], "index": self.index,
+                "results": [dict(result) for result in self.results],
+                "set_start": self._set_start, "last_timestamp": self._last_timestamp,
+                "rep_times": list(self._rep_times),
+                "exercise": None if self.finished else self.exercise.snapshot()}
+
+    def restore(self, state, timestamp=None):
+        """Resume a ``snapshot`` of the same routine mid-set.
+
+        ``timestamp`` works as in ``BaseExercise.restore``.
+        """
+        if state["routine"] != [step.spec for step in self.routine.steps]:
+            raise ValueError("Snapshot belongs to a different routine")
+        self.reset()
+        self.index = state["index"]
+        self.results = [dict(result) for result in state["results"]]
+        self._set_start = state["set_start"]
+        self._last_timestamp = state["last_timestamp"]
+        self._rep_times = list(state.get("rep_times", ()))
+        if timestamp is not None and self._last_timestamp is not None:
+            if self._set_start is not None:
+                self._set_start += timestamp - self._last_timestamp
+            self._last_timestamp = timestamp
+        if state["exercise"] is not None:
+            self.exercise.restore(state["exercise"], timestamp)
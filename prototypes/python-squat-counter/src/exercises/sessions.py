@@ -0,0 +1,268 @@
+"""Server-side rep counting for many concurrent sessions.
+
+Browsers run pose estimation themselves and send only landmarks.
+``SessionManager`` keeps the counter state of every session in NumPy
+arrays, one block per exercise (``CompiledExercise.new_batch_state``)
+instead of one ``BaseExercise`` object per user. A batch of landmark
+messages advances all of its sessions with one ``features`` and one
+``step_batch`` call per exercise::
+
+    manager = SessionManager()
+    alice = manager.open('alice', 'squat', size=(1280, 720))
+    bob = manager.open('bob', 'pushup')
+    completed = manager.update([alice, bob], landmarks)  # (2, 33, 4), normalized
+    manager.result(alice)  # {'session': 'alice', 'exercise': 'squat', 'count': 3, ...}
+
+``decode_batch`` reads the compact binary form of a batch without copying.
+Only exercises with an ``ExerciseDefinition`` can be batched; the plank
+timer is not one.
+"""
+import struct
+
+import numpy as np
+
+from ..core.pose_detector import NUM_LANDMARKS
+from .definitions import DEFINITIONS
+
+BATCH_HEADER = struct.Struct('<I')
+STATE_KEYS = ('count', 'direction', 'form', 'feedback')
+
+
+def encode_batch(handles, landmarks):
+    """Binary batch: uint32 count, int32 handles, float32 ``(n, 33, 4)`` landmarks."""
+    handles = np.asarray(handles, dtype='<i4')
+    landmarks = np.asarray(landmarks, dtype='<f4').reshape(len(handles), NUM_LANDMARKS, 4)
+    return BATCH_HEADER.pack(len(handles)) + handles.tobytes() + landmarks.tobytes()
+
+
+def decode_batch(buffer):
+    """Return ``(handles, landmarks)`` views into an ``encode_batch`` buffer."""
+    n, = BATCH_HEADER.unpack_from(buffer)
+    offset = BATCH_HEADER.size
+    handles = np.frombuffer(buffer, dtype='<i4', count=n, offset=offset)
+    landmarks = np.frombuffer(buffer, dtype='<f4', count=n * NUM_LANDMARKS * 4,
+                              offset=offset + 4 * n).reshape(n, NUM_LANDMARKS, 4)
+    return handles, landmarks
+
+
+class _ExerciseBlock:
+    """Counter state and frame size of every session of one exercise."""
+
+    def __init__(self, compiled, capacity):
+        self.compiled = compiled
+        self.state = compiled.new_batch_state(capacity)
+        self.size = np.zeros((capacity, 2), dtype=np.float64)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def allocate(self, sizes):
+        """Take a slot for each row of ``(n, 2)`` frame ``sizes``."""
+        n = len(sizes)
+        while len(self.free) < n:
+            self._grow()
+        slots = np.array(self.free[:-n - 1:-1], dtype=np.intp)
+        del self.free[len(self.free) - n:]
+        self.size[slots] = sizes
+        return slots
+
+    def release(self, slot):
+        for key, value in self.compiled.new_batch_state(1).items():
+            self.state[key][slot] = value[0]
+        self.free.append(int(slot))
+
+    def _grow(self):
+        capacity = len(self.size)
+        extra = self.compiled.new_batch_state(capacity)
+        self.state = {key: np.concatenate((column, extra[key]))
+                      for key, column in self.state.items()}
+        self.size = np.concatenate((self.size, np.zeros_like(self.size)))
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+
+class SessionManager:
+    """Array-backed counters for many sessions, addressed by integer handles.
+
+    ``open`` returns a handle that batches refer to; it is reused after
+    ``close``. ``capacity`` is the initial number of sessions per exercise;
+    blocks double when full.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.handles = {}
+        self._blocks = []
+        self._block_codes = {}
+        self._block_of = np.full(capacity, -1, dtype=np.int16)
+        self._slot_of = np.zeros(capacity, dtype=np.intp)
+        self._names = [None] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.handles)
+
+    def open(self, session_id, exercise, size=(640, 480)):
+        """Start counting ``exercise`` for ``session_id``; returns its handle.
+
+        ``size`` is the client's frame size in pixels; angles are measured in
+        pixels like ``PoseDetector`` does, so the aspect ratio matters.
+        """
+        if session_id in self.handles:
+            raise ValueError(f"Session {session_id!r} is already open")
+        code = self._block_code(exercise)
+        handle = int(self._take_handles(1)[0])
+        self._block_of[handle] = code
+        self._slot_of[handle] = self._blocks[code].allocate([size])[0]
+        self._names[handle] = session_id
+        self.handles[session_id] = handle
+        return handle
+
+    def _block_code(self, exercise):
+        code = self._block_codes.get(exercise)
+        if code is None:
+            if exercise not in DEFINITIONS:
+                raise ValueError(f"No batch counter for {exercise!r}; "
+                                 f"choose from {sorted(DEFINITIONS)}")
+            code = self._block_codes[exercise] = len(self._blocks)
+            self._blocks.append(_ExerciseBlock(DEFINITIONS[exercise].compile(), self.capacity))
+        return code
+
+    def _take_handles(self, n):
+        while len(self._free) < n:
+            self._grow()
+        handles = np.array(self._free[:-n - 1:-1], dtype=np.intp)
+        del self._free[len(self._free) - n:]
+        return handles
+
+    def close(self, handle):
+        """End a session and return its final result."""
+        result = self.result(handle)
+        self._blocks[self._block_of[handle]].release(self._slot_of[handle])
+        del self.handles[self._names[handle]]
+        self._block_of[handle] = -1
+        self._names[handle] = None
+        self._free.append(int(handle))
+        return result
+
+    def _grow(self):
+        capacity = len(self._block_of)
+        self._block_of = np.concatenate((self._block_of, np.full(capacity, -1, dtype=np.int16)))
+        self._slot_of = np.concatenate((self._slot_of, np.zeros(capacity, dtype=np.intp)))
+        self._names.extend([None] * capacity)
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _lookup(self, handles):
+        handles = np.asarray(handles, dtype=np.intp).reshape(-1)
+        if len(handles) and (handles.max() >= len(self._block_of) or handles.min() < 0):
+            raise KeyError("Unknown session handle")
+        codes = self._block_of[handles]
+        if (codes < 0).any():
+            raise KeyError(f"Closed session handles: {handles[codes < 0].tolist()}")
+        return handles, codes
+
+    def update(self, handles, landmarks, valid=None):
+        """Advance the sessions in ``handles`` by one frame each.
+
+        ``landmarks`` is ``(n, 33, C)`` with normalized x and y first, as
+        MediaPipe reports them; rows that are all NaN or have ``valid``
+        False mean no pose, like a frame without detection. A handle should
+        appear at most once per batch. Returns the handles whose whole rep
+        count went up.
+        """
+        handles, codes = self._lookup(handles)
+        landmarks = np.asarray(landmarks)
+        valid = None if valid is None else np.asarray(valid, dtype=bool)
+        completed = []
+        for code in np.unique(codes).tolist():
+            rows = codes == code
+            block = self._blocks[code]
+            slots = self._slot_of[handles[rows]]
+
+            # Truncated pixels, so angles match PoseDetector.pixelPositions
+            points = np.trunc(landmarks[rows, :, :2] * block.size[slots, None, :])
+            values = block.compiled.features(points)
+
+            state = {key: column[slots] for key, column in block.state.items()}
+            before = state['count'].astype(np.intp)
+            block.compiled.step_batch(state, values, None if valid is None else valid[rows])
+            for key, column in block.state.items():
+                column[slots] = state[key]
+            completed.append(handles[rows][state['count'].astype(np.intp) > before])
+        return np.concatenate(completed) if completed else handles[:0]
+
+    def counts(self, handles):
+        """Whole rep counts of ``handles`` as an array."""
+        handles, codes = self._lookup(handles)
+        counts = np.zeros(len(handles), dtype=np.intp)
+        for code in np.unique(codes).tolist():
+            rows = codes == code
+            counts[rows] = self._blocks[code].state['count'][self._slot_of[handles[rows]]]
+        return counts
+
+    def result(self, handle):
+        """Current result of one session, like ``BaseExercise.summary`` plus its state."""
+        handle = int(handle)
+        self._lookup([handle])
+        block = self._blocks[self._block_of[handle]]
+        slot = self._slot_of[handle]
+        state = block.state
+        code = int(state['feedback'][slot])
+        return {"session": self._names[handle], "exercise": block.compiled.name,
+                "count": int(state['count'][slot]), "direction": int(state['direction'][slot]),
+                "form": int(state['form'][slot]),
+                "feedback": block.compiled.messages[code] if code >= 0 else None}
+
+    def snapshot(self, handles=None):
+        """State of ``handles`` (default: every open session) as JSON-ready columns.
+
+        Gathered per exercise block, so moving thousands of sessions to
+        another worker costs a few array copies.
+        """
+        if handles is None:
+            handles = list(self.handles.values())
+        handles, codes = self._lookup(handles)
+        sizes = np.zeros((len(handles), 2))
+        columns = {key: np.zeros(len(handles), dtype=np.float64 if key == 'count' else np.int64)
+                   for key in STATE_KEYS}
+        for code in np.unique(codes).tolist():
+            rows = codes == code
+            block = self._blocks[code]
+            slots = self._slot_of[handles[rows]]
+            sizes[rows] = block.size[slots]
+            for key, column in columns.items():
+                column[rows] = block.state[key][slots]
+        snapshot = {"session": [self._names[handle] for handle in handles.tolist()],
+                    "exercise": [self._blocks[code].compiled.name for code in codes.tolist()],
+                    "size": sizes.tolist()}
+        snapshot.update((key, column.tolist()) for key, column in columns.items())
+        return snapshot
+
+    def restore(self, snapshot):
+        """Open the sessions of a ``snapshot`` mid-set; returns their new handles."""
+        sessions = snapshot["session"]
+        if len(set(sessions)) != len(sessions) or not self.handles.keys().isdisjoint(sessions):
+            raise ValueError("Snapshot sessions are duplicated or already open")
+        exercises = np.array(snapshot["exercise"])
+        sizes = np.asarray(snapshot["size"], dtype=np.float64).reshape(-1, 2)
+        columns = {key: np.asarray(snapshot[key]) for key in STATE_KEYS}
+        codes = {exercise: self._block_code(exercise) for exercise in np.unique(exercises).tolist()}
+
+        handles = self._take_handles(len(sessions))
+        for exercise, code in codes.items():
+            rows = exercises == exercise
+            block = self._blocks[code]
+            slots = block.allocate(sizes[rows])
+            self._block_of[handles[rows]] = code
+            self._slot_of[handles[rows]] = slots
+            for key, column in block.state.items():
+                column[slots] = columns[key][rows]
+
+        handle_list = handles.tolist()
+        for session, handle in zip(sessions, handle_list):
+            self._names[handle] = session
+        self.handles.update(zip(sessions, handle_list))
+        return handles
+
+    def results(self, handles=None):
+        """Results of ``handles``, or of every open session."""
+        if handles is None:
+            handles = self.handles.values()
+        return [self.result(handle) for handle in handles]
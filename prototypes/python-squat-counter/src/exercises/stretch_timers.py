@@ -0,0 +1,202 @@
+import time
+from ..utils.profiler import profiler
+from .base_exercise import BaseExercise
+
+# Pixel landmarks the stretch checks compare directly
+POSITIONS = {"right_wrist": 16, "right_elbow": 14, "right_shoulder": 12,
+             "left_wrist": 15, "left_elbow": 13, "left_shoulder": 11}
+
+
+class StretchTimer(BaseExercise):
+    """Base for stretch hold timers driven by frame timestamps.
+
+    ``get_required_angles`` adds the pixel ``<landmark>_x``/``_y`` of
+    ``POSITIONS`` to the joint angles. A hold that ends before
+    ``target_time`` seconds starts over from zero next time.
+    """
+
+    ANGLES = {}
+    target_time = 30  # seconds
+
+    def get_required_angles(self, detector, img):
+        """Get joint angles plus the pixel positions the stretch checks use."""
+        angles = detector.findAngles(self.ANGLES)
+        points = detector.pixelPoints()
+        for name, index in POSITIONS.items():
+            angles[f"{name}_x"] = float(points[index, 0])
+            angles[f"{name}_y"] = float(points[index, 1])
+        profiler.mark('angles')
+        return angles
+
+    def _time_hold(self, side, correct, timestamp):
+        """Advance the ``<side>start_time``/``elapsed_time``/``in_position`` timer."""
+        if correct:
+            if not getattr(self, side + 'in_position'):
+                setattr(self, side + 'start_time', timestamp)
+                setattr(self, side + 'in_position', True)
+            else:
+                setattr(self, side + 'elapsed_time', timestamp - getattr(self, side + 'start_time'))
+        else:
+            setattr(self, side + 'in_position', False)
+            if getattr(self, side + 'elapsed_time') < self.target_time:
+                setattr(self, side + 'elapsed_time', 0)
+
+    @staticmethod
+    def _timestamp(timestamp):
+        # Wall clock only suits live camera input
+        return time.time() if timestamp is None else timestamp
+
+
+class ChestStretchTimer(StretchTimer):
+    """Chest and shoulder stretch timer (doorway, behind-back clasp or wide arms)."""
+
+    name = 'cheststretch'
+    STATE = BaseExercise.STATE + ('stretch_type', 'start_time', 'elapsed_time', 'in_position',
+                                  'last_timestamp')
+    TIMESTAMPS = ('start_time', 'last_timestamp')
+    ANGLES = {"right_arm": (12, 14, 16), "left_arm": (11, 13, 15)}
+
+    def __init__(self):
+        super().__init__()
+        self.reset_counter()
+
+    def update_feedback_and_count(self, angles, timestamp=None, **kwargs):
+        """Update the stretch type, feedback and hold time."""
+        timestamp = self.last_timestamp = self._timestamp(timestamp)
+        a = angles
+
+        # 1. Doorway stretch (arms at 90 degrees, elbows bent)
+        doorway_position = (
+            abs(a["right_wrist_y"] - a["right_shoulder_y"]) < 50 and
+            abs(a["left_wrist_y"] - a["left_shoulder_y"]) < 50 and
+            a["right_arm"] < 120 and a["left_arm"] < 120 and
+            a["right_elbow_x"] > a["right_shoulder_x"] and
+            a["left_elbow_x"] < a["left_shoulder_x"]
+        )
+        # 2. Behind-back clasp (hands clasped behind back)
+        behind_back = (
+            a["right_wrist_x"] < a["right_shoulder_x"] and
+            a["left_wrist_x"] > a["left_shoulder_x"] and
+            abs(a["right_wrist_x"] - a["left_wrist_x"]) < 100
+        )
+        # 3. Wide arm stretch (arms fully extended to sides)
+        wide_stretch = (
+            a["right_arm"] > 160 and a["left_arm"] > 160 and
+            a["right_wrist_x"] > a["right_shoulder_x"] + 50 and
+            a["left_wrist_x"] < a["left_shoulder_x"] - 50 and
+            abs(a["right_wrist_y"] - a["right_shoulder_y"]) < 100 and
+            abs(a["left_wrist_y"] - a["left_shoulder_y"]) < 100
+        )
+
+        self.form = 1
+        if doorway_position:
+            self.stretch_type = "Doorway Stretch"
+            self.feedback = "Hold Position!"
+        elif behind_back:
+            self.stretch_type = "Behind-Back Clasp"
+            self.feedback = "Pull Shoulders Back!"
+        elif wide_stretch:
+            self.stretch_type = "Wide Arm Stretch"
+            self.feedback = "Feel the Stretch!"
+        else:
+            self.form = 0
+            self.stretch_type = ""
+            if a["right_arm"] < 160 or a["left_arm"] < 160:
+                self.feedback = "Straighten Arms"
+            else:
+                self.feedback = "Extend Arms Back"
+
+        self._time_hold('', self.form == 1, timestamp)
+        profiler.mark('count')
+        return self.feedback, self.count, self.direction, self.form
+
+    @property
+    def holding(self):
+        return self.in_position
+
+    def summary(self):
+        """Return the final result of the hold."""
+        return {"count": int(self.count), "elapsed": round(self.elapsed_time, 3)}
+
+    def reset_counter(self):
+        """Reset counter and timer variables."""
+        super().reset_counter()
+        self.feedback = "Arms Out to Sides"
+        self.stretch_type = ""
+        self.start_time = None
+        self.elapsed_time = 0
+        self.in_position = False
+        self.last_timestamp = None
+
+
+class TricepStretchTimer(StretchTimer):
+    """Overhead tricep stretch with a hold timer per arm.
+
+    ``elapsed`` in the summary is the hold time of both arms together.
+    """
+
+    name = 'tricepstretch'
+    STATE = BaseExercise.STATE + ('right_start_time', 'right_elapsed_time', 'right_in_position',
+                                  'left_start_time', 'left_elapsed_time', 'left_in_position',
+                                  'last_timestamp')
+    TIMESTAMPS = ('right_start_time', 'left_start_time', 'last_timestamp')
+    ANGLES = {"right_elbow": (12, 14, 16), "right_shoulder": (24, 12, 14),
+              "left_elbow": (11, 13, 15), "left_shoulder": (23, 11, 13)}
+
+    def __init__(self):
+        super().__init__()
+        self.reset_counter()
+
+    def update_feedback_and_count(self, angles, timestamp=None, **kwargs):
+        """Update both arm timers and the feedback."""
+        timestamp = self.last_timestamp = self._timestamp(timestamp)
+        a = angles
+
+        right_overhead = a["right_elbow_y"] < a["right_shoulder_y"]  # Elbow above shoulder
+        right_bent = a["right_elbow"] < 90
+        right_correct = right_overhead and right_bent and a["right_shoulder"] > 150
+
+        left_overhead = a["left_elbow_y"] < a["left_shoulder_y"]
+        left_bent = a["left_elbow"] < 90
+        left_correct = left_overhead and left_bent and a["left_shoulder"] > 150
+
+        self._time_hold('right_', right_correct, timestamp)
+        self._time_hold('left_', left_correct, timestamp)
+
+        self.form = int(right_correct or left_correct)
+        if right_correct and left_correct:
+            self.feedback = "Both Arms - Hold!"
+        elif right_correct:
+            self.feedback = "Right Good - Do Left"
+        elif left_correct:
+            self.feedback = "Left Good - Do Right"
+        elif not (right_overhead or left_overhead):
+            self.feedback = "Raise Arm Overhead"
+        elif not (right_bent or left_bent):
+            self.feedback = "Bend Elbow Behind Head"
+        else:
+            self.feedback = "Adjust Position"
+
+        profiler.mark('count')
+        return self.feedback, self.count, self.direction, self.form
+
+    @property
+    def holding(self):
+        return self.right_in_position or self.left_in_position
+
+    def summary(self):
+        """Return the final result, per arm and combined."""
+        return {"count": int(self.count),
+                "elapsed": round(self.right_elapsed_time + self.left_elapsed_time, 3),
+                "right_elapsed": round(self.right_elapsed_time, 3),
+                "left_elapsed": round(self.left_elapsed_time, 3)}
+
+    def reset_counter(self):
+        """Reset counter and both arm timers."""
+        super().reset_counter()
+        self.feedback = "Raise Arm Overhead"
+        for side in ('right_', 'left_'):
+            setattr(self, side + 'start_time', None)
+            setattr(self, side + 'elapsed_time', 0)
+            setattr(self, side + 'in_position', False)
+        self.last_timestamp = None
@@ -0,0 +1,367 @@
+"""Persist finished sets in a local SQLite store and sync them upstream.
+
+``WorkoutLogger.log_set`` only puts the set on a queue, so the frame loop
+never waits for disk or network. A background thread writes whatever is
+queued in one transaction, then sends unsynced rows to a pluggable ``sink``::
+
+    with WorkoutLogger('workouts.db', sink=JsonLinesSink('synced.jsonl')) as logger:
+        runner = RoutineRunner(routine, detector, logger=logger)
+        ...
+
+Sets logged while a sync is pending or backing off after a failure are
+coalesced into the next ``send``; rows stay in SQLite until a sink accepts
+them, so they survive restarts. Documents mirror the web app's
+``WorkoutLog`` model (``exerciseName``, ``sets``, ``notes``, ``date``) plus
+``duration``, hold ``elapsed`` and per-rep ``metrics``. Each carries a unique
+``id`` so a sink can ignore a batch it already stored when a retry resends it.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workout_logs (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL UNIQUE,
+    date REAL NOT NULL,
+    exercise_name TEXT NOT NULL,
+    routine TEXT,
+    reps INTEGER NOT NULL,
+    duration REAL,
+    elapsed REAL,
+    metrics TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    synced INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS workout_logs_unsynced ON workout_logs (synced, id);
+"""
+COLUMNS = 'uid, date, exercise_name, routine, reps, duration, elapsed, metrics, notes'
+SYNCED = 1
+QUARANTINED = -1  # never sent: the row cannot be turned into a document
+
+_CLOSE = object()
+
+
+def rep_metrics(rep_times):
+    """Per-rep metrics from rep completion times in seconds since the set started."""
+    metrics = []
+    previous = 0.0
+    for rep, offset in enumerate(rep_times, 1):
+        metrics.append({"rep": rep, "time": round(offset, 3), "duration": round(offset - previous, 3)})
+        previous = offset
+    return metrics
+
+
+class WorkoutStore:
+    """SQLite table of finished sets; one connection per thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        # WAL lets readers query while the logger thread writes
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def insert(self, rows):
+        """Insert ``COLUMNS`` tuples in one transaction; known ``uid``s are skipped."""
+        with self.db:
+            self.db.executemany(f'INSERT OR IGNORE INTO workout_logs ({COLUMNS}) '
+                                f'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def pending(self, limit):
+        """Oldest unsynced rows as ``(row ids, documents, unreadable row ids)``.
+
+        Rows that do not make a JSON-serializable document are returned
+        separately so they can be quarantined instead of blocking the rest.
+        """
+        rows = self.db.execute(f'SELECT id, {COLUMNS} FROM workout_logs WHERE synced = 0 '
+                               'ORDER BY id LIMIT ?', (limit,)).fetchall()
+        ids, documents, bad = [], [], []
+        for row in rows:
+            try:
+                document = _document(row[1:])
+                json.dumps(document)
+            except (TypeError, ValueError, OverflowError, OSError):
+                bad.append(row[0])
+                continue
+            ids.append(row[0])
+            documents.append(document)
+        return ids, documents, bad
+
+    def mark_synced(self, ids, synced=SYNCED):
+        with self.db:
+            self.db.executemany('UPDATE workout_logs SET synced = ? WHERE id = ?',
+                                [(synced, row_id) for row_id in ids])
+
+    def unsynced(self):
+        return self.db.execute('SELECT COUNT(*) FROM workout_logs WHERE synced = 0').fetchone()[0]
+
+    def logs(self, exercise=None, limit=100):
+        """Newest documents first, optionally of one exercise."""
+        query = f'SELECT {COLUMNS} FROM workout_logs'
+        params = ()
+        if exercise is not None:
+            query += ' WHERE exercise_name = ?'
+            params = (exercise,)
+        rows = self.db.execute(query + ' ORDER BY date DESC, id DESC LIMIT ?', params + (limit,))
+        return [_document(row) for row in rows]
+
+    def close(self):
+        self.db.close()
+
+
+def _document(row):
+    uid, date, exercise, routine, reps, duration, elapsed, metrics, notes = row
+    return {"id": uid,
+            "date": datetime.fromtimestamp(date, timezone.utc).isoformat(timespec='milliseconds'),
+            "exerciseName": exercise, "routine": routine, "sets": [{"reps": reps}],
+            "duration": duration, "elapsed": elapsed, "metrics": json.loads(metrics),
+            "notes": notes}
+
+
+class JsonLinesSink:
+    """Local stand-in for an upstream service: appends each document to a JSON lines file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, documents):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(document, ensure_ascii=False) + '\n' for document in documents)
+
+
+class HttpSink:
+    """POST batches as ``{"logs": [...]}`` JSON; any error or non-2xx status fails the batch."""
+
+    def __init__(self, url, headers=None, timeout=10.0):
+        self.url = url
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self.timeout = timeout
+
+    def send(self, documents):
+        body = json.dumps({"logs": documents}).encode()
+        request = urllib.request.Request(self.url, body, self.headers, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def open_sink(target):
+    """``HttpSink`` for an ``http(s)://`` URL, otherwise a ``JsonLinesSink`` file."""
+    if target.startswith(('http://', 'https://')):
+        return HttpSink(target)
+    return JsonLinesSink(target)
+
+
+class WorkoutLogger:
+    """Queue finished sets for a background SQLite writer and sync loop.
+
+    ``sink`` is any object with ``send(documents)`` that raises on failure,
+    or ``None`` to only store locally. Pending rows are sent at most every
+    ``sync_interval`` seconds, up to ``sync_batch`` per ``send``; a failed
+    send is retried after ``retry_delay`` seconds, doubling up to
+    ``max_retry_delay``.
+    """
+
+    def __init__(self, path, sink=None, sync_interval=5.0, sync_batch=500,
+                 retry_delay=1.0, max_retry_delay=300.0):
+        self.path = path
+        self.sink = sink
+        self.sync_interval = sync_interval
+        self.sync_batch = sync_batch
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.written = 0
+        self.synced = 0
+        self.quarantined = 0
+        self.dropped = 0
+        self.failures = 0
+        self.last_error = None
+        self._queue = queue.SimpleQueue()
+        self._store = None
+        self._closed = False
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='workout-log', daemon=True)
+        self._thread.start()
+        # Schema errors surface here rather than on the first set
+        self._ready.wait()
+        if self._store is None:
+            raise self.last_error
+
+    def log_set(self, exercise, reps, duration=None, metrics=(), routine=None, notes='',
+                elapsed=None, date=None):
+        """Queue one finished set and return its id; never blocks.
+
+        Values are converted here (NumPy scalars included), so bad input
+        raises in the caller instead of reaching the writer thread.
+        """
+        if self._closed:
+            raise RuntimeError("WorkoutLogger is closed")
+        uid = uuid.uuid4().hex
+        self._queue.put((uid, time.time() if date is None else float(date), str(exercise),
+                         None if routine is None else str(routine), int(reps),
+                         None if duration is None else float(duration),
+                         None if elapsed is None else float(elapsed),
+                         json.dumps(list(metrics), allow_nan=False), str(notes)))
+        return uid
+
+    def log_result(self, result, routine=None):
+        """Queue a ``RoutineRunner`` set result (``exercise``, ``count``, ...)."""
+        return self.log_set(result["exercise"], result["count"], result.get("duration"),
+                            result.get("metrics", ()), routine, elapsed=result.get("elapsed"))
+
+    def flush(self, timeout=None):
+        """Wait until every set queued so far is in SQLite, or failed to be written (see ``stats``)."""
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stats(self):
+        return {"queued": self._queue.qsize(), "written": self.written, "synced": self.synced,
+                "quarantined": self.quarantined, "dropped": self.dropped, "failures": self.failures,
+                "last_error": None if self.last_error is None else repr(self.last_error)}
+
+    def close(self, timeout=None):
+        """Write what is queued, try one last sync, and stop the thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        try:
+            store = self._store = WorkoutStore(self.path)
+        except sqlite3.Error as e:
+            self.last_error = e
+            return
+        finally:
+            self._ready.set()
+
+        unsynced = store.unsynced()
+        next_sync = time.monotonic()
+        delay = self.retry_delay
+        rows, waiters = [], []
+        closing = False
+        try:
+            while not closing:
+                timeout = None
+                if rows:
+                    timeout = self.retry_delay  # the last write failed
+                elif self.sink is not None and unsynced:
+                    timeout = max(0.0, next_sync - time.monotonic())
+                closing = self._drain(rows, waiters, timeout)
+
+                try:
+                    if rows:
+                        written = self._write(store, rows)
+                        rows = []
+                        self.written += written
+                        unsynced += written
+                    for waiter in waiters:
+                        waiter.set()
+                    waiters = []
+
+                    if self.sink is not None and unsynced and (closing or time.monotonic() >= next_sync):
+                        done, error = self._sync(store)
+                        unsynced -= done
+                        if error is None:
+                            unsynced = 0
+                            delay = self.retry_delay
+                            next_sync = time.monotonic() + self.sync_interval
+                        else:
+                            next_sync = time.monotonic() + delay
+                            delay = min(delay * 2, self.max_retry_delay)
+                except Exception as e:
+                    # Never let the writer thread die; rows left over are retried
+                    self.failures += 1
+                    self.last_error = e
+                    unsynced = max(unsynced, 1)
+                    next_sync = time.monotonic() + self.retry_delay
+                    for waiter in waiters:
+                        waiter.set()
+                    waiters = []
+        finally:
+            for waiter in waiters:
+                waiter.set()
+            store.close()
+
+    def _write(self, store, rows):
+        """Insert ``rows`` in one transaction; returns how many were written.
+
+        A failure to write at all (disk full, database locked) raises and
+        the rows are retried. A row SQLite rejects on its own is dropped.
+        """
+        try:
+            store.insert(rows)
+            return len(rows)
+        except sqlite3.OperationalError:
+            raise
+        except sqlite3.Error:
+            written = 0
+            for row in rows:
+                try:
+                    store.insert([row])
+                    written += 1
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error as e:
+                    self.dropped += 1
+                    self.last_error = e
+            return written
+
+    def _drain(self, rows, waiters, timeout):
+        """Block for the first item, then take everything already queued."""
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        while True:
+            if item is _CLOSE:
+                return True
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                rows.append(item)
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+
+    def _sync(self, store):
+        """Send every pending row in ``sync_batch`` chunks; stops at the first failure.
+
+        Returns the number of rows no longer pending and the error, if any.
+        """
+        sent = 0
+        while True:
+            ids, documents, bad = store.pending(self.sync_batch)
+            if bad:
+                store.mark_synced(bad, QUARANTINED)
+                self.quarantined += len(bad)
+                sent += len(bad)
+            if not documents:
+                if bad:
+                    continue
+                return sent, None
+            try:
+                self.sink.send(documents)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = e
+                return sent, e
+            store.mark_synced(ids)
+            sent += len(ids)
+            self.synced += len(ids)
@@ -1,3 +1,6 @@
-from .camera_utils import setup_camera, get_video_dimensions
+from .camera_utils import setup_camera, get_video_dimensions, ThreadedCapture
+from .overlay import HudOverlay
+from .profiler import StageProfiler, LatencyHistogram, profiler
 
-__all__ = ['setup_camera', 'get_video_dimensions']
\ No newline at end of file
+__all__ = ['setup_camera', 'get_video_dimensions', 'ThreadedCapture', 'HudOverlay',
+           'StageProfiler', 'LatencyHistogram', 'profiler']
\ No newline at end of file
@@ -1,22 +1,151 @@
-import cv2
+import threading
+import time
+from collections import deque
+
+from .lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+
+DROP_NEWEST = 'newest'
+DROP_NONE = 'all'
+
+
+class ThreadedCapture:
+    """Camera reader that captures on a background thread into a bounded buffer.
+
+    With ``drop_policy='newest'`` the oldest frames are discarded when the
+    buffer is full, so ``read()`` always hands back the freshest frame. With
+    ``drop_policy='all'`` the reader thread waits for the consumer instead of
+    dropping, so every captured frame is delivered in order.
+    """
+
+    def __init__(self, source=0, buffer_size=1, drop_policy=DROP_NEWEST, cap=None):
+        if drop_policy not in (DROP_NEWEST, DROP_NONE):
+            raise ValueError(f"Unknown drop policy: {drop_policy!r}")
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+
+        self.cap = cap if cap is not None else cv2.VideoCapture(source)
+        self.buffer_size = buffer_size
+        self.drop_policy = drop_policy
+        self.frame_id = -1
+        self.dropped = 0
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Start the background reader thread."""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._reader, name='ThreadedCapture', daemon=True)
+        self._thread.start()
+        return self
+
+    def _reader(self):
+        while self._running:
+            ret, img = self.cap.read()
+            timestamp = time.monotonic()
+            if not ret:
+                with self._cond:
+                    self._running = False
+                    self._cond.notify_all()
+                break
+
+            with self._cond:
+                if self.drop_policy == DROP_NONE:
+                    while self._running and len(self._buffer) >= self.buffer_size:
+                        self._cond.wait()
+                    if not self._running:
+                        break
+                elif len(self._buffer) >= self.buffer_size:
+                    self._buffer.popleft()
+                    self.dropped += 1
+                self.frame_id += 1
+                self._buffer.append((img, timestamp, self.frame_id))
+                self._cond.notify_all()
+
+    def read_frame(self, timeout=None):
+        """Return ``(ret, img, timestamp, frame_id)`` for the next frame.
+
+        ``timestamp`` is the ``time.monotonic()`` value taken right after the
+        frame was grabbed. Under the ``'newest'`` policy any older buffered
+        frames are skipped.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._buffer or not self._running, timeout):
+                return False, None, None, None
+            if not self._buffer:
+                return False, None, None, None
+
+            if self.drop_policy == DROP_NEWEST:
+                img, timestamp, frame_id = self._buffer.pop()
+                self.dropped += len(self._buffer)
+                self._buffer.clear()
+            else:
+                img, timestamp, frame_id = self._buffer.popleft()
+            self._cond.notify_all()
+        return True, img, timestamp, frame_id
+
+    def read(self):
+        """Drop-in replacement for ``cv2.VideoCapture.read``."""
+        ret, img, _, _ = self.read_frame()
+        return ret, img
+
+    def isOpened(self):
+        with self._cond:
+            return self.cap.isOpened() and (self._running or bool(self._buffer))
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def release(self):
+        """Stop the reader thread and release the underlying capture."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.cap.release()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def setup_camera(source=0, threaded=False, buffer_size=1, drop_policy=DROP_NEWEST):
+    """Initialize and return video capture object with error handling.
+
+    When ``threaded`` is True a started ``ThreadedCapture`` is returned instead
+    of a raw ``cv2.VideoCapture`` so capture no longer blocks inference.
+    """
+    cap = cv2.VideoCapture(source)
 
-def setup_camera():
-    """Initialize and return video capture object with error handling."""
-    cap = cv2.VideoCapture(0)
-    
     if not cap.isOpened():
         raise RuntimeError("Could not open camera. Please check your camera connection.")
-    
+
     # Test frame reading
     ret, test_frame = cap.read()
     if not ret:
         cap.release()
         raise RuntimeError("Could not read frame from camera. Please check your camera permissions.")
-    
+
+    if threaded:
+        return ThreadedCapture(buffer_size=buffer_size, drop_policy=drop_policy, cap=cap).start()
+
     return cap
 
 def get_video_dimensions(cap):
     """Return the dimensions of the video frame."""
     width = cap.get(3)
     height = cap.get(4)
-    return width, height
\ No newline at end of file
+    return width, height
@@ -0,0 +1,23 @@
+"""Deferred imports for heavy optional modules."""
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access.
+
+    Looked-up attributes are cached on the stand-in, so after the first call
+    ``cv2.resize`` costs the same as with a normal import.
+    """
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        value = getattr(importlib.import_module(self.__name__), attr)
+        setattr(self, attr, value)
+        return value
+
+
+def lazy_import(name):
+    """Return a ``LazyModule`` for ``name`` without importing it yet."""
+    return LazyModule(name)
@@ -0,0 +1,145 @@
+"""Cached HUD rendering for the exercise counters.
+
+``HudOverlay`` pre-renders each HUD element (counter box, feedback box,
+progress bar frame, percentage) into a small patch with an alpha mask.
+Static patches are built once per frame size; text patches are rendered
+once per distinct value (count, feedback string, percentage) and reused.
+Per frame, each patch is blended onto the image in its own region
+(``img * (1 - alpha) + patch``), so no text is rasterized and nothing
+frame-sized is touched.
+
+The layout uses the original 640x480 coordinates and scales to any frame
+size.
+"""
+import numpy as np
+
+from .lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+
+BASE_WIDTH, BASE_HEIGHT = 640, 480
+FONT = 1  # cv2.FONT_HERSHEY_PLAIN
+FILLED = -1  # cv2.FILLED
+
+GREEN = (0, 255, 0)
+BLUE = (255, 0, 0)
+WHITE = (255, 255, 255)
+
+MAX_CACHED_VALUES = 128  # per element; enough for every percentage value
+
+
+class _Patch:
+    """Premultiplied BGR patch plus inverse alpha, placed at ``(x0, y0)``."""
+
+    def __init__(self, x0, y0, layer, mask):
+        self.x0, self.y0 = x0, y0
+        self.x1, self.y1 = x0 + layer.shape[1], y0 + layer.shape[0]
+        self.layer = layer
+        self.inverse = cv2.merge([255 - mask] * 3)
+
+    def blend(self, img):
+        roi = img[self.y0:self.y1, self.x0:self.x1]
+        cv2.multiply(roi, self.inverse, dst=roi, scale=1 / 255)
+        cv2.add(roi, self.layer, dst=roi)
+
+
+class HudOverlay:
+    """Counter, feedback and progress bar HUD composited from cached patches."""
+
+    def __init__(self):
+        self.size = None
+        self._patches = {}
+
+    def _layout(self, w, h):
+        self.size = (w, h)
+        self._sx, self._sy = w / BASE_WIDTH, h / BASE_HEIGHT
+        self._s = min(self._sx, self._sy)
+        self._patches = {}
+        self._barFrame = self._render([('rect', (580, 50), (600, 380), GREEN, 3)])
+        self._barBottom = self._point(600, 380)
+
+    def _point(self, x, y):
+        return int(round(x * self._sx)), int(round(y * self._sy))
+
+    def _thickness(self, t):
+        return t if t == FILLED else max(1, int(round(t * self._s)))
+
+    def _render(self, shapes):
+        """Draw ``shapes`` (in 640x480 coordinates) into a new patch."""
+        scaled, boxes = [], []
+        for kind, *args in shapes:
+            if kind == 'rect':
+                p1, p2, color, thickness = args
+                p1, p2, thickness = self._point(*p1), self._point(*p2), self._thickness(thickness)
+                pad = max(thickness, 0)
+                boxes.append((p1[0] - pad, p1[1] - pad, p2[0] + pad + 1, p2[1] + pad + 1))
+                scaled.append((kind, p1, p2, color, thickness))
+            else:
+                text, org, scale, color, thickness = args
+                org, scale, thickness = self._point(*org), scale * self._s, self._thickness(thickness)
+                (tw, th), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+                boxes.append((org[0] - thickness, org[1] - th - thickness,
+                              org[0] + tw + thickness + 1, org[1] + baseline + thickness + 1))
+                scaled.append((kind, text, org, scale, color, thickness))
+
+        w, h = self.size
+        x0 = max(min(b[0] for b in boxes), 0)
+        y0 = max(min(b[1] for b in boxes), 0)
+        x1 = min(max(b[2] for b in boxes), w)
+        y1 = min(max(b[3] for b in boxes), h)
+        layer = np.zeros((max(y1 - y0, 0), max(x1 - x0, 0), 3), dtype=np.uint8)
+        mask = np.zeros(layer.shape[:2], dtype=np.uint8)
+
+        for kind, *args in scaled:
+            if kind == 'rect':
+                (ax, ay), (bx, by), color, thickness = args
+                p1, p2 = (ax - x0, ay - y0), (bx - x0, by - y0)
+                cv2.rectangle(layer, p1, p2, color, thickness)
+                cv2.rectangle(mask, p1, p2, 255, thickness)
+            else:
+                text, (ox, oy), scale, color, thickness = args
+                org = (ox - x0, oy - y0)
+                # Text over a box blends into it, as when drawn on the frame
+                cv2.putText(layer, text, org, FONT, scale, color, thickness)
+                glyphs = np.zeros_like(mask)
+                cv2.putText(glyphs, text, org, FONT, scale, 255, thickness)
+                np.maximum(mask, glyphs, out=mask)
+        return _Patch(x0, y0, layer, mask)
+
+    def _cached(self, key, value, shapes):
+        """Return the patch for element ``key`` showing ``value``, rendering it once."""
+        cache = self._patches.setdefault(key, {})
+        patch = cache.get(value)
+        if patch is None:
+            if len(cache) >= MAX_CACHED_VALUES:
+                cache.clear()
+            patch = cache[value] = self._render(shapes(value))
+        return patch
+
+    def render(self, img, count, feedback, per=None, bar=None):
+        """Composite the HUD onto ``img`` in place.
+
+        ``bar`` is the top of the filled progress bar in 640x480 coordinates,
+        as returned by ``get_progress_bar_values``; the bar and percentage
+        are hidden when ``per`` or ``bar`` is ``None``.
+        """
+        h, w = img.shape[:2]
+        if self.size != (w, h):
+            self._layout(w, h)
+
+        if per is not None and bar is not None:
+            self._barFrame.blend(img)
+            cv2.rectangle(img, self._point(580, int(bar)), self._barBottom, GREEN, FILLED)
+            self._cached('per', int(per), lambda v: [
+                ('text', f'{v}%', (565, 430), 2, BLUE, 2),
+            ]).blend(img)
+
+        self._cached('count', int(count), lambda v: [
+            ('rect', (0, 380), (100, 480), GREEN, FILLED),
+            ('text', str(v), (25, 455), 5, BLUE, 5),
+        ]).blend(img)
+        self._cached('feedback', feedback, lambda v: [
+            ('rect', (500, 0), (640, 40), WHITE, FILLED),
+            ('text', v, (500, 40), 2, GREEN, 2),
+        ]).blend(img)
+        return img
@@ -0,0 +1,147 @@
+"""Low-overhead per-stage timing for the frame loop.
+
+The frame loop calls ``profiler.start_frame()`` once per frame and
+``profiler.mark(stage)`` after each stage; the time since the previous mark
+is charged to that stage. ``PoseDetector`` and ``BaseExercise`` mark their own
+stages, scripts mark capture and display. Latencies go into streaming
+log-bucket histograms, so memory stays constant however long the session.
+
+Profiling is off by default and every call returns immediately. Set
+``POSE_PROFILE=stages.json`` to enable it and write the report at exit, or
+call ``profiler.enable()``.
+"""
+import atexit
+import json
+import math
+import os
+import time
+
+BUCKETS_PER_OCTAVE = 8
+MAX_OCTAVES = 40  # 2**40 ns is about 18 minutes
+
+
+class LatencyHistogram:
+    """Streaming histogram with logarithmic buckets over nanosecond values.
+
+    Percentiles are accurate to about ``2 ** (1 / BUCKETS_PER_OCTAVE)``
+    (roughly 9%) relative error.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (BUCKETS_PER_OCTAVE * MAX_OCTAVES)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def add(self, ns):
+        bucket = int(math.log2(ns) * BUCKETS_PER_OCTAVE) if ns > 1 else 0
+        self.counts[min(bucket, len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """Return the ``q``-th percentile (0-100) in nanoseconds."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                # Geometric midpoint of the bucket, clamped to what was seen
+                value = 2 ** ((bucket + 0.5) / BUCKETS_PER_OCTAVE)
+                return min(max(value, self.min), self.max)
+        return float(self.max)
+
+    def to_dict(self):
+        ms = 1e-6
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * ms, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * ms, 4),
+            "p95_ms": round(self.percentile(95) * ms, 4),
+            "p99_ms": round(self.percentile(99) * ms, 4),
+            "max_ms": round(self.max * ms, 4),
+        }
+
+
+class StageProfiler:
+    """Per-frame stage timestamps plus a latency histogram per stage."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.frames = 0
+        self.histograms = {}
+        self.timestamps = {}  # stage -> perf_counter_ns of the current frame
+        self._frame_start = None
+        self._last = None
+        self._export_path = None
+
+    def enable(self, export_path=None):
+        """Start collecting; write the report to ``export_path`` at exit if given."""
+        self.enabled = True
+        if export_path and self._export_path is None:
+            atexit.register(self._export_at_exit)
+        self._export_path = export_path or self._export_path
+        return self
+
+    def disable(self):
+        self.enabled = False
+        self._frame_start = self._last = None
+
+    def reset(self):
+        self.frames = 0
+        self.histograms = {}
+        self.timestamps = {}
+        self._frame_start = self._last = None
+
+    def start_frame(self):
+        """Close the previous frame (recorded as stage ``'frame'``) and open a new one."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self._frame_start is not None:
+            self._record('frame', now - self._frame_start)
+            self.frames += 1
+        self._frame_start = self._last = now
+        self.timestamps = {'start': now}
+
+    def mark(self, stage):
+        """Charge the time since the previous mark to ``stage``."""
+        if not self.enabled or self._last is None:
+            return
+        now = time.perf_counter_ns()
+        self._record(stage, now - self._last)
+        self.timestamps[stage] = now
+        self._last = now
+
+    def _record(self, stage, ns):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        histogram.add(ns)
+
+    def report(self):
+        """Return the per-stage percentiles as a JSON-serializable dict."""
+        return {"frames": self.frames,
+                "stages": {stage: histogram.to_dict()
+                           for stage, histogram in self.histograms.items()}}
+
+    def export(self, path):
+        """Write ``report()`` to ``path`` as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def _export_at_exit(self):
+        if self._export_path and self.histograms:
+            self.export(self._export_path)
+
+
+profiler = StageProfiler()
+if os.environ.get('POSE_PROFILE'):
+    profiler.enable(os.environ['POSE_PROFILE'])
@@ -0,0 +1,157 @@
+"""Minimal WebSocket (RFC 6455) and HTTP/1.1 helpers on ``asyncio`` streams.
+
+Just enough for the local bridge to push JSON text frames to browsers and
+for scripts to subscribe to it, with no dependency beyond the standard
+library: request parsing, the upgrade handshake, and frame encoding and
+decoding (no extensions, no fragmentation on send).
+"""
+import base64
+import hashlib
+import os
+import struct
+
+GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+MAX_PAYLOAD = 1 << 20
+
+
+class WebSocketError(Exception):
+    """Malformed handshake or frame."""
+
+
+def accept_key(key):
+    """``Sec-WebSocket-Accept`` value for a client's ``Sec-WebSocket-Key``."""
+    return base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+
+
+async def _read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+async def read_request(reader):
+    """Read an HTTP request head; returns ``(method, path, headers)`` with lower-case keys."""
+    line = await reader.readline()
+    if not line:
+        raise EOFError("Connection closed before the request")
+    try:
+        method, path, _ = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise WebSocketError(f"Bad request line: {line!r}") from None
+    return method, path, await _read_headers(reader)
+
+
+def http_response(status, body=b'', content_type='application/json', headers=()):
+    """Encode a complete ``Connection: close`` HTTP response."""
+    lines = [f'HTTP/1.1 {status}', f'Content-Type: {content_type}',
+             f'Content-Length: {len(body)}', 'Connection: close',
+             'Access-Control-Allow-Origin: *', *headers]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def is_upgrade(headers):
+    return (headers.get('upgrade', '').lower() == 'websocket'
+            and 'upgrade' in headers.get('connection', '').lower())
+
+
+def handshake_response(headers):
+    """``101 Switching Protocols`` response for a client upgrade request."""
+    key = headers.get('sec-websocket-key')
+    if not key or not is_upgrade(headers):
+        raise WebSocketError("Not a WebSocket upgrade request")
+    return ('HTTP/1.1 101 Switching Protocols\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n').encode('latin-1')
+
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    """Encode one final frame. Servers send unmasked frames, clients masked ones."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    length = len(payload)
+    head = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        head.append(mask_bit | length)
+    elif length < 1 << 16:
+        head.append(mask_bit | 126)
+        head += struct.pack('!H', length)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack('!Q', length)
+    if mask:
+        key = os.urandom(4)
+        head += key
+        payload = _apply_mask(payload, key)
+    return bytes(head) + payload
+
+
+def _apply_mask(payload, key):
+    # XOR with the repeated key, as one big integer instead of a byte loop
+    n = len(payload)
+    repeated = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(n, 'big')
+
+
+async def read_frame(reader, max_payload=MAX_PAYLOAD):
+    """Read one message; returns ``(opcode, payload)``.
+
+    Fragmented messages are reassembled. Raises ``EOFError`` when the
+    connection closes.
+    """
+    opcode = None
+    chunks = []
+    while True:
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length, = struct.unpack('!H', await reader.readexactly(2))
+        elif length == 127:
+            length, = struct.unpack('!Q', await reader.readexactly(8))
+        if length > max_payload:
+            raise WebSocketError(f"Frame of {length} bytes exceeds {max_payload}")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if key is not None:
+            payload = _apply_mask(payload, key)
+
+        frame_opcode = first & 0x0F
+        if frame_opcode >= OP_CLOSE:
+            # Control frames may arrive between fragments
+            return frame_opcode, payload
+        if frame_opcode != OP_CONTINUATION:
+            opcode = frame_opcode
+        chunks.append(payload)
+        if first & 0x80:
+            return opcode, b''.join(chunks)
+
+
+async def client_handshake(reader, writer, host, path='/'):
+    """Upgrade a fresh connection to ``path`` to a WebSocket (client side)."""
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f'GET {path} HTTP/1.1\r\n'
+                  f'Host: {host}\r\n'
+                  'Upgrade: websocket\r\n'
+                  'Connection: Upgrade\r\n'
+                  f'Sec-WebSocket-Key: {key}\r\n'
+                  'Sec-WebSocket-Version: 13\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+    status = await reader.readline()
+    headers = await _read_headers(reader)
+    if b' 101 ' not in status or headers.get('sec-websocket-accept') != accept_key(key):
+        raise WebSocketError(f"WebSocket handshake failed: {status.decode('latin-1').strip()}")
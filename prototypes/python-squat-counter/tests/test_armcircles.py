@@ -4,8 +4,11 @@ import cv2
 import numpy as np
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/core')))
-import pose_detector as pm
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.detector_service import connect_detector
+from src.exercises import ArmCirclesCounter
+from src.utils.profiler import profiler
+import json
 import time
 
 def main():
@@ -26,25 +29,25 @@ def main():
     print("Camera initialized successfully.")
     
     # Initialize pose detector
-    detector = pm.PoseDetector()
+    detector = connect_detector()
     
-    # Circle tracking variables
-    right_count = 0
-    left_count = 0
-    right_prev_angle = 0
-    left_prev_angle = 0
-    right_direction = None
-    left_direction = None
+    # Per-arm circle counts, directions and the warmup timer live in the
+    # counter so they can be saved and resumed
+    circles = ArmCirclesCounter()
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else 'armcircles_snapshot.json'
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            circles.restore(json.load(f), timestamp=time.monotonic())
+        print(f"Resumed from {snapshot_path}: right {int(circles.right_count)}, "
+              f"left {int(circles.left_count)} circles")
     
-    # Timing for speed
-    start_time = time.time()
-    feedback = "Extend Arms to Sides"
-    
-    print("Starting Arm Circles Warmup. Press 'q' to quit.")
+    print("Starting Arm Circles Warmup. Press 's' to save the session, 'q' to quit.")
     print("Stand facing camera with arms extended to sides.")
     
     while cap.isOpened():
-        ret, img = cap.read()
+        profiler.start_frame()
+        ret, img = cap.read(detector.frameBuffer())
+        profiler.mark('read')
         
         if not ret:
             print("Error reading frame. Retrying...")
@@ -56,89 +59,19 @@ def main():
         lmList = detector.findPosition(img, False)
         
         if len(lmList) != 0:
-            # Get coordinates for circle tracking
-            # Right arm
-            right_shoulder_x = lmList[12][1]
-            right_shoulder_y = lmList[12][2]
-            right_wrist_x = lmList[16][1]
-            right_wrist_y = lmList[16][2]
-            
-            # Left arm
-            left_shoulder_x = lmList[11][1]
-            left_shoulder_y = lmList[11][2]
-            left_wrist_x = lmList[15][1]
-            left_wrist_y = lmList[15][2]
-            
-            # Calculate angles relative to shoulder (0-360 degrees)
-            right_angle = np.degrees(np.arctan2(right_wrist_y - right_shoulder_y, 
-                                               right_wrist_x - right_shoulder_x))
-            left_angle = np.degrees(np.arctan2(left_wrist_y - left_shoulder_y, 
-                                              left_wrist_x - left_shoulder_x))
-            
-            # Normalize angles to 0-360
-            right_angle = (right_angle + 360) % 360
-            left_angle = (left_angle + 360) % 360
-            
-            # Calculate arm extension (distance from shoulder)
-            right_extension = np.sqrt((right_wrist_x - right_shoulder_x)**2 + 
-                                    (right_wrist_y - right_shoulder_y)**2)
-            left_extension = np.sqrt((left_wrist_x - left_shoulder_x)**2 + 
-                                   (left_wrist_y - left_shoulder_y)**2)
-            
-            # Check if arms are extended (adjust threshold based on body size)
-            min_extension = 100  # pixels
-            right_extended = right_extension > min_extension
-            left_extended = left_extension > min_extension
-            
-            # Detect circle completion (right arm)
-            if right_extended:
-                angle_diff = right_angle - right_prev_angle
-                if angle_diff > 180:
-                    angle_diff -= 360
-                elif angle_diff < -180:
-                    angle_diff += 360
-                
-                if abs(angle_diff) > 5:  # Minimum movement threshold
-                    if angle_diff > 0:
-                        if right_direction == "backward":
-                            right_count += 0.5
-                        right_direction = "forward"
-                    else:
-                        if right_direction == "forward":
-                            right_count += 0.5
-                        right_direction = "backward"
-            
-            # Detect circle completion (left arm)
-            if left_extended:
-                angle_diff = left_angle - left_prev_angle
-                if angle_diff > 180:
-                    angle_diff -= 360
-                elif angle_diff < -180:
-                    angle_diff += 360
-                
-                if abs(angle_diff) > 5:  # Minimum movement threshold
-                    if angle_diff > 0:
-                        if left_direction == "backward":
-                            left_count += 0.5
-                        left_direction = "forward"
-                    else:
-                        if left_direction == "forward":
-                            left_count += 0.5
-                        left_direction = "backward"
-            
-            # Update previous angles
-            right_prev_angle = right_angle
-            left_prev_angle = left_angle
-            
-            # Feedback
-            if right_extended and left_extended:
-                feedback = "Good! Keep Circling"
-            elif not right_extended and not left_extended:
-                feedback = "Extend Both Arms"
-            elif not right_extended:
-                feedback = "Extend Right Arm"
-            elif not left_extended:
-                feedback = "Extend Left Arm"
+            # Wrist angle around each shoulder and arm extension drive the
+            # per-arm half-circle counts
+            angles = circles.get_required_angles(detector, img)
+            circles.update_feedback_and_count(angles, timestamp=time.monotonic())
+            right_count = circles.right_count
+            left_count = circles.left_count
+            right_direction = circles.right_direction
+            left_direction = circles.left_direction
+            right_extended = angles["right_extension"] > circles.min_extension
+            left_extended = angles["left_extension"] > circles.min_extension
+            feedback = circles.feedback
+            right_wrist_x, right_wrist_y = lmList[16][1:]
+            left_wrist_x, left_wrist_y = lmList[15][1:]
             
             # Draw UI elements
             # Circle counters
@@ -163,18 +96,27 @@ def main():
             cv2.putText(img, feedback, (445, 30), cv2.FONT_HERSHEY_PLAIN, 1.5, (0, 255, 0), 2)
             
             # Timer
-            elapsed = int(time.time() - start_time)
+            elapsed = int(circles.elapsed_time)
             cv2.putText(img, f'Time: {elapsed}s', (10, 460), cv2.FONT_HERSHEY_PLAIN, 2, (255, 255, 255), 2)
         
+        profiler.mark('ui')
+        
         # Display the frame
         cv2.imshow('Arm Circles Warmup', img)
         
-        if cv2.waitKey(10) & 0xFF == ord('q'):
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('s'):
+            with open(snapshot_path, 'w') as f:
+                json.dump(circles.snapshot(), f)
+            print(f"Session saved to {snapshot_path}")
+        elif key == ord('q'):
             break
     
     cap.release()
     cv2.destroyAllWindows()
-    print(f"Warmup complete. Right arm: {int(right_count)} circles, Left arm: {int(left_count)} circles")
+    print(f"Warmup complete. Right arm: {int(circles.right_count)} circles, "
+          f"Left arm: {int(circles.left_count)} circles")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+# Description: Subscribes to the live bridge over WebSocket and prints count and feedback changes
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.live_bridge import DEFAULT_HOST, DEFAULT_PORT
+from src.utils.websocket import OP_TEXT, client_handshake, encode_frame, read_frame
+import asyncio
+import json
+
+async def subscribe(host, port, delay):
+    reader, writer = await asyncio.open_connection(host, port)
+    await client_handshake(reader, writer, f'{host}:{port}')
+    print(f"Subscribed to ws://{host}:{port}/")
+
+    last = None
+    while True:
+        opcode, payload = await read_frame(reader)
+        if opcode != OP_TEXT:
+            break
+        state = json.loads(payload)
+        shown = (state["count"], state["feedback"], state.get("elapsed"))
+        if shown != last:
+            last = shown
+            print(f'[frame {state["frame"]}] count={state["count"]} phase={state["phase"]} '
+                  f'feedback={state["feedback"]!r} angles={state["angles"]}')
+        # A slow subscriber only ever sees the newest state
+        if delay:
+            await asyncio.sleep(delay)
+        # Acknowledge, so the bridge sends the newest state next
+        writer.write(encode_frame(b'ok', mask=True))
+        await writer.drain()
+
+def main():
+    # Start the bridge first: python -m src.core.live_bridge squat
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    try:
+        asyncio.run(subscribe(DEFAULT_HOST, port, delay))
+    except (ConnectionError, EOFError):
+        print("ERROR: Could not reach the live bridge. Start it with: python -m src.core.live_bridge squat")
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -4,8 +4,11 @@ import cv2
 import numpy as np
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/core')))
-import pose_detector as pm
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.adaptive_detector import AdaptivePoseDetector
+from src.exercises import ChestStretchTimer
+from src.utils.profiler import profiler
+import json
 import time
 
 def main():
@@ -25,23 +28,25 @@ def main():
     
     print("Camera initialized successfully.")
     
-    # Initialize pose detector
-    detector = pm.PoseDetector()
+    # Initialize pose detector (skips inference while the pose is held still)
+    detector = AdaptivePoseDetector()
     
-    # Stretch timing variables
-    start_time = None
-    elapsed_time = 0
-    in_position = False
-    target_time = 30  # seconds
+    # Stretch timer state lives in the counter so it can be saved and resumed
+    stretch = ChestStretchTimer()
+    target_time = stretch.target_time
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else 'cheststretch_snapshot.json'
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            stretch.restore(json.load(f), timestamp=time.monotonic())
+        print(f"Resumed from {snapshot_path}: {stretch.elapsed_time:.1f}s held")
     
-    feedback = "Arms Out to Sides"
-    stretch_type = ""
-    
-    print("Starting Chest & Shoulder Stretch Timer. Press 'q' to quit.")
+    print("Starting Chest & Shoulder Stretch Timer. Press 's' to save the session, 'q' to quit.")
     print("Stand facing camera with arms extended.")
     
     while cap.isOpened():
+        profiler.start_frame()
         ret, img = cap.read()
+        profiler.mark('read')
         
         if not ret:
             print("Error reading frame. Retrying...")
@@ -53,81 +58,16 @@ def main():
         lmList = detector.findPosition(img, False)
         
         if len(lmList) != 0:
-            # Get key positions
-            right_wrist_x = lmList[16][1]
-            right_wrist_y = lmList[16][2]
-            right_elbow_x = lmList[14][1]
-            right_shoulder_x = lmList[12][1]
-            right_shoulder_y = lmList[12][2]
-            
-            left_wrist_x = lmList[15][1]
-            left_wrist_y = lmList[15][2]
-            left_elbow_x = lmList[13][1]
-            left_shoulder_x = lmList[11][1]
-            left_shoulder_y = lmList[11][2]
-            
-            # Calculate arm angles
-            right_arm_angle = detector.findAngle(img, 12, 14, 16)
-            left_arm_angle = detector.findAngle(img, 11, 13, 15)
+            # Arm angles and wrist/elbow/shoulder positions decide the
+            # stretch type; the timer runs on frame timestamps
+            angles = stretch.get_required_angles(detector, img)
+            stretch.update_feedback_and_count(angles, timestamp=time.monotonic())
+            correct_position = stretch.form == 1
+            elapsed_time = stretch.elapsed_time
+            stretch_type = stretch.stretch_type
+            feedback = stretch.feedback
             
-            # Check arm positions for different stretch types
-            # 1. Doorway stretch (arms at 90 degrees, elbows bent)
-            doorway_position = (
-                abs(right_wrist_y - right_shoulder_y) < 50 and
-                abs(left_wrist_y - left_shoulder_y) < 50 and
-                right_arm_angle < 120 and left_arm_angle < 120 and
-                right_elbow_x > right_shoulder_x and
-                left_elbow_x < left_shoulder_x
-            )
-            
-            # 2. Behind-back clasp (hands clasped behind back)
-            behind_back = (
-                right_wrist_x < right_shoulder_x and
-                left_wrist_x > left_shoulder_x and
-                abs(right_wrist_x - left_wrist_x) < 100
-            )
-            
-            # 3. Wide arm stretch (arms fully extended to sides)
-            wide_stretch = (
-                right_arm_angle > 160 and left_arm_angle > 160 and
-                right_wrist_x > right_shoulder_x + 50 and
-                left_wrist_x < left_shoulder_x - 50 and
-                abs(right_wrist_y - right_shoulder_y) < 100 and
-                abs(left_wrist_y - left_shoulder_y) < 100
-            )
-            
-            # Determine stretch type and position
-            correct_position = False
-            if doorway_position:
-                correct_position = True
-                stretch_type = "Doorway Stretch"
-                feedback = "Hold Position!"
-            elif behind_back:
-                correct_position = True
-                stretch_type = "Behind-Back Clasp"
-                feedback = "Pull Shoulders Back!"
-            elif wide_stretch:
-                correct_position = True
-                stretch_type = "Wide Arm Stretch"
-                feedback = "Feel the Stretch!"
-            else:
-                stretch_type = ""
-                if right_arm_angle < 160 or left_arm_angle < 160:
-                    feedback = "Straighten Arms"
-                else:
-                    feedback = "Extend Arms Back"
-            
-            # Timer logic
-            if correct_position:
-                if not in_position:
-                    start_time = time.time()
-                    in_position = True
-                else:
-                    elapsed_time = time.time() - start_time
-            else:
-                in_position = False
-                if elapsed_time < target_time:
-                    elapsed_time = 0
+            detector.setHold(stretch.holding)
             
             # Draw UI elements
             # Timer display
@@ -164,15 +104,23 @@ def main():
                 cv2.putText(img, "STRETCH COMPLETE!", (180, 200), cv2.FONT_HERSHEY_PLAIN, 2.5, (0, 255, 0), 3)
                 cv2.putText(img, "Try another position", (200, 240), cv2.FONT_HERSHEY_PLAIN, 1.5, (255, 255, 0), 2)
         
+        profiler.mark('ui')
+        
         # Display the frame
         cv2.imshow('Chest & Shoulder Stretch', img)
         
-        if cv2.waitKey(10) & 0xFF == ord('q'):
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('s'):
+            with open(snapshot_path, 'w') as f:
+                json.dump(stretch.snapshot(), f)
+            print(f"Session saved to {snapshot_path}")
+        elif key == ord('q'):
             break
     
     cap.release()
     cv2.destroyAllWindows()
-    print(f"Stretch complete. Total time: {int(elapsed_time)}s")
+    print(f"Stretch complete. Total time: {int(stretch.elapsed_time)}s")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+# Description: Prints rep, phase, form and timer events of a live session without any window
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.exercises import EXERCISES, awatch, event_dict
+import asyncio
+import json
+
+async def print_events(exercise):
+    async for event in awatch(exercise):
+        print(json.dumps(event_dict(event)), flush=True)
+
+def main():
+    exercise = sys.argv[1] if len(sys.argv) > 1 else 'squat'
+    if exercise not in EXERCISES:
+        print(f"Usage: python tests/test_events.py [{'|'.join(sorted(EXERCISES))}]")
+        return
+
+    print(f"Watching {exercise} on the camera. Press Ctrl+C to stop.")
+    try:
+        asyncio.run(print_events(exercise))
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,11 +1,12 @@
 # Description: Test script for lateral raises counter using PoseModule.py
 
 import cv2
-import numpy as np
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/core')))
-import pose_detector as pm
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.detector_service import connect_detector
+from src.exercises import EXERCISES
+from src.utils.profiler import profiler
 import time
 
 def main():
@@ -25,22 +26,22 @@ def main():
     
     print("Camera initialized successfully.")
     
-    # Initialize pose detector
-    detector = pm.PoseDetector()
-    count = 0
-    direction = 0  # 0: arms down, 1: arms up
-    form = 0       # 0: incorrect form, 1: correct form
-    feedback = "Arms at Sides"
+    # Initialize pose detector and exercise counter
+    detector = connect_detector()
+    exercise = EXERCISES['lateralraises']()
     
     print("Starting Lateral Raises Counter. Press 'q' to quit.")
     print("Stand facing camera with arms at sides.")
     
     while cap.isOpened():
-        ret, img = cap.read()
+        profiler.start_frame()
+        ret, img = cap.read(detector.frameBuffer())
+        profiler.mark('read')
         
+        # Check if frame was successfully read
         if not ret:
             print("Error reading frame. Retrying...")
-            time.sleep(0.1)
+            time.sleep(0.1)  # Small delay before retry
             continue
         
         # Find pose landmarks
@@ -48,98 +49,37 @@ def main():
         lmList = detector.findPosition(img, False)
         
         if len(lmList) != 0:
-            # Get positions
-            right_wrist_y = lmList[16][2]
-            right_elbow_y = lmList[14][2]
-            right_shoulder_y = lmList[12][2]
-            right_hip_y = lmList[24][2]
-            
-            left_wrist_y = lmList[15][2]
-            left_elbow_y = lmList[13][2]
-            left_shoulder_y = lmList[11][2]
-            left_hip_y = lmList[23][2]
-            
-            # Calculate arm angles
-            right_arm_angle = detector.findAngle(img, 12, 14, 16)
-            left_arm_angle = detector.findAngle(img, 11, 13, 15)
-            
-            # Calculate shoulder angles (hip-shoulder-elbow)
-            right_shoulder_angle = detector.findAngle(img, 24, 12, 14)
-            left_shoulder_angle = detector.findAngle(img, 23, 11, 13)
-            
-            # Average for stability
-            avg_shoulder_angle = (right_shoulder_angle + left_shoulder_angle) / 2
-            
-            # Check arm straightness
-            arms_straight = right_arm_angle > 160 and left_arm_angle > 160
-            
-            # Calculate percentage (arms down to shoulder height)
-            # 0-45 degrees = arms down, 75-90 degrees = shoulder height
-            per = np.interp(avg_shoulder_angle, (45, 90), (0, 100))
-            per = max(0, min(100, per))
-            bar = np.interp(per, (0, 100), (380, 50))
-            
-            # Check form (arms should be straight)
-            if arms_straight:
-                form = 1
-            
-            # Count reps
-            if form == 1:
-                # Arms at shoulder height
-                if per > 90:
-                    if avg_shoulder_angle > 85 and direction == 0:
-                        count += 0.5
-                        direction = 1
-                        feedback = "Lower Arms"
-                
-                # Arms down
-                if per < 10:
-                    if avg_shoulder_angle < 50 and direction == 1:
-                        count += 0.5
-                        direction = 0
-                        feedback = "Raise to Sides"
-                
-                if 10 <= per <= 90:
-                    if per > 50:
-                        feedback = "Control the Movement"
-                    else:
-                        feedback = "Good Form"
-            else:
-                feedback = "Keep Arms Straight"
+            # Update count and feedback from the exercise definition
+            angles = exercise.get_required_angles(detector, img)
+            exercise.update_feedback_and_count(angles)
+            per, bar = exercise.get_progress_bar_values(angles)
             
             # Draw UI elements
-            # Progress bar
-            if form == 1:
-                cv2.rectangle(img, (580, 50), (600, 380), (0, 255, 0), 3)
-                cv2.rectangle(img, (580, int(bar)), (600, 380), (0, 255, 0), cv2.FILLED)
-                cv2.putText(img, f'{int(per)}%', (565, 430), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
-            
-            # Rep counter
-            cv2.rectangle(img, (0, 380), (100, 480), (0, 255, 0), cv2.FILLED)
-            cv2.putText(img, str(int(count)), (25, 455), cv2.FONT_HERSHEY_PLAIN, 5, (255, 0, 0), 5)
-            
-            # Feedback
-            cv2.rectangle(img, (500, 0), (640, 40), (255, 255, 255), cv2.FILLED)
-            cv2.putText(img, feedback, (500, 40), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+            exercise.draw_ui(img, per, bar)
             
             # Form indicators
-            right_color = (0, 255, 0) if right_arm_angle > 160 else (0, 0, 255)
-            left_color = (0, 255, 0) if left_arm_angle > 160 else (0, 0, 255)
+            right_color = (0, 255, 0) if angles['right_arm'] > 160 else (0, 0, 255)
+            left_color = (0, 255, 0) if angles['left_arm'] > 160 else (0, 0, 255)
             cv2.putText(img, "R", (550, 70), cv2.FONT_HERSHEY_PLAIN, 2, right_color, 2)
             cv2.putText(img, "L", (550, 100), cv2.FONT_HERSHEY_PLAIN, 2, left_color, 2)
             
-            # Display angle
-            cv2.putText(img, f'Angle: {int(avg_shoulder_angle)}', (10, 30), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
+            # Display angles (for debugging)
+            for i, (label, name) in enumerate(exercise.definition.display):
+                cv2.putText(img, f'{label}: {int(angles[name])}', (10, 30 + 30 * i), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
         
         # Display the frame
         cv2.imshow('Lateral Raises Counter', img)
         
-        if cv2.waitKey(10) & 0xFF == ord('q'):
+        # Exit on 'q' key press
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('q'):
             break
     
+    # Release resources
     cap.release()
     cv2.destroyAllWindows()
-    print(f"Workout complete. Total reps: {int(count)}")
+    print(f"Workout complete. Total reps: {int(exercise.count)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+# Description: Rep counter on the asynchronous MediaPipe Tasks PoseLandmarker (LIVE_STREAM mode)
+
+import cv2
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.live_detector import LivePoseDetector
+from src.exercises import EXERCISES
+from src.utils.profiler import profiler
+import time
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else 'squat'
+    if name not in EXERCISES:
+        print(f"Usage: python tests/test_live.py [{'|'.join(sorted(EXERCISES))}]")
+        return
+
+    # Initialize camera with error handling
+    print("Initializing camera...")
+    cap = cv2.VideoCapture(0)
+
+    # Check if camera opened successfully
+    if not cap.isOpened():
+        print("ERROR: Could not open camera. Please check your camera connection.")
+        return
+
+    print("Camera initialized successfully.")
+
+    # Inference runs on MediaPipe's thread; findPose only submits the frame
+    try:
+        detector = LivePoseDetector()
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        cap.release()
+        return
+    detector.warmup()
+    exercise = EXERCISES[name]()
+
+    print(f"Starting {name} counter on the live-stream detector. Press 'q' to quit.")
+
+    frames = 0
+    start = time.time()
+    while cap.isOpened():
+        profiler.start_frame()
+        ret, img = cap.read()
+        profiler.mark('read')
+
+        # Check if frame was successfully read
+        if not ret:
+            print("Error reading frame. Retrying...")
+            time.sleep(0.1)  # Small delay before retry
+            continue
+
+        # Submit this frame and use the newest finished landmarks
+        img = detector.findPose(img, False)
+        lmList = detector.findPosition(img, False)
+        frames += 1
+
+        if len(lmList) != 0:
+            angles = exercise.get_required_angles(detector, img)
+            exercise.update_feedback_and_count(angles)
+            exercise.draw_ui(img, *exercise.get_progress_bar_values(angles))
+
+        # Display the frame
+        cv2.imshow('Live Stream Rep Counter', img)
+
+        # Exit on 'q' key press
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('q'):
+            break
+
+    # Release resources
+    elapsed = time.time() - start
+    detector.close()
+    cap.release()
+    cv2.destroyAllWindows()
+    print(f"Workout complete. Total reps: {int(exercise.count)}")
+    print(f"Loop: {frames / elapsed:.1f} fps, inference skipped {detector.dropRatio:.0%} of frames")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+# Description: Runs pose inference on several cameras or videos with a pinned worker pool
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.stream_pool import StreamPool
+from src.utils.camera_utils import DROP_NEWEST, DROP_NONE
+import time
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python tests/test_multistream.py <camera index or video> ... [--workers N]")
+        return
+
+    args = sys.argv[1:]
+    workers = None
+    if '--workers' in args:
+        i = args.index('--workers')
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+
+    # Camera indices are live (keep the newest frame); files are read in full
+    sources = [int(arg) if arg.isdigit() else arg for arg in args]
+    live = all(isinstance(source, int) for source in sources)
+
+    pool = StreamPool(sources, workers=workers, drop_policy=DROP_NEWEST if live else DROP_NONE)
+    print(f"Starting {len(sources)} streams on {pool.workers} workers. Press Ctrl+C to stop.")
+
+    start = last_report = time.time()
+    detected = dict.fromkeys(pool.sources, 0)
+    try:
+        with pool:
+            for result in pool.results():
+                if result.landmarks is not None:
+                    detected[result.stream] += 1
+
+                now = time.time()
+                if now - last_report >= 2:
+                    last_report = now
+                    rates = ', '.join(f'{stream}: {s["processed"] / (now - start):.1f} fps'
+                                      for stream, s in pool.stats().items())
+                    print(f"[{now - start:6.1f}s] {rates}")
+    except KeyboardInterrupt:
+        pass
+
+    elapsed = time.time() - start
+    stats = pool.stats()
+    total = sum(s["processed"] for s in stats.values())
+    print(f"Processed {total} frames in {elapsed:.1f}s ({total / elapsed:.1f} fps total)")
+    for stream, s in stats.items():
+        print(f"  stream {stream}: {s['processed']} frames, {detected[stream]} with a pose, "
+              f"{s['dropped']} dropped")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+# Description: Checks that chunk-parallel video analysis matches a sequential run
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.analysis import analyze_video, analyze_video_parallel
+import time
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python tests/test_parallel_analysis.py <video> <exercise> [workers]")
+        return False
+
+    path, exercise = sys.argv[1], sys.argv[2]
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+    # Static image mode makes every frame independent, so both runs must agree exactly
+    print("Running sequential analysis...")
+    start = time.time()
+    sequential = list(analyze_video(path, exercise, mode=True))
+    sequential_time = time.time() - start
+
+    print(f"Running parallel analysis with {workers} workers...")
+    start = time.time()
+    parallel = list(analyze_video_parallel(path, exercise, workers=workers,
+                                           chunk_seconds=10, mode=True))
+    parallel_time = time.time() - start
+
+    if parallel != sequential:
+        print("ERROR: Parallel results differ from sequential run!")
+        for a, b in zip(sequential, parallel):
+            if a != b:
+                print(f"  sequential: {a}")
+                print(f"  parallel:   {b}")
+                break
+        return False
+
+    print(f"Results match: {sequential[-1]}")
+    print(f"Sequential: {sequential_time:.1f}s, parallel: {parallel_time:.1f}s "
+          f"({sequential_time / parallel_time:.1f}x)")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -4,8 +4,11 @@ import cv2
 import numpy as np
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/core')))
-import pose_detector as pm
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.adaptive_detector import AdaptivePoseDetector
+from src.exercises import PlankTimer
+from src.utils.profiler import profiler
+import json
 import time
 
 def main():
@@ -27,25 +30,24 @@ def main():
     
     print("Camera initialized successfully.")
     
-    # Initialize pose detector
-    detector = pm.PoseDetector()
+    # Initialize pose detector (skips inference while the pose is held still)
+    detector = AdaptivePoseDetector()
     
-    # Plank timing variables
-    start_time = None
-    elapsed_time = 0
-    is_in_plank = False
-    form = 0  # 0: incorrect form, 1: correct form
-    feedback = "Get Ready"
+    # Plank timer state lives in the counter so it can be saved and resumed
+    plank = PlankTimer()
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else 'plank_snapshot.json'
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            plank.restore(json.load(f), timestamp=time.monotonic())
+        print(f"Resumed from {snapshot_path}: {plank.elapsed_time:.1f}s held")
     
-    # Form tracking variables
-    form_break_count = 0
-    max_form_breaks = 3  # Number of form breaks before stopping timer
-    
-    print("Starting Plank Timer. Press 'q' to quit.")
+    print("Starting Plank Timer. Press 's' to save the session, 'q' to quit.")
     print("Position yourself sideways to the camera for best results.")
     
     while cap.isOpened():
+        profiler.start_frame()
         ret, img = cap.read()
+        profiler.mark('read')
         
         # Check if frame was successfully read
         if not ret:
@@ -58,68 +60,18 @@ def main():
         lmList = detector.findPosition(img, False)
         
         if len(lmList) != 0:
-            # For plank, we need to check:
-            # 1. Body alignment (shoulder-hip-ankle should be nearly straight)
-            # 2. Elbow angle (for proper arm position)
-            # 3. Hip height (not too high or too low)
-            
-            # Calculate key angles
-            # Body alignment angle
-            body_alignment = detector.findAngle(img, 11, 23, 27)  # Shoulder, hip, ankle
-            
-            # Elbow angles (for forearm plank detection)
-            right_elbow = detector.findAngle(img, 12, 14, 16)
-            left_elbow = detector.findAngle(img, 11, 13, 15)
-            avg_elbow = (right_elbow + left_elbow) / 2
-            
-            # Hip angle (to detect sagging or piking)
-            hip_angle = detector.findAngle(img, 11, 23, 25)  # Shoulder, hip, knee
+            # Body alignment (shoulder-hip-ankle), elbows and hip angle decide
+            # the plank type and form; the timer runs on frame timestamps
+            angles = plank.get_required_angles(detector, img)
+            plank.update_feedback_and_count(angles, timestamp=time.monotonic())
+            elapsed_time = plank.elapsed_time
+            form = plank.form
+            feedback = plank.feedback
+            plank_type = plank.plank_type
+            body_alignment = angles["body"]
+            hip_angle = angles["hip"]
             
-            # Determine plank type and check form
-            if avg_elbow < 120:  # Forearm plank
-                plank_type = "Forearm Plank"
-                # Good form: body alignment 160-180 degrees
-                if 160 <= body_alignment <= 180 and 160 <= hip_angle <= 180:
-                    form = 1
-                    feedback = "Good Form - Hold!"
-                else:
-                    form = 0
-                    if body_alignment < 160:
-                        feedback = "Hips Too Low"
-                    elif hip_angle < 160:
-                        feedback = "Hips Too High"
-            else:  # High plank (push-up position)
-                plank_type = "High Plank"
-                # Good form: body alignment 160-180 degrees, arms straight
-                if 160 <= body_alignment <= 180 and 160 <= hip_angle <= 180 and avg_elbow > 160:
-                    form = 1
-                    feedback = "Good Form - Hold!"
-                else:
-                    form = 0
-                    if body_alignment < 160:
-                        feedback = "Hips Too Low"
-                    elif hip_angle < 160:
-                        feedback = "Hips Too High"
-                    elif avg_elbow < 160:
-                        feedback = "Straighten Arms"
-            
-            # Timer logic
-            if form == 1:
-                if not is_in_plank:
-                    # Start timer
-                    start_time = time.time()
-                    is_in_plank = True
-                    form_break_count = 0
-                else:
-                    # Update elapsed time
-                    elapsed_time = time.time() - start_time
-            else:
-                if is_in_plank:
-                    form_break_count += 1
-                    if form_break_count >= max_form_breaks:
-                        # Stop timer after too many form breaks
-                        is_in_plank = False
-                        feedback = "Form Break - Timer Stopped"
+            detector.setHold(plank.holding)
             
             # Draw UI elements
             # Timer display
@@ -159,11 +111,19 @@ def main():
             cv2.putText(img, f'Body: {int(body_alignment)}', (10, 450), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
             cv2.putText(img, f'Hip: {int(hip_angle)}', (10, 470), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
         
+        profiler.mark('ui')
+        
         # Display the frame
         cv2.imshow('Plank Timer', img)
         
         # Exit on 'q' key press
-        if cv2.waitKey(10) & 0xFF == ord('q'):
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('s'):
+            with open(snapshot_path, 'w') as f:
+                json.dump(plank.snapshot(), f)
+            print(f"Session saved to {snapshot_path}")
+        elif key == ord('q'):
             break
     
     # Release resources
@@ -171,8 +131,8 @@ def main():
     cv2.destroyAllWindows()
     
     # Final stats
-    minutes = int(elapsed_time // 60)
-    seconds = int(elapsed_time % 60)
+    minutes = int(plank.elapsed_time // 60)
+    seconds = int(plank.elapsed_time % 60)
     print(f"Workout complete. Total plank time: {minutes:02d}:{seconds:02d}")
 
 if __name__ == "__main__":
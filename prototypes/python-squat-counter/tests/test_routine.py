@@ -0,0 +1,91 @@
+# Description: Runs a routine of several exercises on one camera and one pose detector
+
+import cv2
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.adaptive_detector import AdaptivePoseDetector
+from src.exercises import Routine, RoutineRunner, WorkoutLogger, open_sink
+from src.utils.profiler import profiler
+import time
+
+DEFAULT_ROUTINE = ['squat:10', 'pushup:10', 'plank:30s']
+
+def main():
+    steps = sys.argv[1:] or DEFAULT_ROUTINE
+    try:
+        routine = Routine('Demo Routine', steps)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        print("Usage: python tests/test_routine.py squat:10 lunge:8 plank:30s")
+        return
+
+    # Initialize camera with error handling
+    print("Initializing camera...")
+    cap = cv2.VideoCapture(0)
+
+    # Check if camera opened successfully
+    if not cap.isOpened():
+        print("ERROR: Could not open camera. Please check your camera connection.")
+        return
+
+    print("Camera initialized successfully.")
+
+    # One detector for the whole routine; hold sets skip inference while still
+    detector = AdaptivePoseDetector()
+    detector.warmup()
+
+    # WORKOUT_LOG=workouts.db keeps finished sets; WORKOUT_SYNC (file or URL) syncs them
+    logger = None
+    if os.environ.get('WORKOUT_LOG'):
+        sync = os.environ.get('WORKOUT_SYNC')
+        logger = WorkoutLogger(os.environ['WORKOUT_LOG'], sink=open_sink(sync) if sync else None)
+    runner = RoutineRunner(routine, detector, logger=logger)
+
+    print(f"Starting {routine.name}: {', '.join(map(repr, routine.steps))}")
+    print("Press 'n' to skip to the next set, 'q' to quit.")
+
+    while cap.isOpened() and not runner.finished:
+        profiler.start_frame()
+        ret, img = cap.read()
+        profiler.mark('read')
+
+        # Check if frame was successfully read
+        if not ret:
+            print("Error reading frame. Retrying...")
+            time.sleep(0.1)  # Small delay before retry
+            continue
+
+        index = runner.index
+        runner.process(img)
+        if runner.index != index:
+            print(f"Set complete: {runner.results[-1]}")
+
+        if not runner.finished:
+            step = runner.step
+            cv2.putText(img, f'Set {runner.index + 1}/{len(routine.steps)}: {step.exercise} ({step.target})',
+                        (10, 30), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
+
+        # Display the frame
+        cv2.imshow('Routine', img)
+
+        # 'n' skips the current set, 'q' ends the routine
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('n'):
+            runner.next_set()
+        elif key == ord('q'):
+            break
+
+    # Release resources
+    cap.release()
+    cv2.destroyAllWindows()
+    if logger is not None:
+        logger.close()
+        print(f"Workout log: {logger.stats()}")
+    print("Routine complete.")
+    for result in runner.results:
+        print(f"  {result}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,11 +1,12 @@
 # Description: Test script for tricep dips counter using PoseModule.py
 
 import cv2
-import numpy as np
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/core')))
-import pose_detector as pm
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.detector_service import connect_detector
+from src.exercises import EXERCISES
+from src.utils.profiler import profiler
 import time
 
 def main():
@@ -25,22 +26,22 @@ def main():
     
     print("Camera initialized successfully.")
     
-    # Initialize pose detector
-    detector = pm.PoseDetector()
-    count = 0
-    direction = 0  # 0: going down, 1: going up
-    form = 0       # 0: incorrect form, 1: correct form
-    feedback = "Position Arms Behind"
+    # Initialize pose detector and exercise counter
+    detector = connect_detector()
+    exercise = EXERCISES['tricepdip']()
     
     print("Starting Tricep Dips Counter. Press 'q' to quit.")
     print("Sit facing camera with hands behind you on chair/bench.")
     
     while cap.isOpened():
-        ret, img = cap.read()
+        profiler.start_frame()
+        ret, img = cap.read(detector.frameBuffer())
+        profiler.mark('read')
         
+        # Check if frame was successfully read
         if not ret:
             print("Error reading frame. Retrying...")
-            time.sleep(0.1)
+            time.sleep(0.1)  # Small delay before retry
             continue
         
         # Find pose landmarks
@@ -48,81 +49,31 @@ def main():
         lmList = detector.findPosition(img, False)
         
         if len(lmList) != 0:
-            # For tricep dips, track elbow bend with arms behind body
-            # Both arms should move together
-            right_elbow = detector.findAngle(img, 12, 14, 16)  # Shoulder, elbow, wrist
-            left_elbow = detector.findAngle(img, 11, 13, 15)   # Shoulder, elbow, wrist
-            avg_elbow = (right_elbow + left_elbow) / 2
-            
-            # Check shoulder position (arms should be back)
-            # Compare wrist position to shoulder position
-            right_wrist_x = lmList[16][1]
-            right_shoulder_x = lmList[12][1]
-            left_wrist_x = lmList[15][1]
-            left_shoulder_x = lmList[11][1]
-            
-            # Arms behind check (wrists behind shoulders)
-            arms_behind = (right_wrist_x < right_shoulder_x) and (left_wrist_x > left_shoulder_x)
-            
-            # Calculate percentage (similar to push-ups but inverted)
-            # Up position: arms straight (160-180 degrees)
-            # Down position: arms bent (70-90 degrees)
-            per = np.interp(avg_elbow, (70, 170), (100, 0))
-            bar = np.interp(avg_elbow, (70, 170), (50, 380))
-            
-            # Check form
-            if arms_behind and abs(right_elbow - left_elbow) < 20:  # Arms evenly bent
-                form = 1
-            
-            # Count reps
-            if form == 1:
-                if per > 90:  # Down position
-                    if avg_elbow < 90 and direction == 0:
-                        count += 0.5
-                        direction = 1
-                        feedback = "Push Up"
-                        
-                if per < 10:  # Up position
-                    if avg_elbow > 160 and direction == 1:
-                        count += 0.5
-                        direction = 0
-                        feedback = "Lower Down"
-                
-                if 10 <= per <= 90:
-                    feedback = "Good Form"
-            else:
-                if not arms_behind:
-                    feedback = "Hands Behind Body"
-                else:
-                    feedback = "Keep Arms Even"
+            # Update count and feedback from the exercise definition
+            angles = exercise.get_required_angles(detector, img)
+            exercise.update_feedback_and_count(angles)
+            per, bar = exercise.get_progress_bar_values(angles)
             
             # Draw UI elements
-            # Progress bar
-            if form == 1:
-                cv2.rectangle(img, (580, 50), (600, 380), (0, 255, 0), 3)
-                cv2.rectangle(img, (580, int(bar)), (600, 380), (0, 255, 0), cv2.FILLED)
-                cv2.putText(img, f'{int(per)}%', (565, 430), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
-            
-            # Rep counter
-            cv2.rectangle(img, (0, 380), (100, 480), (0, 255, 0), cv2.FILLED)
-            cv2.putText(img, str(int(count)), (25, 455), cv2.FONT_HERSHEY_PLAIN, 5, (255, 0, 0), 5)
-            
-            # Feedback
-            cv2.rectangle(img, (500, 0), (640, 40), (255, 255, 255), cv2.FILLED)
-            cv2.putText(img, feedback, (500, 40), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+            exercise.draw_ui(img, per, bar)
             
-            # Display angles
-            cv2.putText(img, f'Elbow: {int(avg_elbow)}', (10, 30), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
+            # Display angles (for debugging)
+            for i, (label, name) in enumerate(exercise.definition.display):
+                cv2.putText(img, f'{label}: {int(angles[name])}', (10, 30 + 30 * i), cv2.FONT_HERSHEY_PLAIN, 1, (255, 255, 255), 2)
         
         # Display the frame
         cv2.imshow('Tricep Dips Counter', img)
         
-        if cv2.waitKey(10) & 0xFF == ord('q'):
+        # Exit on 'q' key press
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('q'):
             break
     
+    # Release resources
     cap.release()
     cv2.destroyAllWindows()
-    print(f"Workout complete. Total reps: {int(count)}")
+    print(f"Workout complete. Total reps: {int(exercise.count)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,8 +4,11 @@ import cv2
 import numpy as np
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/core')))
-import pose_detector as pm
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.core.adaptive_detector import AdaptivePoseDetector
+from src.exercises import TricepStretchTimer
+from src.utils.profiler import profiler
+import json
 import time
 
 def main():
@@ -25,27 +28,26 @@ def main():
     
     print("Camera initialized successfully.")
     
-    # Initialize pose detector
-    detector = pm.PoseDetector()
+    # Initialize pose detector (skips inference while the pose is held still)
+    detector = AdaptivePoseDetector()
     
-    # Stretch timing variables
-    right_start_time = None
-    left_start_time = None
-    right_elapsed = 0
-    left_elapsed = 0
-    right_in_position = False
-    left_in_position = False
+    # Both arm timers live in the counter so they can be saved and resumed
+    stretch = TricepStretchTimer()
+    target_time = stretch.target_time
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else 'tricepstretch_snapshot.json'
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            stretch.restore(json.load(f), timestamp=time.monotonic())
+        print(f"Resumed from {snapshot_path}: right {stretch.right_elapsed_time:.1f}s, "
+              f"left {stretch.left_elapsed_time:.1f}s held")
     
-    # Target hold time
-    target_time = 30  # seconds
-    
-    feedback = "Raise Arm Overhead"
-    
-    print("Starting Overhead Tricep Stretch Timer. Press 'q' to quit.")
+    print("Starting Overhead Tricep Stretch Timer. Press 's' to save the session, 'q' to quit.")
     print("Face camera and bend elbow behind head.")
     
     while cap.isOpened():
+        profiler.start_frame()
         ret, img = cap.read()
+        profiler.mark('read')
         
         if not ret:
             print("Error reading frame. Retrying...")
@@ -57,71 +59,17 @@ def main():
         lmList = detector.findPosition(img, False)
         
         if len(lmList) != 0:
-            # Check right arm position
-            right_elbow_angle = detector.findAngle(img, 12, 14, 16)  # Shoulder, elbow, wrist
-            right_shoulder_angle = detector.findAngle(img, 24, 12, 14)  # Hip, shoulder, elbow
-            
-            # Check left arm position
-            left_elbow_angle = detector.findAngle(img, 11, 13, 15)  # Shoulder, elbow, wrist
-            left_shoulder_angle = detector.findAngle(img, 23, 11, 13)  # Hip, shoulder, elbow
-            
-            # Get elbow and wrist positions
-            right_elbow_y = lmList[14][2]
-            right_wrist_y = lmList[16][2]
-            right_shoulder_y = lmList[12][2]
-            
-            left_elbow_y = lmList[13][2]
-            left_wrist_y = lmList[15][2]
-            left_shoulder_y = lmList[11][2]
-            
-            # Right arm stretch detection
-            right_overhead = right_elbow_y < right_shoulder_y  # Elbow above shoulder
-            right_bent = right_elbow_angle < 90  # Elbow bent
-            right_correct = right_overhead and right_bent and right_shoulder_angle > 150
+            # Elbow and shoulder angles plus elbow height decide each arm's
+            # position; both timers run on frame timestamps
+            angles = stretch.get_required_angles(detector, img)
+            stretch.update_feedback_and_count(angles, timestamp=time.monotonic())
+            right_correct = stretch.right_in_position
+            left_correct = stretch.left_in_position
+            right_elapsed = stretch.right_elapsed_time
+            left_elapsed = stretch.left_elapsed_time
+            feedback = stretch.feedback
             
-            # Left arm stretch detection
-            left_overhead = left_elbow_y < left_shoulder_y  # Elbow above shoulder
-            left_bent = left_elbow_angle < 90  # Elbow bent
-            left_correct = left_overhead and left_bent and left_shoulder_angle > 150
-            
-            # Timer logic for right arm
-            if right_correct:
-                if not right_in_position:
-                    right_start_time = time.time()
-                    right_in_position = True
-                else:
-                    right_elapsed = time.time() - right_start_time
-            else:
-                right_in_position = False
-                if right_elapsed < target_time:
-                    right_elapsed = 0
-            
-            # Timer logic for left arm
-            if left_correct:
-                if not left_in_position:
-                    left_start_time = time.time()
-                    left_in_position = True
-                else:
-                    left_elapsed = time.time() - left_start_time
-            else:
-                left_in_position = False
-                if left_elapsed < target_time:
-                    left_elapsed = 0
-            
-            # Feedback
-            if right_correct and left_correct:
-                feedback = "Both Arms - Hold!"
-            elif right_correct:
-                feedback = "Right Good - Do Left"
-            elif left_correct:
-                feedback = "Left Good - Do Right"
-            else:
-                if not (right_overhead or left_overhead):
-                    feedback = "Raise Arm Overhead"
-                elif not (right_bent or left_bent):
-                    feedback = "Bend Elbow Behind Head"
-                else:
-                    feedback = "Adjust Position"
+            detector.setHold(stretch.holding)
             
             # Draw UI elements
             # Timer displays
@@ -158,15 +106,24 @@ def main():
             if left_elapsed >= target_time:
                 cv2.putText(img, "LEFT COMPLETE!", (320, 250), cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 3)
         
+        profiler.mark('ui')
+        
         # Display the frame
         cv2.imshow('Overhead Tricep Stretch', img)
         
-        if cv2.waitKey(10) & 0xFF == ord('q'):
+        key = cv2.waitKey(10) & 0xFF
+        profiler.mark('display')
+        if key == ord('s'):
+            with open(snapshot_path, 'w') as f:
+                json.dump(stretch.snapshot(), f)
+            print(f"Session saved to {snapshot_path}")
+        elif key == ord('q'):
             break
     
     cap.release()
     cv2.destroyAllWindows()
-    print(f"Stretch complete. Right: {int(right_elapsed)}s, Left: {int(left_elapsed)}s")
+    print(f"Stretch complete. Right: {int(stretch.right_elapsed_time)}s, "
+          f"Left: {int(stretch.left_elapsed_time)}s")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file